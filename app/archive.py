@@ -0,0 +1,235 @@
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from .utils_cfg import get_cfg, get_cfg_float, get_cfg_int
+
+
+class HtmlArchive:
+    """Content-addressed, gzip-compressed store of fetched upstream pages.
+
+    Layout under ``root``::
+
+        objects/ab/cd/<sha256>.html.gz   page bodies, named by the sha256 of the body
+        urls.jsonl                       append-only url -> sha256 log, last line wins
+        entries.jsonl                    append-only (slug, entry) -> parser version log
+
+    Identical pages (e.g. the same Wiktionary page reached through two slugs) are
+    stored once. Both logs are only ever appended to, so several workers on a
+    host can share one archive; a line is only added when it changes what the
+    log says (a new page body for a url, a new parser version for an entry), so
+    re-fetching the same words does not grow them.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self._lock = threading.Lock()
+        self._urls: Optional[Dict[str, str]] = None
+        self._versions: Optional[Dict[Tuple[str, str], int]] = None
+        os.makedirs(os.path.join(root, "objects"), exist_ok=True)
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.root, "objects", digest[:2], digest[2:4], digest + ".html.gz")
+
+    def _append(self, name: str, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self._lock:
+            with open(os.path.join(self.root, name), "a", encoding="utf-8") as f:
+                f.write(line)
+
+    def _read_log(self, name: str) -> List[Dict[str, Any]]:
+        path = os.path.join(self.root, name)
+        if not os.path.exists(path):
+            return []
+        out: List[Dict[str, Any]] = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    out.append(json.loads(line))
+                except ValueError:
+                    # a torn last line from a crashed writer
+                    continue
+        return out
+
+    def put(self, url: str, html: str) -> str:
+        body = html.encode("utf-8")
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with gzip.open(tmp, "wb", compresslevel=6) as f:
+                f.write(body)
+            os.replace(tmp, path)
+        with self._lock:
+            urls = self._url_index()
+            if urls.get(url) == digest:
+                return digest
+            urls[url] = digest
+        self._append("urls.jsonl", {"url": url, "sha256": digest, "ts": int(time.time())})
+        return digest
+
+    def _url_index(self) -> Dict[str, str]:
+        # callers hold self._lock
+        if self._urls is None:
+            self._urls = {}
+            for rec in self._read_log("urls.jsonl"):
+                if rec.get("url") and rec.get("sha256"):
+                    self._urls[rec["url"]] = rec["sha256"]
+        return self._urls
+
+    def get(self, url: str) -> Optional[str]:
+        with self._lock:
+            digest = self._url_index().get(url)
+        if not digest:
+            return None
+        try:
+            with gzip.open(self._object_path(digest), "rb") as f:
+                return f.read().decode("utf-8")
+        except OSError:
+            return None
+
+    def record_entry(self, slug_language: str, entry: str, parser_version: int) -> None:
+        with self._lock:
+            if self._versions is None:
+                self._versions = {
+                    key: int(rec.get("parser_version") or 0) for key, rec in self._entry_records().items()
+                }
+            if self._versions.get((slug_language, entry)) == parser_version:
+                return
+            self._versions[(slug_language, entry)] = parser_version
+        self._append(
+            "entries.jsonl",
+            {"slug": slug_language, "entry": entry, "parser_version": parser_version, "ts": int(time.time())},
+        )
+
+    def entries(self) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        with self._lock:
+            return self._entry_records()
+
+    def _entry_records(self) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        out: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for rec in self._read_log("entries.jsonl"):
+            if rec.get("slug") and rec.get("entry"):
+                out[(rec["slug"], rec["entry"])] = rec
+        return out
+
+
+def archive_from_config() -> Optional[HtmlArchive]:
+    root = get_cfg("CAMBRIDGE_ARCHIVE_DIR")
+    if not root:
+        return None
+    try:
+        return HtmlArchive(root)
+    except OSError as e:
+        try:
+            print("ARCHIVE_INIT_FAIL", root, str(e))
+        except Exception:
+            pass
+        return None
+
+
+_worker_client: Any = None
+
+
+def _init_worker(root: str) -> None:
+    global _worker_client
+    from .cambridge import CambridgeClient
+
+    _worker_client = CambridgeClient(archive=HtmlArchive(root), offline=True, verbs_budget=60.0)
+
+
+def _reparse(slug_language: str, entry: str) -> Tuple[str, str, Optional[Dict[str, Any]]]:
+    return slug_language, entry, _worker_client.get_entry(slug_language, entry)
+
+
+def reparse(root: str, workers: int, everything: bool = False, dry_run: bool = False) -> Dict[str, int]:
+    """Re-parse archived entries in a process pool and store them again, offline.
+
+    Only entries last parsed by an older PARSER_VERSION are processed unless
+    ``everything`` is set. Entries are stored the way the API stores them
+    (persist.persist_entry): the local replica when DICTIONARY_REPLICA is set, then
+    Supabase through the batched write-behind queue unless WRITE_BEHIND=0.
+    """
+    from .cambridge import PARSER_VERSION
+
+    archive = HtmlArchive(root)
+    todo = [
+        key
+        for key, rec in archive.entries().items()
+        if everything or int(rec.get("parser_version") or 0) < PARSER_VERSION
+    ]
+    stats = {"pending": len(todo), "parsed": 0, "missing": 0, "failed": 0, "dropped": 0}
+    if not todo:
+        return stats
+    asyncio.run(_reparse_all(archive, todo, workers, dry_run, stats, PARSER_VERSION))
+    return stats
+
+
+async def _reparse_all(
+    archive: HtmlArchive, todo: List[Tuple[str, str]], workers: int, dry_run: bool, stats: Dict[str, int], version: int
+) -> None:
+    from .persist import persist_entry, writer_from_config
+    from .replica import replica_from_config
+
+    replica = None if dry_run else replica_from_config(start_sync=False)
+    writer = None if dry_run or get_cfg("WRITE_BEHIND") == "0" else writer_from_config()
+    if writer is not None:
+        writer.start()
+    loop = asyncio.get_running_loop()
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(archive.root,)) as pool:
+            futures = [loop.run_in_executor(pool, _reparse, slug, entry) for slug, entry in todo]
+            for fut in asyncio.as_completed(futures):
+                try:
+                    slug, entry, data = await fut
+                except Exception as e:
+                    stats["failed"] += 1
+                    try:
+                        print("REPARSE_ERROR", str(e))
+                    except Exception:
+                        pass
+                    continue
+                if data is None:
+                    stats["missing"] += 1
+                    continue
+                if not dry_run:
+                    await persist_entry(slug, entry, data, replica, writer)
+                    archive.record_entry(slug, entry, version)
+                stats["parsed"] += 1
+    finally:
+        if writer is not None:
+            await writer.close(timeout=get_cfg_float("WRITE_BEHIND_FLUSH_TIMEOUT", 60.0))
+            stats["dropped"] = writer.stats()["dropped"]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.archive")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rp = sub.add_parser("reparse", help="re-parse archived pages and re-upsert the entries")
+    rp.add_argument("--root", default=get_cfg("CAMBRIDGE_ARCHIVE_DIR"), help="archive directory")
+    rp.add_argument("--workers", type=int, default=get_cfg_int("ARCHIVE_REPARSE_WORKERS", os.cpu_count() or 1))
+    rp.add_argument("--all", action="store_true", help="ignore parser versions and re-parse everything")
+    rp.add_argument("--dry-run", action="store_true", help="parse but do not upsert")
+    args = parser.parse_args(argv)
+    if not args.root:
+        print("no archive directory: pass --root or set CAMBRIDGE_ARCHIVE_DIR")
+        return 2
+    stats = reparse(args.root, max(1, args.workers), everything=args.all, dry_run=args.dry_run)
+    print("REPARSE_DONE", stats)
+    return 1 if stats["failed"] or stats["dropped"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
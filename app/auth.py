@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse, RedirectResponse
 from pydantic import BaseModel
 import re
@@ -9,7 +10,8 @@ import secrets
 import requests
 from .utils_cfg import get_cfg
 from .utils_jwt import create_token, decode_token
-from .repo_auth import upsert_user, get_user_by_email, insert_code, verify_code, insert_auth_event, insert_page_visit, add_favorite, remove_favorite, check_favorite, list_favorites
+from .repo_auth import upsert_user, get_user_by_email, insert_code, verify_code, insert_auth_event, insert_page_visit, add_favorite, remove_favorite, check_favorite, list_favorites, list_favorites_page_async
+from .repo import get_entries_batch_async
 
 router = APIRouter()
 
@@ -263,11 +265,40 @@ def fav_status(request: Request, language: str, word: str):
     ok = check_favorite(user_id, language.strip(), word.strip().lower())
     return JSONResponse(status_code=200, content={"favorited": ok})
 
+FAVORITES_PAGE_MAX = 100
+
+
+def _favorite_summary(entry: dict, senses: int) -> list:
+    return [
+        {"text": d.get("text") or "", "level": d.get("level") or "", "translation": d.get("translation") or "", "pos": d.get("pos") or ""}
+        for d in (entry.get("definition") or [])[:senses]
+        if isinstance(d, dict)
+    ]
+
+
 @router.get("/favorites/list")
-def fav_list(request: Request):
+async def fav_list(request: Request, expand: str | None = None, limit: int | None = None, cursor: str | None = None, senses: int = 3):
     data = _auth_context(request)
     if not data:
         return JSONResponse(status_code=401, content={"error": "unauthorized"})
     user_id = data.get("sub")
-    items = list_favorites(user_id)
-    return JSONResponse(status_code=200, content={"items": items})
+    if expand is None and limit is None and cursor is None:
+        items = await run_in_threadpool(list_favorites, user_id)
+        return JSONResponse(status_code=200, content={"items": items})
+    if expand not in (None, "summary"):
+        return JSONResponse(status_code=400, content={"error": "expand must be 'summary'"})
+    limit = max(1, min(limit or FAVORITES_PAGE_MAX, FAVORITES_PAGE_MAX))
+    try:
+        items, next_cursor = await list_favorites_page_async(user_id, limit, cursor)
+    except ValueError:
+        return JSONResponse(status_code=400, content={"error": "invalid cursor"})
+    if expand == "summary":
+        # favorites has no foreign key to dictionary_entries, so the page is joined
+        # with one batched entries lookup instead of a request per favorite
+        pairs = list(dict.fromkeys((it.get("language") or "", (it.get("word") or "").strip().lower()) for it in items))
+        found = await get_entries_batch_async(pairs) if pairs else {}
+        senses = max(0, min(senses, 10))
+        for it in items:
+            hit = found.get((it.get("language") or "", (it.get("word") or "").strip().lower()))
+            it["summary"] = _favorite_summary(hit[0], senses) if hit else None
+    return JSONResponse(status_code=200, content={"items": items, "next_cursor": next_cursor})
@@ -0,0 +1,189 @@
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Dict, Iterator, List, Optional
+
+from .cache import FrequencySketch, TTLCache
+from . import config
+
+
+def bench_cache(sizes: List[int], ops: int, seed: int = 0) -> List[Dict[str, float]]:
+    """Per-op latency of a full TTLCache under a 90/10 get/set mix, per maxsize."""
+    rng = random.Random(seed)
+    rows: List[Dict[str, float]] = []
+    for size in sizes:
+        cache = TTLCache(maxsize=size, ttl_seconds=3600)
+        for i in range(size):
+            cache.set(f"k{i}", i)
+        keys = [f"k{rng.randrange(size * 2)}" for _ in range(ops)]
+        writes = [rng.random() < 0.1 for _ in range(ops)]
+        t0 = time.perf_counter()
+        for key, write in zip(keys, writes):
+            if write:
+                cache.set(key, key)
+            else:
+                cache.get(key)
+        elapsed = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        cache.sweep()
+        sweep = time.perf_counter() - t0
+        rows.append({"maxsize": size, "ops": ops, "ns_per_op": elapsed / ops * 1e9, "sweep_ms": sweep * 1e3})
+    return rows
+
+
+def _visit_key(rec: Dict[str, str]) -> Optional[str]:
+    path = rec.get("path") or ""
+    prefix = "/api/dictionary/"
+    if path.startswith(prefix):
+        parts = path[len(prefix):].split("/", 1)
+        if len(parts) == 2 and parts[1]:
+            return f"{parts[0]}:{parts[1].strip().lower()}"
+    action = rec.get("action_type") or ""
+    if action.startswith("translate(") and rec.get("action_content"):
+        return f"{action[len('translate('):-1]}:{rec['action_content'].strip().lower()}"
+    return None
+
+
+def load_trace(path: str) -> List[str]:
+    """Dictionary lookups, in order, from a page_visits export (CSV, JSON array or JSON lines)."""
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith(".csv"):
+            records: Iterator[Dict[str, str]] = csv.DictReader(f)
+        else:
+            text = f.read()
+            if text.lstrip().startswith("["):
+                records = iter(json.loads(text))
+            else:
+                records = (json.loads(line) for line in text.splitlines() if line.strip())
+        rows = [(rec.get("created_at") or "", _visit_key(rec)) for rec in records]
+    # exports are not necessarily in time order; ISO timestamps sort lexically
+    if all(ts for ts, _ in rows):
+        rows.sort(key=lambda r: r[0])
+    return [k for _, k in rows if k]
+
+
+def synthetic_trace(length: int, vocabulary: int = 50000, scan_share: float = 0.3, seed: int = 0) -> List[str]:
+    """Zipf-distributed lookups interleaved with a crawler walking unique long-tail words."""
+    rng = random.Random(seed)
+    weights = [1.0 / (rank + 1) for rank in range(vocabulary)]
+    hot = rng.choices(range(vocabulary), weights=weights, k=length)
+    out: List[str] = []
+    scan = 0
+    for rank in hot:
+        if rng.random() < scan_share:
+            scan += 1
+            out.append(f"en:crawl{scan}")
+        else:
+            out.append(f"en:w{rank}")
+    return out
+
+
+def replay(trace: List[str], capacity: int) -> Dict[str, float]:
+    """Hit ratio of plain LRU and TinyLFU-admitted LRU over the same trace."""
+    out: Dict[str, float] = {}
+    for name, admission in (("lru", None), ("tinylfu", FrequencySketch(capacity))):
+        cache = TTLCache(maxsize=capacity, ttl_seconds=10 ** 9, admission=admission)
+        hits = 0
+        for key in trace:
+            if cache.get(key) is None:
+                cache.set(key, True)
+            else:
+                hits += 1
+        out[name] = hits / len(trace) if trace else 0.0
+    return out
+
+
+# keys looked up on the /api/dictionary path (Supabase REST, JWT, feature flags)
+CONFIG_KEYS = ("SUPABASE_URL", "SUPABASE_KEY", "JWT_SECRET", "NEGATIVE_CACHE_PERSIST", "RESPONSE_CACHE_TTL")
+
+
+def bench_config(requests_: int, path: Optional[str] = None) -> Dict[str, float]:
+    """Per-request cost of .secret lookups: re-parsing the file each time vs the snapshot.
+
+    Without ``path`` the project's .secret is used, or a representative temporary
+    file when there is none. Environment lookups cost the same either way and
+    are left out.
+    """
+    tmp = None
+    if path is None:
+        path = config._secret_path()
+        if not os.path.exists(path):
+            fd, tmp = tempfile.mkstemp(suffix=".secret")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write("# sample\n")
+                for i, key in enumerate(CONFIG_KEYS + tuple(f"EXTRA_{n}" for n in range(15))):
+                    f.write(f"{key}=value-{i}-{'x' * 40}\n")
+            path = tmp
+    try:
+        t0 = time.perf_counter()
+        for _ in range(requests_):
+            for key in CONFIG_KEYS:
+                config._read_secret(path).get(key)
+        legacy = time.perf_counter() - t0
+        snap = config._Snapshot(path)
+        t0 = time.perf_counter()
+        for _ in range(requests_):
+            for key in CONFIG_KEYS:
+                snap.get().get(key)
+        snapshot = time.perf_counter() - t0
+    finally:
+        if tmp:
+            os.unlink(tmp)
+    return {
+        "requests": requests_,
+        "legacy_us_per_request": legacy / requests_ * 1e6,
+        "snapshot_us_per_request": snapshot / requests_ * 1e6,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.bench")
+    sub = parser.add_subparsers(dest="command", required=True)
+    cp = sub.add_parser("cache", help="TTLCache get/set latency as maxsize grows")
+    cp.add_argument("--sizes", default="1000,10000,100000,1000000", help="comma-separated maxsize values")
+    cp.add_argument("--ops", type=int, default=200000)
+    rp = sub.add_parser("replay", help="replay a page_visits trace through LRU and TinyLFU")
+    rp.add_argument("trace", nargs="?", help="page_visits export (.csv, .json or .jsonl)")
+    rp.add_argument("--capacity", type=int, default=1000)
+    rp.add_argument("--synthetic", type=int, default=0, help="generate a trace of this length instead")
+    fp = sub.add_parser("config", help="config lookup cost per request")
+    fp.add_argument("--requests", type=int, default=20000)
+    fp.add_argument("--secret", help="config file to read (default: .secret or a generated sample)")
+    args = parser.parse_args(argv)
+
+    if args.command == "cache":
+        sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+        for row in bench_cache(sizes, args.ops):
+            print(
+                "CACHE_BENCH maxsize=%d ops=%d ns_per_op=%.0f sweep_ms=%.2f"
+                % (row["maxsize"], row["ops"], row["ns_per_op"], row["sweep_ms"])
+            )
+    elif args.command == "replay":
+        if args.synthetic:
+            trace = synthetic_trace(args.synthetic)
+        elif args.trace:
+            trace = load_trace(args.trace)
+        else:
+            print("pass a page_visits export or --synthetic N")
+            return 2
+        ratios = replay(trace, args.capacity)
+        print(
+            "REPLAY lookups=%d capacity=%d lru_hit_ratio=%.4f tinylfu_hit_ratio=%.4f"
+            % (len(trace), args.capacity, ratios["lru"], ratios["tinylfu"])
+        )
+    elif args.command == "config":
+        row = bench_config(args.requests, args.secret)
+        print(
+            "CONFIG_BENCH requests=%d keys=%d legacy_us_per_request=%.1f snapshot_us_per_request=%.2f"
+            % (row["requests"], len(CONFIG_KEYS), row["legacy_us_per_request"], row["snapshot_us_per_request"])
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,40 +1,305 @@
-from collections import OrderedDict
+from collections import OrderedDict, deque
+import sys
+import threading
 import time
+import weakref
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate memory footprint of a cached value in bytes.
+
+    Walks dicts, lists and tuples and sums ``sys.getsizeof`` of every node, so
+    shared sub-objects are counted once per reference. That over-counts a little
+    but is cheap next to the fetch and parse that produced the value.
+    """
+    total = 0
+    stack = [value]
+    while stack:
+        v = stack.pop()
+        total += sys.getsizeof(v)
+        if isinstance(v, dict):
+            stack.extend(v.keys())
+            stack.extend(v.values())
+        elif isinstance(v, (list, tuple)):
+            stack.extend(v)
+    return total
+
+
+class FrequencySketch:
+    """Count-Min sketch of recent key popularity, used for TinyLFU admission.
+
+    ``depth`` rows of 4-bit-saturating counters (stored one per byte); a key's
+    estimate is the minimum of its counters. After ``sample_size`` increments
+    every counter is halved, so the sketch follows shifts in popularity instead
+    of remembering all-time counts.
+    """
+
+    MAX_COUNT = 15
+    _SEEDS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93)
+
+    def __init__(self, capacity: int, depth: int = 4):
+        width = 16
+        while width < capacity * 4:
+            width <<= 1
+        self.width = width
+        self._mask = width - 1
+        self.depth = min(depth, len(self._SEEDS))
+        self._rows = [bytearray(width) for _ in range(self.depth)]
+        self.sample_size = max(10 * capacity, 100)
+        self._additions = 0
+        self.resets = 0
+
+    def _indexes(self, key: str):
+        h = hash(key) & 0xFFFFFFFFFFFFFFFF
+        for i in range(self.depth):
+            x = ((h ^ self._SEEDS[i]) * 0xFF51AFD7ED558CCD) & 0xFFFFFFFFFFFFFFFF
+            yield (x ^ (x >> 29)) & self._mask
+
+    def increment(self, key: str) -> None:
+        added = False
+        for row, idx in zip(self._rows, self._indexes(key)):
+            if row[idx] < self.MAX_COUNT:
+                row[idx] += 1
+                added = True
+        if added:
+            self._additions += 1
+            if self._additions >= self.sample_size:
+                self._age()
+
+    def estimate(self, key: str) -> int:
+        return min(row[idx] for row, idx in zip(self._rows, self._indexes(key)))
+
+    def _age(self) -> None:
+        for i, row in enumerate(self._rows):
+            self._rows[i] = bytearray(c >> 1 for c in row)
+        self._additions //= 2
+        self.resets += 1
 
 
 class TTLCache:
-    def __init__(self, maxsize: int = 1000, ttl_seconds: int = 1800):
+    """LRU cache with a fixed time-to-live, safe to share between threads.
+
+    ``get`` and ``set`` are amortized O(1): an expired entry is dropped lazily
+    when it is looked up, and everything else is left to ``sweep``, which walks
+    a deque of (expires_at, key) kept in insertion order. Since the TTL is the
+    same for every entry, that order is also expiry order, so a sweep stops at
+    the first live entry. The lock is only ever held for O(1) work or one
+    bounded sweep batch.
+
+    With ``max_bytes`` set, the cache is also bounded by the summed
+    ``sizeof(value)`` of its entries and evicts least-recently-used entries until
+    it fits; a single value larger than the whole budget is not stored.
+    ``maxsize=None`` drops the entry-count bound.
+
+    With an ``admission`` sketch (TinyLFU), every lookup is counted and a new
+    key that would force an eviction is only stored if the sketch rates it
+    hotter than the least-recently-used entry it would evict, so one-off scans
+    cannot flush the frequently used entries. A caller that looks the same key
+    up more than once per request passes ``record=False`` on the repeats so
+    neither the sketch nor the hit ratio counts them twice.
+    """
+
+    SWEEP_BATCH = 1024
+
+    def __init__(
+        self,
+        maxsize: Optional[int] = 1000,
+        ttl_seconds: float = 1800,
+        max_bytes: Optional[int] = None,
+        sizeof: Callable[[Any], int] = estimate_size,
+        admission: Optional[FrequencySketch] = None,
+    ):
         self.maxsize = maxsize
+        self.admission = admission
         self.ttl = ttl_seconds
-        self._store: OrderedDict[str, tuple[float, object]] = OrderedDict()
-
-    def _purge_expired(self):
-        now = time.time()
-        keys_to_delete = []
-        for k, (ts, _) in list(self._store.items()):
-            if now - ts > self.ttl:
-                keys_to_delete.append(k)
-        for k in keys_to_delete:
-            self._store.pop(k, None)
-
-    def get(self, key: str):
-        self._purge_expired()
-        if key in self._store:
-            ts, val = self._store.pop(key)
-            # re-insert to mark as recently used
-            self._store[key] = (ts, val)
-            return val
-        return None
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._store: OrderedDict[str, Tuple[float, object, int]] = OrderedDict()
+        self._expiry: Deque[Tuple[float, str]] = deque()
+        self._lock = threading.Lock()
+        self._sweeper: Optional[threading.Thread] = None
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.rejected = 0
+        self.admission_rejected = 0
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def _drop(self, key: str) -> None:
+        item = self._store.pop(key, None)
+        if item is not None:
+            self.bytes -= item[2]
+
+    def get(self, key: str, record: bool = True):
+        now = time.monotonic()
+        with self._lock:
+            if record and self.admission is not None:
+                self.admission.increment(key)
+            item = self._store.get(key)
+            if item is None:
+                self.misses += record
+                return None
+            if item[0] <= now:
+                self._drop(key)
+                self.expirations += 1
+                self.misses += record
+                return None
+            # mark as recently used
+            self._store.move_to_end(key)
+            self.hits += record
+            return item[1]
+
+    def note(self, key: str) -> None:
+        """Count a lookup of ``key`` that was answered before reaching this cache."""
+        if self.admission is not None:
+            with self._lock:
+                self.admission.increment(key)
 
     def set(self, key: str, value: object):
-        self._purge_expired()
-        if key in self._store:
-            self._store.pop(key)
-        self._store[key] = (time.time(), value)
-        while len(self._store) > self.maxsize:
-            # evict least-recently-used
-            self._store.popitem(last=False)
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            existed = key in self._store
+            self._drop(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                self.rejected += 1
+                return
+            if not existed and self.admission is not None and self._store and (
+                (self.maxsize is not None and len(self._store) >= self.maxsize)
+                or (self.max_bytes is not None and self.bytes + size > self.max_bytes)
+            ):
+                victim = next(iter(self._store))
+                if self.admission.estimate(key) <= self.admission.estimate(victim):
+                    self.admission_rejected += 1
+                    return
+            self._store[key] = (expires_at, value, size)
+            self.bytes += size
+            self._expiry.append((expires_at, key))
+            # evict least-recently-used until both bounds hold
+            while (self.maxsize is not None and len(self._store) > self.maxsize) or (
+                self.max_bytes is not None and self.bytes > self.max_bytes
+            ):
+                _, old = self._store.popitem(last=False)
+                self.bytes -= old[2]
+                self.evictions += 1
+            if len(self._expiry) > 2 * len(self._store) + self.SWEEP_BATCH:
+                # overwrites and evictions leave stale deque records behind;
+                # rebuilding once the deque is twice the live size keeps this amortized O(1)
+                self._compact()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._drop(key)
+
+    def _compact(self) -> None:
+        live = sorted((item[0], k) for k, item in self._store.items())
+        self._expiry = deque(live)
+
+    def sweep(self) -> int:
+        """Drop expired entries from the front of the expiry deque; returns the count."""
+        removed = 0
+        while True:
+            now = time.monotonic()
+            with self._lock:
+                batch = 0
+                while self._expiry and batch < self.SWEEP_BATCH:
+                    expires_at, key = self._expiry[0]
+                    if expires_at > now:
+                        return removed
+                    self._expiry.popleft()
+                    batch += 1
+                    item = self._store.get(key)
+                    # skip records superseded by a later set of the same key
+                    if item is not None and item[0] == expires_at:
+                        self._drop(key)
+                        self.expirations += 1
+                        removed += 1
+                if not self._expiry:
+                    return removed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._store),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "rejected": self.rejected,
+                "admission_rejected": self.admission_rejected,
+            }
+
+    def start_sweeper(self, interval: float) -> None:
+        """Sweep every ``interval`` seconds from a daemon thread until the cache is collected."""
+        if interval <= 0 or self._sweeper is not None:
+            return
+        ref = weakref.ref(self)
+
+        def run():
+            while True:
+                time.sleep(interval)
+                cache = ref()
+                if cache is None:
+                    return
+                try:
+                    cache.sweep()
+                except Exception:
+                    pass
+                del cache
+
+        self._sweeper = threading.Thread(target=run, name="ttlcache-sweeper", daemon=True)
+        self._sweeper.start()
 
     def make_key(self, url: str) -> str:
         return f"cache_{''.join(ch if ch.isalnum() else '_' for ch in url)}"
 
+
+
+class NegativeCache:
+    """Bounded, TTL'd memory of (language, entry) lookups upstream does not have.
+
+    ``hits`` counts lookups answered from memory (a DB and an upstream call saved
+    each); ``table_hits`` counts misses re-learnt from the persisted table (an
+    upstream call saved each).
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl_seconds: int = 3600):
+        self._cache = TTLCache(maxsize=maxsize, ttl_seconds=ttl_seconds)
+        self.ttl = ttl_seconds
+        self.hits = 0
+        self.table_hits = 0
+        self.recorded = 0
+
+    def _key(self, language: str, entry: str) -> str:
+        return f"{language}:{entry}"
+
+    def contains(self, language: str, entry: str) -> bool:
+        if self._cache.get(self._key(language, entry)) is None:
+            return False
+        self.hits += 1
+        return True
+
+    def add(self, language: str, entry: str, from_table: bool = False) -> None:
+        self._cache.set(self._key(language, entry), True)
+        if from_table:
+            self.table_hits += 1
+        else:
+            self.recorded += 1
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._cache),
+            "hits": self.hits,
+            "table_hits": self.table_hits,
+            "upstream_calls_saved": self.hits + self.table_hits,
+            "recorded": self.recorded,
+        }
@@ -1,11 +1,19 @@
 from __future__ import annotations
 
+import asyncio
+import httpx
 import requests
-from bs4 import BeautifulSoup
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout, wait
+from bs4 import BeautifulSoup, NavigableString, Tag
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
-from .cache import TTLCache
+from .archive import HtmlArchive, archive_from_config
+from .cache import FrequencySketch, TTLCache
+from .sharedcache import SharedCache, shared_cache_from_config
+from .parsers import extract_entry_regions, make_soup, resolve_engine
+from .utils_cfg import get_cfg, get_cfg_float, get_cfg_int
+from .verbs import VerbStore
 
 
 DEFAULT_HEADERS = {
@@ -16,6 +24,42 @@ DEFAULT_HEADERS = {
     )
 }
 
+CEFR_LEVELS = ("A1", "A2", "B1", "B2", "C1", "C2")
+
+# ?verbs= modes: "eager" starts the Wiktionary lookup alongside the Cambridge
+# fetch, "lazy" only looks verbs up once the parsed entry shows a verb sense,
+# "none" never looks them up.
+VERBS_MODES = ("eager", "lazy", "none")
+
+# Bump whenever _parse_entry/_parse_verbs output changes so archived pages get
+# re-parsed by `python -m app.archive reparse`.
+PARSER_VERSION = 1
+
+# Default per-namespace byte budgets for the in-process caches.
+CACHE_BUDGETS = {
+    "html": 32 * 1024 * 1024,
+    "entries": 32 * 1024 * 1024,
+    "verbs": 4 * 1024 * 1024,
+}
+
+
+class UpstreamError(Exception):
+    """Cambridge could not be reached or answered with a server-side error.
+
+    Raised only by strict fetches so callers can tell "the word does not exist"
+    (None) from "we could not find out".
+    """
+
+
+def has_verb_sense(pos: List[str]) -> bool:
+    # "verb", "phrasal verb", "modal verb" ... but not "adverb"
+    return any("verb" in (p or "").lower().split() for p in pos)
+
+
+def _is_transient(status_code: int) -> bool:
+    # only 404/410 say the word has no page; 403 (bot wall), 429 and 5xx say nothing about it
+    return status_code not in (404, 410)
+
 
 @dataclass
 class Example:
@@ -43,12 +87,117 @@ class Pronunciation:
     pron: str
 
 
+@dataclass
+class _EntryScan:
+    pos: Optional[str] = None
+
+
+@dataclass
+class _BlockScan:
+    entry: Optional[_EntryScan]
+    source: str
+    string_types: Any
+    text_el: Optional[Tag] = None
+    trans_el: Optional[Tag] = None
+    level: str = ""
+    raw_levels: Set[str] = field(default_factory=set)
+    examples: List[Tag] = field(default_factory=list)
+
+
+def _classes(el: Tag) -> List[str]:
+    cls = el.get("class") or []
+    if isinstance(cls, str):
+        return cls.split()
+    return cls
+
+
+def _is_text_type(node: NavigableString, types: Any) -> bool:
+    # mirrors the string filter Tag.get_text applies for its default types
+    if isinstance(types, type):
+        return type(node) is types
+    return type(node) in types
+
+
 class CambridgeClient:
-    def __init__(self, timeout: int = 10, cache_ttl: int = 1800):
+    def __init__(
+        self,
+        timeout: int = 10,
+        cache_ttl: int = 1800,
+        parser_engine: Optional[str] = None,
+        fanout_limit: Optional[int] = None,
+        fanout_deadline: Optional[float] = None,
+        verbs_budget: Optional[float] = None,
+        archive: Optional[HtmlArchive] = None,
+        offline: bool = False,
+        verb_store: Optional[VerbStore] = None,
+        shared_cache: Optional[SharedCache] = None,
+    ):
         self.session = requests.Session()
         self.session.headers.update(DEFAULT_HEADERS)
         self.timeout = timeout
-        self.cache = TTLCache(ttl_seconds=cache_ttl)
+        # one cache per namespace, each bounded by an approximate byte budget
+        # (CACHE_<NS>_MAX_BYTES) as well as by entry count. entry_cache holds final
+        # entry dicts keyed by (slug, entry); raw pages only go into html_cache when
+        # CAMBRIDGE_CACHE_HTML=1
+        sweep_interval = get_cfg_float("CACHE_SWEEP_INTERVAL", 60.0)
+        self.caches: Dict[str, TTLCache] = {}
+        for ns, max_bytes in CACHE_BUDGETS.items():
+            maxsize = get_cfg_int("CACHE_MAX_ENTRIES", 1000)
+            # parsed entries sit behind a TinyLFU admission filter so crawler sweeps
+            # over long-tail words do not flush the hot set (CACHE_ADMISSION=lru disables)
+            admission = None
+            if ns == "entries" and get_cfg("CACHE_ADMISSION") != "lru":
+                admission = FrequencySketch(maxsize)
+            cache = TTLCache(
+                maxsize=maxsize,
+                ttl_seconds=cache_ttl,
+                max_bytes=get_cfg_int(f"CACHE_{ns.upper()}_MAX_BYTES", max_bytes) or None,
+                admission=admission,
+            )
+            if not offline:
+                # offline clients are short-lived batch tools; reads still drop expired entries
+                cache.start_sweeper(sweep_interval)
+            self.caches[ns] = cache
+        self.html_cache = self.caches["html"]
+        self.entry_cache = self.caches["entries"]
+        self.verbs_cache = self.caches["verbs"]
+        # optional host-wide tier behind the in-process caches (CAMBRIDGE_SHARED_CACHE);
+        # hits there are promoted into the in-process cache
+        if shared_cache is None and not offline:
+            shared_cache = shared_cache_from_config(cache_ttl)
+        self.shared_cache = shared_cache
+        self.cache_html = get_cfg("CAMBRIDGE_CACHE_HTML") == "1"
+        # CAMBRIDGE_PARSER_ENGINE=lxml switches to the C-backed builder when installed
+        self.parser_engine = resolve_engine(parser_engine or get_cfg("CAMBRIDGE_PARSER_ENGINE"))
+        # only the entry-body/dictionary regions are handed to the DOM parser unless disabled
+        self.scoped_parse = get_cfg("CAMBRIDGE_SCOPED_PARSE") != "0"
+        # cn-en aggregate: sub-pages fetched in parallel, at most fanout_limit at a time,
+        # and anything still pending after fanout_deadline seconds is dropped
+        self.fanout_limit = max(1, fanout_limit or get_cfg_int("CAMBRIDGE_FANOUT_LIMIT", 4))
+        self.fanout_deadline = fanout_deadline or get_cfg_float("CAMBRIDGE_FANOUT_DEADLINE", float(timeout))
+        # the Wiktionary lookup runs alongside the Cambridge fetch; once the Cambridge
+        # parse is done we wait at most verbs_budget seconds more for it
+        self.verbs_budget = verbs_budget if verbs_budget is not None else get_cfg_float("CAMBRIDGE_VERBS_BUDGET", 1.0)
+        # fetched pages are written to the archive (CAMBRIDGE_ARCHIVE_DIR); an offline
+        # client reads pages from it instead of the network
+        self.archive = archive if archive is not None else archive_from_config()
+        self.offline = offline
+        # inflections are shared across slugs and persisted in verb_inflections;
+        # an offline client keeps them in memory only
+        self.verb_store = verb_store if verb_store is not None else VerbStore(persist=not offline)
+        self.executor = ThreadPoolExecutor(
+            max_workers=get_cfg_int("CAMBRIDGE_WORKERS", 8), thread_name_prefix="cambridge"
+        )
+        # called as (slug, entry, entry dict) when verbs that missed the budget are
+        # patched in, so whoever stored the verbs-less entry can store it again. Runs
+        # on the thread that finished the lookup (the event loop for the async client)
+        self.on_entry_patched: Optional[Callable[[str, str, Dict[str, Any]], None]] = None
+
+    def cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        out = {ns: cache.stats() for ns, cache in self.caches.items()}
+        if self.shared_cache is not None:
+            out["shared"] = self.shared_cache.stats()
+        return out
 
     def _language_mapping(self, slug_language: str) -> tuple[str, str]:
         nation = "us"
@@ -78,11 +227,25 @@ class CambridgeClient:
             path = f"/dictionary/{language}/{safe_entry}"
         return base + path
 
-    def _fetch(self, url: str) -> Optional[str]:
-        key = self.cache.make_key(url)
-        cached = self.cache.get(key)
-        if cached is not None:
-            return cached
+    def _archive_page(self, url: str, html: str) -> None:
+        if self.archive is None or self.offline:
+            return
+        try:
+            self.archive.put(url, html)
+        except Exception as e:
+            try:
+                print("ARCHIVE_PUT_FAIL", url, str(e))
+            except Exception:
+                pass
+
+    def _fetch(self, url: str, strict: bool = False) -> Optional[str]:
+        key = self.html_cache.make_key(url)
+        if self.cache_html:
+            cached = self.html_cache.get(key)
+            if cached is not None:
+                return cached
+        if self.offline:
+            return self.archive.get(url) if self.archive is not None else None
         try:
             r = self.session.get(url, timeout=self.timeout)
             if r.status_code != 200:
@@ -90,22 +253,128 @@ class CambridgeClient:
                     print("FETCH_STATUS", r.status_code, r.url)
                 except Exception:
                     pass
+                if strict and _is_transient(r.status_code):
+                    raise UpstreamError(f"{r.status_code} {url}")
                 return None
-            self.cache.set(key, r.text)
+            if self.cache_html:
+                self.html_cache.set(key, r.text)
+            self._archive_page(url, r.text)
             return r.text
-        except requests.RequestException:
+        except requests.RequestException as e:
+            if strict:
+                raise UpstreamError(str(e)) from e
             return None
 
+    def _soup(self, html: str) -> BeautifulSoup:
+        return make_soup(html, self.parser_engine)
+
+    def _scan_definitions(self, soup: BeautifulSoup) -> tuple[List[str], List["_BlockScan"]]:
+        """Walk the document once, collecting every `.pos.dpos` text and one
+        `_BlockScan` per `.def-block.ddef_block`.
+
+        The enclosing `.dictionary` source and `.entry-body__el` part of speech
+        are carried down the walk instead of being looked up per block; matches
+        are attributed to every open block so nested blocks see the same
+        elements the equivalent `select_one`/`get_text` calls would.
+        """
+        pos_texts: List[str] = []
+        blocks: List[_BlockScan] = []
+        sources: List[str] = []
+        open_entries: List[_EntryScan] = []
+        open_blocks: List[_BlockScan] = []
+
+        def visit(el: Tag) -> None:
+            classes = _classes(el)
+            if classes:
+                if "pos" in classes and "dpos" in classes:
+                    text = el.get_text(strip=True)
+                    pos_texts.append(text)
+                    for e in open_entries:
+                        if e.pos is None:
+                            e.pos = text
+                if open_blocks:
+                    if "def" in classes and "ddef_d" in classes and "db" in classes:
+                        for b in open_blocks:
+                            if b.text_el is None:
+                                b.text_el = el
+                    if "epp-xref" in classes or "cefr" in classes or "dxref" in classes:
+                        lv = el.get_text(strip=True)
+                        if lv in CEFR_LEVELS:
+                            for b in open_blocks:
+                                if not b.level:
+                                    b.level = lv
+                    if ("trans" in classes and "dtrans" in classes and el.name == "span") or (
+                        "examp" in classes and "dexamp" in classes
+                    ):
+                        parent_classes = _classes(el.parent) if el.parent is not None else []
+                        if "def-body" in parent_classes and "ddef_b" in parent_classes:
+                            if "examp" in classes and "dexamp" in classes:
+                                for b in open_blocks:
+                                    b.examples.append(el)
+                            if "trans" in classes and "dtrans" in classes and el.name == "span":
+                                for b in open_blocks:
+                                    if b.trans_el is None:
+                                        b.trans_el = el
+            is_block = "def-block" in classes and "ddef_block" in classes
+            if is_block:
+                block = _BlockScan(
+                    entry=open_entries[-1] if open_entries else None,
+                    source=sources[-1] if sources else "",
+                    string_types=el.interesting_string_types,
+                )
+                blocks.append(block)
+                open_blocks.append(block)
+            is_dict = "dictionary" in classes
+            if is_dict:
+                sources.append(el.get("data-id", ""))
+            is_entry = "entry-body__el" in classes
+            if is_entry:
+                open_entries.append(_EntryScan())
+
+            for child in el.children:
+                if isinstance(child, Tag):
+                    visit(child)
+                elif open_blocks and isinstance(child, NavigableString):
+                    text = None
+                    for b in open_blocks:
+                        if not _is_text_type(child, b.string_types):
+                            continue
+                        if text is None:
+                            text = f" {child.strip()} "
+                        if len(text) > 2:
+                            for lv in CEFR_LEVELS:
+                                if f" {lv} " in text:
+                                    b.raw_levels.add(lv)
+
+            if is_entry:
+                open_entries.pop()
+            if is_dict:
+                sources.pop()
+            if is_block:
+                open_blocks.pop()
+
+        visit(soup)
+        return pos_texts, blocks
+
     def _parse_entry(self, html: str, source_hint: Optional[str] = None) -> Dict[str, Any]:
-        soup = BeautifulSoup(html, "html.parser")
+        soup = None
+        if self.scoped_parse:
+            scoped = extract_entry_regions(html)
+            if scoped is not None:
+                soup = self._soup(scoped)
+                pos_texts, blocks = self._scan_definitions(soup)
+                if not blocks:
+                    # cn-en style pages keep their definitions outside the usual
+                    # layout; let the fallbacks below see the whole page
+                    soup = None
+        if soup is None:
+            soup = self._soup(html)
+            pos_texts, blocks = self._scan_definitions(soup)
         siteurl = "https://dictionary.cambridge.org"
 
         word_el = soup.select_one(".hw.dhw")
         word = word_el.get_text(strip=True) if word_el else ""
 
-        pos_elements = soup.select(".pos.dpos")
-        pos = list(dict.fromkeys([el.get_text(strip=True) for el in pos_elements]))
-
         pronunciation: List[Pronunciation] = []
         for header in soup.select(".pos-header.dpos-h"):
             pos_node = header.select_one(".dpos-g")
@@ -121,38 +390,22 @@ class CambridgeClient:
                         Pronunciation(pos=p, lang=lang, url=(siteurl + audio_src) if audio_src else "", pron=pron_text)
                     )
 
+        pos = list(dict.fromkeys(pos_texts))
+
         definitions: List[Definition] = []
-        blocks = soup.select(".def-block.ddef_block")
         for i, block in enumerate(blocks):
-            entry_el = block.find_parent(class_="entry-body__el")
-            pos_text = ""
-            if entry_el:
-                pos_el = entry_el.select_one(".pos.dpos")
-                pos_text = pos_el.get_text(strip=True) if pos_el else ""
-            dict_el = block.find_parent(class_="dictionary")
-            source = dict_el.get("data-id", "") if dict_el else ""
-            text_el = block.select_one(".def.ddef_d.db")
-            text = text_el.get_text(" ", strip=True) if text_el else ""
-            trans_el = block.select_one(".def-body.ddef_b > span.trans.dtrans")
-            translation = trans_el.get_text(" ", strip=True) if trans_el else ""
-            level = ""
-            level_candidates = [
-                el.get_text(strip=True)
-                for el in block.select(".epp-xref, .cefr, .dxref")
-            ]
-            for lv in level_candidates:
-                if lv in {"A1", "A2", "B1", "B2", "C1", "C2"}:
-                    level = lv
-                    break
+            pos_text = (block.entry.pos or "") if block.entry else ""
+            text = block.text_el.get_text(" ", strip=True) if block.text_el else ""
+            translation = block.trans_el.get_text(" ", strip=True) if block.trans_el else ""
+            level = block.level
             if not level:
-                raw = block.get_text(" ", strip=True)
-                for lv in ("A1", "A2", "B1", "B2", "C1", "C2"):
-                    if f" {lv} " in f" {raw} ":
+                for lv in CEFR_LEVELS:
+                    if lv in block.raw_levels:
                         level = lv
                         break
 
             examples: List[Example] = []
-            for j, ex in enumerate(block.select(".def-body.ddef_b > .examp.dexamp")):
+            for j, ex in enumerate(block.examples):
                 eg_el = ex.select_one(".eg.deg")
                 eg = eg_el.get_text(" ", strip=True) if eg_el else ""
                 tr_el = ex.select_one(".trans.dtrans")
@@ -163,7 +416,7 @@ class CambridgeClient:
                 Definition(
                     id=i,
                     pos=pos_text,
-                    source=source if source else (source_hint or ""),
+                    source=block.source if block.source else (source_hint or ""),
                     text=text,
                     translation=translation,
                     level=level,
@@ -229,17 +482,11 @@ class CambridgeClient:
             ],
         }
 
-    def fetch_verbs(self, entry: str) -> List[Dict[str, Any]]:
-        wiki = f"https://simple.wiktionary.org/wiki/{entry}"
-        key = self.cache.make_key(wiki)
-        cached = self.cache.get(key)
-        if cached is not None:
-            return cached
-        html = self._fetch(wiki)
-        if not html:
-            self.cache.set(key, [])
-            return []
-        soup = BeautifulSoup(html, "html.parser")
+    def _verbs_url(self, entry: str) -> str:
+        return f"https://simple.wiktionary.org/wiki/{entry}"
+
+    def _parse_verbs(self, html: str) -> List[Dict[str, Any]]:
+        soup = self._soup(html)
         verbs: List[Dict[str, Any]] = []
         cells = soup.select(".inflection-table tr td")
         for cell in cells:
@@ -260,14 +507,173 @@ class CambridgeClient:
                             text_txt = BeautifulSoup(split[1], "html.parser").get_text(strip=True)
                             if type_txt and text_txt:
                                 verbs.append({"id": len(verbs), "type": type_txt, "text": text_txt})
-        self.cache.set(key, verbs)
         return verbs
 
-    def get_entry(self, slug_language: str, entry: str) -> Optional[Dict[str, Any]]:
+    def fetch_verbs(self, entry: str) -> List[Dict[str, Any]]:
+        wiki = self._verbs_url(entry)
+        key = self.verbs_cache.make_key(wiki)
+        cached = self._cached_verbs(key)
+        if cached is not None:
+            return cached
+        stored = self.verb_store.get(entry)
+        if stored is not None:
+            self._cache_verbs(key, stored)
+            return stored
+        html = self._fetch(wiki)
+        if not html:
+            self.verbs_cache.set(key, [])
+            return []
+        verbs = self._parse_verbs(html)
+        self.verb_store.put(entry, verbs)
+        self._cache_verbs(key, verbs)
+        return verbs
+
+    def _cached_verbs(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        cached = self.verbs_cache.get(key)
+        if cached is None and self.shared_cache is not None:
+            cached = self.shared_cache.get(key)
+            if cached is not None:
+                self.verbs_cache.set(key, cached)
+        return cached
+
+    def _cache_verbs(self, key: str, verbs: List[Dict[str, Any]]) -> None:
+        self.verbs_cache.set(key, verbs)
+        # an empty list may be a failed fetch; keep that local to this worker
+        if verbs:
+            self._share(key, verbs)
+
+    def _share(self, key: str, value: Any) -> None:
+        """Write ``value`` to the host-shared cache tier, if there is one."""
+        if self.shared_cache is not None:
+            self.shared_cache.set(key, value)
+
+    def _record_entry(self, slug_language: str, entry: str) -> None:
+        if self.archive is None or self.offline:
+            return
+        try:
+            self.archive.record_entry(slug_language, entry, PARSER_VERSION)
+        except Exception:
+            pass
+
+    def _entry_key(self, slug_language: str, entry: str) -> str:
+        return f"entry:{slug_language}:{entry}"
+
+    def _cached_entry(self, slug_language: str, entry: str, record: bool = True) -> Optional[Dict[str, Any]]:
+        key = self._entry_key(slug_language, entry)
+        cached = self.entry_cache.get(key, record=record)
+        if cached is None and self.shared_cache is not None:
+            cached = self._promote_entry(key, self.shared_cache.get(key))
+        if cached is None:
+            return None
+        return dict(cached)
+
+    def _promote_entry(self, key: str, shared: Any) -> Optional[Dict[str, Any]]:
+        if not isinstance(shared, dict):
+            return None
+        self.entry_cache.set(key, shared)
+        return shared
+
+    def note_entry_lookup(self, slug_language: str, entry: str) -> None:
+        """Count a lookup answered above this client (a cached response) toward admission."""
+        self.entry_cache.note(self._entry_key(slug_language, entry))
+
+    def peek_entry(self, slug_language: str, entry: str, verbs: str = "lazy") -> Optional[Dict[str, Any]]:
+        """Return the entry from the in-process or host-shared cache without fetching."""
+        cached = self._cached_entry(slug_language, entry)
+        if cached is None:
+            return None
+        return self._from_cache(cached, verbs)
+
+    def prime_entry(self, slug_language: str, entry: str, data: Dict[str, Any]) -> None:
+        """Promote an entry found in a lower tier (Supabase) into the caches."""
+        self._store_entry(slug_language, entry, dict(data), fresh=False)
+
+    def _store_entry(
+        self, slug_language: str, entry: str, data: Dict[str, Any], verbs_pending: Any = None, fresh: bool = True
+    ) -> Dict[str, Any]:
+        key = self._entry_key(slug_language, entry)
+        self.entry_cache.set(key, data)
+        self._share(key, data)
+        if fresh:
+            self._record_entry(slug_language, entry)
+        if verbs_pending is not None and not verbs_pending.done():
+            # verbs missed the budget; patch them into the entry once they land
+            verbs_pending.add_done_callback(lambda f: self._late_verbs(slug_language, entry, data, f))
+        return dict(data)
+
+    def _late_verbs(self, slug_language: str, entry: str, data: Dict[str, Any], fut: Any) -> None:
+        if fut.cancelled() or fut.exception() is not None or not fut.result():
+            return
+        key = self._entry_key(slug_language, entry)
+        cached = self.entry_cache.get(key, record=False)
+        base = cached if cached is not None else data
+        if base.get("verbs"):
+            return
+        patched = {**base, "verbs": fut.result()}
+        self.entry_cache.set(key, patched)
+        self._share(key, patched)
+        if self.on_entry_patched is not None:
+            try:
+                self.on_entry_patched(slug_language, entry, dict(patched))
+            except Exception as e:
+                try:
+                    print("LATE_VERBS_HOOK_FAIL", slug_language, entry, str(e))
+                except Exception:
+                    pass
+
+    def _finish_entry(
+        self, slug_language: str, entry: str, parsed: Dict[str, Any], verbs: str,
+        verbs_future: Any = None, fresh: bool = True,
+    ) -> Dict[str, Any]:
+        """Attach verbs to a parsed entry according to the verbs mode and cache it.
+
+        With "none" the entry is cached without a verbs key so a later request
+        that wants verbs can still resolve them from the cached parse.
+        """
+        if verbs == "none":
+            out = self._store_entry(slug_language, entry, parsed, fresh=fresh)
+            out["verbs"] = []
+            return out
+        if not has_verb_sense(parsed.get("pos") or []):
+            parsed["verbs"] = []
+            return self._store_entry(slug_language, entry, parsed, fresh=fresh)
+        if verbs_future is None:
+            verbs_future = self.executor.submit(self.fetch_verbs, entry)
+        parsed["verbs"] = self._await_verbs(verbs_future, entry)
+        return self._store_entry(slug_language, entry, parsed, verbs_future, fresh=fresh)
+
+    def _from_cache(self, cached: Dict[str, Any], verbs: str) -> Optional[Dict[str, Any]]:
+        if "verbs" not in cached:
+            # parsed under verbs=none; the caller has to resolve verbs
+            return None if verbs != "none" else {**cached, "verbs": []}
+        if verbs == "none":
+            cached["verbs"] = []
+        return cached
+
+    def get_entry(
+        self, slug_language: str, entry: str, verbs: str = "lazy", refresh: bool = False, record: bool = True
+    ) -> Optional[Dict[str, Any]]:
+        """Look up one entry; ``verbs`` picks how Wiktionary inflections are resolved.
+
+        "eager" starts the Wiktionary lookup alongside the Cambridge fetch and keeps
+        it only if the entry has a verb sense. "lazy" (the default) starts it after
+        the parse and only for entries with a verb sense, so nouns and phrases cost
+        no Wiktionary request; the trade-off is that a verb's cold lookup pays the
+        two fetches back to back rather than overlapped (bounded by verbs_budget,
+        with late verbs patched in afterwards). "none" skips inflections.
+        """
         try:
             print("GET_ENTRY_LANG", slug_language)
         except Exception:
             pass
+        # refresh=True re-fetches from upstream even if the entry is cached; record=False
+        # when the caller already counted this request's lookup (see peek_entry)
+        cached = None if refresh else self._cached_entry(slug_language, entry, record)
+        if cached is not None:
+            hit = self._from_cache(cached, verbs)
+            if hit is not None:
+                return hit
+            return self._finish_entry(slug_language, entry, cached, verbs, fresh=False)
         if slug_language == "cn-en":
             try:
                 print("CN_EN_AGGREGATE", entry)
@@ -277,43 +683,122 @@ class CambridgeClient:
             if not agg:
                 return None
             agg["verbs"] = []
-            return agg
+            if agg.get("partial"):
+                return agg
+            return self._store_entry(slug_language, entry, agg)
         language, nation = self._language_mapping(slug_language)
         url = self._build_url(language, nation, entry)
-        html = self._fetch(url)
+        verbs_future = self.executor.submit(self.fetch_verbs, entry) if verbs == "eager" else None
+        html = self._fetch(url, strict=True)
         if not html:
             return None
         parsed = self._parse_entry(html, source_hint=slug_language)
         if not parsed:
             return None
-        parsed["verbs"] = self.fetch_verbs(entry)
-        return parsed
+        return self._finish_entry(slug_language, entry, parsed, verbs, verbs_future)
 
-    def _get_cn_en_aggregate(self, entry: str) -> Optional[Dict[str, Any]]:
-        language, nation = self._language_mapping("cn-en")
-        url = self._build_url(language, nation, entry)
-        html = self._fetch(url)
+    def _await_verbs(self, future: "Future[List[Dict[str, Any]]]", entry: str) -> List[Dict[str, Any]]:
+        try:
+            return future.result(timeout=self.verbs_budget)
+        except FutureTimeout:
+            # the lookup keeps running and fills the cache for the next request
+            try:
+                print("VERBS_BUDGET_EXCEEDED", entry)
+            except Exception:
+                pass
+            return []
+        except Exception:
+            return []
+
+    def _fetch_parsed(self, url: str, source_hint: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        html = self._fetch(url, strict=True)
         if not html:
             return None
-        soup = BeautifulSoup(html, "html.parser")
+        return self._parse_entry(html, source_hint=source_hint)
+
+    def _fetch_parsed_pages(
+        self, urls: List[str], source_hint: Optional[str] = None
+    ) -> Tuple[List[Optional[Dict[str, Any]]], int]:
+        """Fetch and parse ``urls`` concurrently; results keep the order of ``urls``.
+
+        Returns (results, failed). Pages that do not exist, failed for a transient
+        reason or were still pending when the fan-out deadline passed come back
+        as None; ``failed`` counts the last two. Raises UpstreamError only when
+        pages failed and none succeeded.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(urls)
+        if not urls:
+            return results, 0
+        pool = ThreadPoolExecutor(max_workers=min(self.fanout_limit, len(urls)))
+        try:
+            futures = {pool.submit(self._fetch_parsed, url, source_hint): i for i, url in enumerate(urls)}
+            done, not_done = wait(futures, timeout=self.fanout_deadline)
+            failed = len(not_done)
+            for fut in done:
+                try:
+                    results[futures[fut]] = fut.result()
+                except Exception as e:
+                    failed += isinstance(e, UpstreamError)
+                    try:
+                        print("FANOUT_PAGE_ERROR", urls[futures[fut]], str(e))
+                    except Exception:
+                        pass
+            if not_done:
+                try:
+                    print("FANOUT_DEADLINE_DROPPED", len(not_done))
+                except Exception:
+                    pass
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+        if failed and not any(results):
+            raise UpstreamError(f"{failed} of {len(urls)} pages failed")
+        return results, failed
+
+    def _cn_en_links(self, html: str) -> List[str]:
+        soup = self._soup(html)
         links = []
         for a in soup.select("a[href]"):
             href = a.get("href", "")
             if "/dictionary/english-chinese-simplified/" in href:
                 links.append(href)
+        siteurl = "https://dictionary.cambridge.org"
+        return [siteurl + href for href in links[:12]]
+
+    def _get_cn_en_aggregate(self, entry: str) -> Optional[Dict[str, Any]]:
+        language, nation = self._language_mapping("cn-en")
+        url = self._build_url(language, nation, entry)
+        html = self._fetch(url, strict=True)
+        if not html:
+            return None
+        links = self._cn_en_links(html)
         if not links:
             return None
-        siteurl = "https://dictionary.cambridge.org"
+        pages, failed = self._fetch_parsed_pages(links, source_hint="en-cn")
+        return self._partial_cn_en(entry, pages, failed)
+
+    def _partial_cn_en(self, entry: str, pages: List[Optional[Dict[str, Any]]], failed: int) -> Optional[Dict[str, Any]]:
+        """Merge the sub-pages; with ``failed`` pages the result is marked ``partial``.
+
+        A partial aggregate is returned to the caller but never cached, persisted
+        or negative-cached. If nothing usable came back, the failure is raised.
+        """
+        agg = self._merge_cn_en(entry, pages)
+        if failed:
+            if not agg:
+                raise UpstreamError(f"{failed} of {len(pages)} pages failed")
+            try:
+                print("CN_EN_PARTIAL", entry, failed, len(pages))
+            except Exception:
+                pass
+            agg["partial"] = True
+        return agg
+
+    def _merge_cn_en(self, entry: str, pages: List[Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
         pos_set: List[str] = []
         prons: List[Dict[str, Any]] = []
         defs: List[Dict[str, Any]] = []
         order: List[str] = []
-        for href in links[:12]:
-            sub_url = siteurl + href
-            sub_html = self._fetch(sub_url)
-            if not sub_html:
-                continue
-            parsed = self._parse_entry(sub_html, source_hint="en-cn")
+        for parsed in pages:
             if not parsed:
                 continue
             lemma = parsed.get("word", "")
@@ -351,3 +836,253 @@ class CambridgeClient:
             "definition": defs,
             "order": order,
         }
+
+
+class AsyncCambridgeClient(CambridgeClient):
+    """asyncio flavour of CambridgeClient.
+
+    Upstream requests go through one pooled ``httpx.AsyncClient`` so an in-flight
+    lookup costs a coroutine rather than a thread; parsing is CPU-bound and runs
+    in worker threads via ``asyncio.to_thread``. The sync methods inherited from
+    CambridgeClient keep working and share the same cache.
+    """
+
+    def __init__(self, *args: Any, max_connections: Optional[int] = None, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.max_connections = max_connections or get_cfg_int("CAMBRIDGE_MAX_CONNECTIONS", 100)
+        self._http: Optional[httpx.AsyncClient] = None
+        # strong references to lookups that outlive the request that started them
+        self._background: set = set()
+        # shared-cache and archive writes, off the event loop; one worker keeps
+        # writes to the same key in order
+        self._tier_writer: Optional[ThreadPoolExecutor] = None
+
+    def _http_client(self) -> httpx.AsyncClient:
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                headers=DEFAULT_HEADERS,
+                timeout=self.timeout,
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+        return self._http
+
+    async def aclose(self) -> None:
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+        if self._tier_writer is not None:
+            await asyncio.to_thread(self._tier_writer.shutdown, True)
+            self._tier_writer = None
+        # sync-path verbs lookups; queued ones are dropped, running ones finish
+        await asyncio.to_thread(self.executor.shutdown, True, cancel_futures=True)
+
+    def _in_background(self, fn: Callable[..., Any], *args: Any) -> None:
+        if self._tier_writer is None:
+            self._tier_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cambridge-tiers")
+        self._tier_writer.submit(fn, *args)
+
+    def _share(self, key: str, value: Any) -> None:
+        if self.shared_cache is not None:
+            self._in_background(self.shared_cache.set, key, value)
+
+    def _record_entry(self, slug_language: str, entry: str) -> None:
+        if self.archive is not None and not self.offline:
+            self._in_background(super()._record_entry, slug_language, entry)
+
+    async def _cached_entry_async(self, slug_language: str, entry: str, record: bool = True) -> Optional[Dict[str, Any]]:
+        # the in-process cache is a dict lookup; only the SQLite tier goes to a thread
+        key = self._entry_key(slug_language, entry)
+        cached = self.entry_cache.get(key, record=record)
+        if cached is None and self.shared_cache is not None:
+            cached = self._promote_entry(key, await asyncio.to_thread(self.shared_cache.get, key))
+        if cached is None:
+            return None
+        return dict(cached)
+
+    async def _cached_verbs_async(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        cached = self.verbs_cache.get(key)
+        if cached is None and self.shared_cache is not None:
+            cached = await asyncio.to_thread(self.shared_cache.get, key)
+            if cached is not None:
+                self.verbs_cache.set(key, cached)
+        return cached
+
+    async def peek_entry_async(self, slug_language: str, entry: str, verbs: str = "lazy") -> Optional[Dict[str, Any]]:
+        """peek_entry without blocking the event loop on the shared cache."""
+        cached = await self._cached_entry_async(slug_language, entry)
+        if cached is None:
+            return None
+        return self._from_cache(cached, verbs)
+
+    def _spawn(self, coro: Any) -> "asyncio.Task[Any]":
+        task = asyncio.ensure_future(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+        return task
+
+    async def _fetch_async(self, url: str, strict: bool = False) -> Optional[str]:
+        key = self.html_cache.make_key(url)
+        if self.cache_html:
+            cached = self.html_cache.get(key)
+            if cached is not None:
+                return cached
+        if self.offline:
+            return await asyncio.to_thread(self._fetch, url, strict)
+        try:
+            r = await self._http_client().get(url)
+            if r.status_code != 200:
+                try:
+                    print("FETCH_STATUS", r.status_code, str(r.url))
+                except Exception:
+                    pass
+                if strict and _is_transient(r.status_code):
+                    raise UpstreamError(f"{r.status_code} {url}")
+                return None
+            if self.cache_html:
+                self.html_cache.set(key, r.text)
+            if self.archive is not None:
+                await asyncio.to_thread(self._archive_page, url, r.text)
+            return r.text
+        except httpx.HTTPError as e:
+            if strict:
+                raise UpstreamError(str(e)) from e
+            return None
+
+    async def fetch_verbs_async(self, entry: str) -> List[Dict[str, Any]]:
+        wiki = self._verbs_url(entry)
+        key = self.verbs_cache.make_key(wiki)
+        cached = await self._cached_verbs_async(key)
+        if cached is not None:
+            return cached
+        stored = await asyncio.to_thread(self.verb_store.get, entry)
+        if stored is not None:
+            self._cache_verbs(key, stored)
+            return stored
+        html = await self._fetch_async(wiki)
+        if not html:
+            self.verbs_cache.set(key, [])
+            return []
+        verbs = await asyncio.to_thread(self._parse_verbs, html)
+        await asyncio.to_thread(self.verb_store.put, entry, verbs)
+        self._cache_verbs(key, verbs)
+        return verbs
+
+    async def _finish_entry_async(
+        self, slug_language: str, entry: str, parsed: Dict[str, Any], verbs: str,
+        verbs_task: "Optional[asyncio.Task[List[Dict[str, Any]]]]" = None, fresh: bool = True,
+    ) -> Dict[str, Any]:
+        if verbs == "none":
+            out = self._store_entry(slug_language, entry, parsed, fresh=fresh)
+            out["verbs"] = []
+            return out
+        if not has_verb_sense(parsed.get("pos") or []):
+            parsed["verbs"] = []
+            return self._store_entry(slug_language, entry, parsed, fresh=fresh)
+        if verbs_task is None:
+            verbs_task = self._spawn(self.fetch_verbs_async(entry))
+        parsed["verbs"] = await self._await_verbs_async(verbs_task, entry)
+        return self._store_entry(slug_language, entry, parsed, verbs_task, fresh=fresh)
+
+    async def get_entry_async(
+        self, slug_language: str, entry: str, verbs: str = "lazy", refresh: bool = False, record: bool = True
+    ) -> Optional[Dict[str, Any]]:
+        try:
+            print("GET_ENTRY_LANG", slug_language)
+        except Exception:
+            pass
+        cached = None if refresh else await self._cached_entry_async(slug_language, entry, record)
+        if cached is not None:
+            hit = self._from_cache(cached, verbs)
+            if hit is not None:
+                return hit
+            return await self._finish_entry_async(slug_language, entry, cached, verbs, fresh=False)
+        if slug_language == "cn-en":
+            try:
+                print("CN_EN_AGGREGATE", entry)
+            except Exception:
+                pass
+            agg = await self._get_cn_en_aggregate_async(entry)
+            if not agg:
+                return None
+            agg["verbs"] = []
+            if agg.get("partial"):
+                return agg
+            return self._store_entry(slug_language, entry, agg)
+        language, nation = self._language_mapping(slug_language)
+        url = self._build_url(language, nation, entry)
+        verbs_task = self._spawn(self.fetch_verbs_async(entry)) if verbs == "eager" else None
+        html = await self._fetch_async(url, strict=True)
+        if not html:
+            return None
+        parsed = await asyncio.to_thread(self._parse_entry, html, slug_language)
+        if not parsed:
+            return None
+        return await self._finish_entry_async(slug_language, entry, parsed, verbs, verbs_task)
+
+    async def _await_verbs_async(self, task: "asyncio.Task[List[Dict[str, Any]]]", entry: str) -> List[Dict[str, Any]]:
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), timeout=self.verbs_budget)
+        except asyncio.TimeoutError:
+            try:
+                print("VERBS_BUDGET_EXCEEDED", entry)
+            except Exception:
+                pass
+            return []
+        except Exception:
+            return []
+
+    async def _fetch_parsed_async(self, url: str, source_hint: Optional[str], limit: asyncio.Semaphore) -> Optional[Dict[str, Any]]:
+        async with limit:
+            html = await self._fetch_async(url, strict=True)
+            if not html:
+                return None
+            return await asyncio.to_thread(self._parse_entry, html, source_hint)
+
+    async def _fetch_parsed_pages_async(
+        self, urls: List[str], source_hint: Optional[str] = None
+    ) -> Tuple[List[Optional[Dict[str, Any]]], int]:
+        results: List[Optional[Dict[str, Any]]] = [None] * len(urls)
+        if not urls:
+            return results, 0
+        limit = asyncio.Semaphore(self.fanout_limit)
+        tasks = [asyncio.ensure_future(self._fetch_parsed_async(url, source_hint, limit)) for url in urls]
+        done, not_done = await asyncio.wait(tasks, timeout=self.fanout_deadline)
+        failed = len(not_done)
+        for i, task in enumerate(tasks):
+            if task not in done:
+                continue
+            try:
+                results[i] = task.result()
+            except Exception as e:
+                failed += isinstance(e, UpstreamError)
+                try:
+                    print("FANOUT_PAGE_ERROR", urls[i], str(e))
+                except Exception:
+                    pass
+        if not_done:
+            for task in not_done:
+                task.cancel()
+            try:
+                print("FANOUT_DEADLINE_DROPPED", len(not_done))
+            except Exception:
+                pass
+        # same rule as _fetch_parsed_pages
+        if failed and not any(results):
+            raise UpstreamError(f"{failed} of {len(urls)} pages failed")
+        return results, failed
+
+    async def _get_cn_en_aggregate_async(self, entry: str) -> Optional[Dict[str, Any]]:
+        language, nation = self._language_mapping("cn-en")
+        url = self._build_url(language, nation, entry)
+        html = await self._fetch_async(url, strict=True)
+        if not html:
+            return None
+        links = await asyncio.to_thread(self._cn_en_links, html)
+        if not links:
+            return None
+        pages, failed = await self._fetch_parsed_pages_async(links, source_hint="en-cn")
+        return self._partial_cn_en(entry, pages, failed)
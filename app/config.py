@@ -1,25 +1,95 @@
 import os
+import threading
+import time
+from types import MappingProxyType
+from typing import Mapping, Optional
 
 
-def load_ignore_config() -> dict:
+def _secret_path() -> str:
     here = os.path.dirname(os.path.abspath(__file__))
     root = os.path.dirname(here)
-    path = os.path.join(root, ".secret")
+    return os.path.join(root, ".secret")
+
+
+def _parse_secret(path: str) -> dict:
+    """Parse `.secret`; a missing file is empty, an unreadable one raises."""
     cfg: dict = {}
     if not os.path.exists(path):
         return cfg
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            s = line.strip()
+            if not s or s.startswith("#"):
+                continue
+            if "=" not in s:
+                continue
+            # remove BOM if present (affects first line only)
+            s = s.lstrip("\ufeff")
+            k, v = s.split("=", 1)
+            cfg[k.strip()] = v.strip()
+    return cfg
+
+
+def _read_secret(path: str) -> dict:
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            for line in f:
-                s = line.strip()
-                if not s or s.startswith("#"):
-                    continue
-                if "=" not in s:
-                    continue
-                # remove BOM if present (affects first line only)
-                s = s.lstrip("\ufeff")
-                k, v = s.split("=", 1)
-                cfg[k.strip()] = v.strip()
-        return cfg
+        return _parse_secret(path)
     except Exception:
         return {}
+
+
+def _mtime(path: str) -> Optional[float]:
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+class _Snapshot:
+    """Read-only view of `.secret`, parsed once and re-read only when its mtime changes.
+
+    The mtime is checked at most every CONFIG_RELOAD_INTERVAL seconds (environment
+    only, default 5; 0 never reloads), so a lookup is normally a dict read. A file
+    that cannot be read or decoded keeps the last good snapshot and is retried on
+    the next check.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path or _secret_path()
+        self._lock = threading.Lock()
+        self._data: Mapping[str, str] = MappingProxyType({})
+        self._mtime: Optional[float] = None
+        self._checked = float("-inf")
+        self._loaded = False
+        try:
+            self.interval = float(os.environ.get("CONFIG_RELOAD_INTERVAL") or 5)
+        except ValueError:
+            self.interval = 5.0
+
+    def get(self) -> Mapping[str, str]:
+        now = time.monotonic()
+        if self._loaded and (self.interval <= 0 or now - self._checked < self.interval):
+            return self._data
+        with self._lock:
+            if self._loaded and (self.interval <= 0 or now - self._checked < self.interval):
+                return self._data
+            mtime = _mtime(self.path)
+            if not self._loaded or mtime != self._mtime:
+                try:
+                    self._data = MappingProxyType(_parse_secret(self.path))
+                    self._mtime = mtime
+                except Exception as e:
+                    try:
+                        print("CONFIG_RELOAD_FAIL", self.path, str(e))
+                    except Exception:
+                        pass
+                self._loaded = True
+            self._checked = now
+            return self._data
+
+
+_snapshot = _Snapshot()
+
+
+def load_ignore_config() -> Mapping[str, str]:
+    """Current `.secret` settings as an immutable mapping shared by all callers."""
+    return _snapshot.get()
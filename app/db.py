@@ -1,9 +1,36 @@
 import os
-from typing import Optional, Any
+import threading
+from typing import Optional, Any, Dict, Tuple
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
 from .config import load_ignore_config
+from .utils_cfg import get_cfg, get_cfg_int
+
+
+_lock = threading.Lock()
+_supabase_client: Optional[Any] = None
+_rest_session: Optional[requests.Session] = None
 
 
 def get_supabase_client() -> Optional[Any]:
+    """Process-wide Supabase SDK client, created on first use.
+
+    Only a successfully created client is kept, so a process started before the
+    configuration was in place picks it up on a later call.
+    """
+    global _supabase_client
+    if _supabase_client is not None:
+        return _supabase_client
+    with _lock:
+        if _supabase_client is None:
+            _supabase_client = _create_supabase_client()
+        return _supabase_client
+
+
+def _create_supabase_client() -> Optional[Any]:
     url = os.environ.get("SUPABASE_URL")
     key = os.environ.get("SUPABASE_KEY")
     if not url or not key:
@@ -41,3 +68,106 @@ def get_supabase_client() -> Optional[Any]:
         except Exception:
             pass
         return None
+
+
+def get_rest_config() -> Optional[Tuple[str, str]]:
+    """Return (rest base url, key) for raw PostgREST calls, or None if unconfigured."""
+    base = get_cfg("SUPABASE_URL")
+    key = get_cfg("SUPABASE_KEY")
+    if not base or not key:
+        return None
+    return base.rstrip("/") + "/rest/v1", key
+
+
+def get_rest_session() -> requests.Session:
+    """Process-wide keep-alive session for sync PostgREST calls (repo.py, repo_auth.py).
+
+    SUPABASE_POOL_SIZE caps the kept-alive connections per host; threadpool
+    workers beyond that open short-lived extra connections rather than block.
+    """
+    global _rest_session
+    if _rest_session is not None:
+        return _rest_session
+    with _lock:
+        if _rest_session is None:
+            size = get_cfg_int("SUPABASE_POOL_SIZE", 20)
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=size)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _rest_session = session
+        return _rest_session
+
+
+_async_rest_client: Optional[httpx.AsyncClient] = None
+
+
+def get_async_rest_client() -> httpx.AsyncClient:
+    """Process-wide pooled httpx.AsyncClient for PostgREST calls made from async routes."""
+    global _async_rest_client
+    if _async_rest_client is None:
+        size = get_cfg_int("SUPABASE_ASYNC_POOL_SIZE", 100)
+        _async_rest_client = httpx.AsyncClient(
+            timeout=10,
+            limits=httpx.Limits(max_connections=size, max_keepalive_connections=size),
+        )
+    return _async_rest_client
+
+
+async def close_async_rest_client() -> None:
+    global _async_rest_client
+    if _async_rest_client is not None:
+        await _async_rest_client.aclose()
+        _async_rest_client = None
+
+
+def _async_pool_connections(client: httpx.AsyncClient) -> Optional[list]:
+    """Live connections of an httpx.AsyncClient pool, or None if unavailable.
+
+    httpx has no public API for this, so it reads the private
+    ``_transport._pool.connections`` (httpcore). A newer httpx/httpcore that
+    renames those attributes makes this return None instead of raising.
+    """
+    try:
+        return list(client._transport._pool.connections)
+    except Exception:
+        return None
+
+
+def pool_stats() -> Dict[str, Any]:
+    """Configured limits of the shared Supabase pools, for /api/metrics.
+
+    Live counts are added on a best-effort basis; they are omitted when the
+    installed requests/httpx versions do not expose them.
+    """
+    out: Dict[str, Any] = {"sdk_client": _supabase_client is not None}
+    if _rest_session is not None:
+        sync: Dict[str, Any] = {"max_connections": get_cfg_int("SUPABASE_POOL_SIZE", 20)}
+        try:
+            counts = {"pools": 0, "connections_opened": 0, "requests": 0, "idle": 0}
+            for adapter in set(_rest_session.adapters.values()):
+                for key in list(adapter.poolmanager.pools.keys()):
+                    pool = adapter.poolmanager.pools.get(key)
+                    if pool is None:
+                        continue
+                    counts["pools"] += 1
+                    counts["connections_opened"] += pool.num_connections
+                    counts["requests"] += pool.num_requests
+                    # the queue is pre-filled with None placeholders for unopened slots
+                    if pool.pool is not None:
+                        counts["idle"] += sum(1 for conn in list(pool.pool.queue) if conn is not None)
+            sync.update(counts)
+        except Exception:
+            pass
+        out["sync"] = sync
+    if _async_rest_client is not None:
+        size = get_cfg_int("SUPABASE_ASYNC_POOL_SIZE", 100)
+        stats: Dict[str, Any] = {"max_connections": size}
+        conns = _async_pool_connections(_async_rest_client)
+        if conns is not None:
+            try:
+                stats.update(connections=len(conns), idle=sum(1 for c in conns if c.is_idle()))
+            except Exception:
+                pass
+        out["async"] = stats
+    return out
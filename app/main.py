@@ -1,17 +1,46 @@
 from fastapi import FastAPI, Response, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, HTMLResponse
+from fastapi.responses import JSONResponse, HTMLResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
+import asyncio
+import hashlib
+import json
 import os
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional, Tuple
 
-from .cambridge import CambridgeClient
-from .repo import get_entry_from_db, upsert_entry_with_senses
+from .cache import NegativeCache, TTLCache
+from .cambridge import VERBS_MODES, AsyncCambridgeClient, UpstreamError
+from .db import close_async_rest_client, pool_stats
+from .repo import (
+    get_entries_batch_async,
+    get_entry_with_age_async,
+    has_recent_miss_async,
+    record_miss_async,
+)
 from .auth import router as auth_router
 from .utils_jwt import decode_token
-from .repo_auth import insert_page_visit, insert_user_action
+from .repo_auth import insert_page_visit, insert_page_visit_async, insert_user_action
+from .persist import persist_entry, writer_from_config
+from .replica import replica_from_config
+from .singleflight import SingleFlight
+from .utils_cfg import get_cfg, get_cfg_float, get_cfg_int
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if write_behind:
+        writer.start()
+    try:
+        yield
+    finally:
+        # flush queued writes while the REST client is still open
+        await writer.close(timeout=get_cfg_float("WRITE_BEHIND_FLUSH_TIMEOUT", 10.0))
+        await client.aclose()
+        await close_async_rest_client()
 
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -20,7 +49,37 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-client = CambridgeClient()
+client = AsyncCambridgeClient()
+# one upstream fetch + parse + upsert per (language, entry) at a time
+entry_flights = SingleFlight()
+# words Cambridge does not have; NEGATIVE_CACHE_PERSIST=1 also keeps them in dictionary_misses
+negative = NegativeCache(
+    maxsize=get_cfg_int("NEGATIVE_CACHE_SIZE", 10000),
+    ttl_seconds=get_cfg_int("NEGATIVE_CACHE_TTL", 3600),
+)
+negative_persist = get_cfg("NEGATIVE_CACHE_PERSIST") == "1"
+# stored rows older than ENTRY_SOFT_TTL are served and refreshed in the background;
+# rows older than ENTRY_HARD_TTL are re-fetched before answering (0 disables either)
+entry_soft_ttl = get_cfg_int("ENTRY_SOFT_TTL", 7 * 24 * 3600)
+entry_hard_ttl = get_cfg_int("ENTRY_HARD_TTL", 30 * 24 * 3600)
+refresh_stats = {"scheduled": 0, "refreshed": 0, "failed": 0, "hard_expired": 0}
+# encoded /api/dictionary bodies and their ETags, keyed by (language, verbs, entry);
+# dropped locally whenever this worker re-fetches or refreshes the entry
+responses = TTLCache(
+    maxsize=None,
+    ttl_seconds=get_cfg_int("RESPONSE_CACHE_TTL", 300),
+    max_bytes=get_cfg_int("RESPONSE_CACHE_MAX_BYTES", 16 * 1024 * 1024),
+    sizeof=lambda v: len(v[1]),
+)
+response_stats = {"not_modified": 0}
+# parsed entries are persisted in the background, batched; WRITE_BEHIND=0 writes inline
+writer = writer_from_config()
+write_behind = get_cfg("WRITE_BEHIND") != "0"
+# POST /api/dictionary/batch: items per request and concurrent upstream fetches per request
+batch_max_items = get_cfg_int("BATCH_MAX_ITEMS", 100)
+batch_concurrency = get_cfg_int("BATCH_CONCURRENCY", 4)
+# optional local SQLite copy of dictionary_entries (DICTIONARY_REPLICA), read before Supabase
+replica = replica_from_config()
 
 here = os.path.dirname(os.path.abspath(__file__))
 static_dir = os.path.join(here, "static")
@@ -170,153 +229,410 @@ def root(request: Request) -> Response:
         return HTMLResponse(content="<h1>cambridge dictionary api (python)</h1>")
 
 
+def _visitor(request: Request) -> tuple:
+    email = None
+    user_id = None
+    provider = None
+    auth = request.headers.get("Authorization") or ""
+    parts = auth.split()
+    if len(parts) == 2 and parts[0].lower() == "bearer":
+        data_jwt = decode_token(parts[1])
+        if data_jwt:
+            email = data_jwt.get("email")
+            user_id = data_jwt.get("sub")
+            provider = data_jwt.get("provider")
+    if not user_id:
+        tok = request.cookies.get("jwt_token") or ""
+        if tok:
+            data_jwt = decode_token(tok)
+            if data_jwt:
+                email = data_jwt.get("email")
+                user_id = data_jwt.get("sub")
+                provider = data_jwt.get("provider")
+    return email, user_id, provider
+
+
+async def _log_dictionary_visit(request: Request, language: str, norm_entry: str) -> None:
+    try:
+        email, user_id, provider = _visitor(request)
+        await insert_page_visit_async(path=f"/api/dictionary/{language}/{norm_entry}", method="GET", email=email, user_id=user_id, provider=provider, ip=request.client.host if request.client else None, user_agent=request.headers.get("User-Agent"), action_type=f"translate({language})", action_content=norm_entry)
+    except Exception:
+        pass
+
+
+def _response_key(language: str, verbs: str, norm_entry: str) -> str:
+    return f"{language}:{verbs}:{norm_entry}"
+
+
+def _invalidate_responses(language: str, norm_entry: str) -> None:
+    for mode in VERBS_MODES:
+        responses.delete(_response_key(language, mode, norm_entry))
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    for tag in header.split(","):
+        tag = tag.strip()
+        # If-None-Match uses the weak comparison, so W/"x" matches "x"
+        if tag == "*" or tag == etag or (tag.startswith("W/") and tag[2:] == etag):
+            return True
+    return False
+
+
+def _encoded_response(request: Request, etag: str, body: bytes) -> Response:
+    if _etag_matches(request, etag):
+        response_stats["not_modified"] += 1
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, status_code=200, media_type="application/json", headers={"ETag": etag})
+
+
+def _entry_response(request: Request, key: str, data) -> Response:
+    # same encoding as JSONResponse, so cached and uncached bodies are byte-identical
+    body = json.dumps(data, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+    etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+    if not (isinstance(data, dict) and data.get("partial")):
+        responses.set(key, (etag, body))
+    return _encoded_response(request, etag, body)
+
+
+async def _persist_entry(language: str, norm_entry: str, data) -> None:
+    await persist_entry(language, norm_entry, data, replica, writer if write_behind else None)
+
+
+def _store_late_verbs(language: str, norm_entry: str, data) -> None:
+    # the entry was answered and persisted with verbs: [] after missing the verbs
+    # budget; store it again now that they are in
+    _invalidate_responses(language, norm_entry)
+    client._spawn(_persist_entry(language, norm_entry, data))
+
+
+client.on_entry_patched = _store_late_verbs
+
+
+async def _fetch_and_store(language: str, norm_entry: str, verbs: str):
+    if negative_persist and await has_recent_miss_async(language, norm_entry, negative.ttl):
+        negative.add(language, norm_entry, from_table=True)
+        return None
+    # both routes peeked the cache first, which counted the lookup
+    data = await client.get_entry_async(language, norm_entry, verbs=verbs, record=False)
+    if data is None:
+        negative.add(language, norm_entry)
+        if negative_persist:
+            await record_miss_async(language, norm_entry)
+        return None
+    if verbs == "none" or data.get("partial"):
+        # the row would be stored without inflections (or some cn-en sub-pages);
+        # leave it to a later complete lookup
+        return data
+    _invalidate_responses(language, norm_entry)
+    await _persist_entry(language, norm_entry, data)
+    return data
+
+
+async def _refresh_entry(language: str, norm_entry: str):
+    try:
+        data = await client.get_entry_async(language, norm_entry, refresh=True)
+    except Exception as e:
+        refresh_stats["failed"] += 1
+        try:
+            print("ENTRY_REFRESH_FAIL", language, norm_entry, str(e))
+        except Exception:
+            pass
+        return None
+    if data is None or data.get("partial"):
+        # keep serving the stored row rather than dropping a word upstream lost
+        # or replacing it with a cn-en aggregate that is missing sub-pages
+        refresh_stats["failed"] += 1
+        return None
+    _invalidate_responses(language, norm_entry)
+    await _persist_entry(language, norm_entry, data)
+    refresh_stats["refreshed"] += 1
+    return data
+
+
+def _schedule_refresh(language: str, norm_entry: str) -> None:
+    # shares the fetch key, so a refresh and a blocking miss for the same word coalesce
+    refresh_stats["scheduled"] += 1
+    client._spawn(entry_flights.do((language, norm_entry, False), lambda: _refresh_entry(language, norm_entry)))
+
+
 @app.get("/api/dictionary/{language}/{entry}")
-def dictionary(request: Request, language: str, entry: str):
+async def dictionary(request: Request, language: str, entry: str):
     try:
         try:
             print("REQ_LANGUAGE", language)
         except Exception:
             pass
         norm_entry = entry.strip().lower()
-        cached = get_entry_from_db(language, norm_entry)
+        verbs = request.query_params.get("verbs") or "lazy"
+        if verbs not in VERBS_MODES:
+            return JSONResponse(status_code=400, content={"error": "verbs must be one of eager, lazy, none"})
+        response_key = _response_key(language, verbs, norm_entry)
+        encoded = responses.get(response_key)
+        if encoded is not None:
+            # no Supabase round trip on this path; the visit is logged in the background
+            client.note_entry_lookup(language, norm_entry)
+            client._spawn(_log_dictionary_visit(request, language, norm_entry))
+            return _encoded_response(request, *encoded)
+        if negative.contains(language, norm_entry):
+            await _log_dictionary_visit(request, language, norm_entry)
+            return JSONResponse(status_code=404, content={"error": "word not found"})
+        # in-process, then host-shared cache, then Supabase, then upstream
+        hit = await client.peek_entry_async(language, norm_entry, verbs)
+        if hit is not None:
+            await _log_dictionary_visit(request, language, norm_entry)
+            return _entry_response(request, response_key, hit)
+        found = await asyncio.to_thread(replica.get, language, norm_entry) if replica is not None else None
+        if found is None:
+            found = await get_entry_with_age_async(language, norm_entry)
+        cached, age = found if found is not None else (None, None)
+        stale = False
+        if cached is not None and age is not None:
+            if entry_hard_ttl and age >= entry_hard_ttl:
+                refresh_stats["hard_expired"] += 1
+                cached = None
+            elif entry_soft_ttl and age >= entry_soft_ttl:
+                stale = True
+        if stale:
+            _schedule_refresh(language, norm_entry)
+        if isinstance(cached, dict) and cached.get("definition") and (
+            language != "cn-en" or any(isinstance(d, dict) and d.get("lemma") for d in cached["definition"])
+        ):
+            client.prime_entry(language, norm_entry, cached)
+        if cached is not None and verbs == "none" and isinstance(cached, dict):
+            cached["verbs"] = []
         if cached is not None:
             try:
                 defs = cached.get("definition") if isinstance(cached, dict) else None
                 if defs and len(defs) > 0:
                     if language != "cn-en":
-                        try:
-                            auth = request.headers.get("Authorization") or ""
-                            parts = auth.split()
-                            email = None
-                            user_id = None
-                            provider = None
-                            if len(parts) == 2 and parts[0].lower() == "bearer":
-                                data_jwt = decode_token(parts[1])
-                                if data_jwt:
-                                    email = data_jwt.get("email")
-                                    user_id = data_jwt.get("sub")
-                                    provider = data_jwt.get("provider")
-                            if not user_id:
-                                tok = request.cookies.get("jwt_token") or ""
-                                if tok:
-                                    data_jwt = decode_token(tok)
-                                    if data_jwt:
-                                        email = data_jwt.get("email")
-                                        user_id = data_jwt.get("sub")
-                                        provider = data_jwt.get("provider")
-                            insert_page_visit(path=f"/api/dictionary/{language}/{norm_entry}", method="GET", email=email, user_id=user_id, provider=provider, ip=request.client.host if request.client else None, user_agent=request.headers.get("User-Agent"), action_type=f"translate({language})", action_content=norm_entry)
-                        except Exception:
-                            pass
-                        return JSONResponse(status_code=200, content=cached)
+                        await _log_dictionary_visit(request, language, norm_entry)
+                        return _entry_response(request, response_key, cached)
                     # for cn-en, ensure definitions carry lemma; otherwise refetch
                     has_lemma = any(isinstance(d, dict) and d.get("lemma") for d in defs)
                     if has_lemma:
-                        try:
-                            auth = request.headers.get("Authorization") or ""
-                            parts = auth.split()
-                            email = None
-                            user_id = None
-                            provider = None
-                            if len(parts) == 2 and parts[0].lower() == "bearer":
-                                data_jwt = decode_token(parts[1])
-                                if data_jwt:
-                                    email = data_jwt.get("email")
-                                    user_id = data_jwt.get("sub")
-                                    provider = data_jwt.get("provider")
-                            if not user_id:
-                                tok = request.cookies.get("jwt_token") or ""
-                                if tok:
-                                    data_jwt = decode_token(tok)
-                                    if data_jwt:
-                                        email = data_jwt.get("email")
-                                        user_id = data_jwt.get("sub")
-                                        provider = data_jwt.get("provider")
-                            insert_page_visit(path=f"/api/dictionary/{language}/{norm_entry}", method="GET", email=email, user_id=user_id, provider=provider, ip=request.client.host if request.client else None, user_agent=request.headers.get("User-Agent"), action_type=f"translate({language})", action_content=norm_entry)
-                        except Exception:
-                            pass
-                        return JSONResponse(status_code=200, content=cached)
+                        await _log_dictionary_visit(request, language, norm_entry)
+                        return _entry_response(request, response_key, cached)
             except Exception:
                 if language != "cn-en":
-                    try:
-                        auth = request.headers.get("Authorization") or ""
-                        parts = auth.split()
-                        email = None
-                        user_id = None
-                        provider = None
-                        if len(parts) == 2 and parts[0].lower() == "bearer":
-                            data_jwt = decode_token(parts[1])
-                            if data_jwt:
-                                email = data_jwt.get("email")
-                                user_id = data_jwt.get("sub")
-                                provider = data_jwt.get("provider")
-                        if not user_id:
-                            tok = request.cookies.get("jwt_token") or ""
-                            if tok:
-                                data_jwt = decode_token(tok)
-                                if data_jwt:
-                                    email = data_jwt.get("email")
-                                    user_id = data_jwt.get("sub")
-                                    provider = data_jwt.get("provider")
-                        insert_page_visit(path=f"/api/dictionary/{language}/{norm_entry}", method="GET", email=email, user_id=user_id, provider=provider, ip=request.client.host if request.client else None, user_agent=request.headers.get("User-Agent"), action_type=f"translate({language})", action_content=norm_entry)
-                    except Exception:
-                        pass
-                    return JSONResponse(status_code=200, content=cached)
-
-        data = client.get_entry(language, norm_entry)
+                    await _log_dictionary_visit(request, language, norm_entry)
+                    return _entry_response(request, response_key, cached)
+
+        if cached is None and found is not None:
+            # past the hard TTL: re-fetch, but fall back to the stored row if upstream fails
+            data = await entry_flights.do(
+                (language, norm_entry, False), lambda: _refresh_entry(language, norm_entry)
+            )
+            if data is None:
+                data = found[0]
+            if verbs == "none":
+                data = {**data, "verbs": []}
+        else:
+            data = await entry_flights.do(
+                (language, norm_entry, verbs == "none"), lambda: _fetch_and_store(language, norm_entry, verbs)
+            )
         if data is None:
-            try:
-                auth = request.headers.get("Authorization") or ""
-                parts = auth.split()
-                email = None
-                user_id = None
-                provider = None
-                if len(parts) == 2 and parts[0].lower() == "bearer":
-                    data_jwt = decode_token(parts[1])
-                    if data_jwt:
-                        email = data_jwt.get("email")
-                        user_id = data_jwt.get("sub")
-                        provider = data_jwt.get("provider")
-                if not user_id:
-                    tok = request.cookies.get("jwt_token") or ""
-                    if tok:
-                        data_jwt = decode_token(tok)
-                        if data_jwt:
-                            email = data_jwt.get("email")
-                            user_id = data_jwt.get("sub")
-                            provider = data_jwt.get("provider")
-                insert_page_visit(path=f"/api/dictionary/{language}/{norm_entry}", method="GET", email=email, user_id=user_id, provider=provider, ip=request.client.host if request.client else None, user_agent=request.headers.get("User-Agent"), action_type=f"translate({language})", action_content=norm_entry)
-            except Exception:
-                pass
+            await _log_dictionary_visit(request, language, norm_entry)
             return JSONResponse(status_code=404, content={"error": "word not found"})
-        try:
-            upsert_entry_with_senses(language, norm_entry, data)
-        except Exception:
-            pass
-        try:
-            auth = request.headers.get("Authorization") or ""
-            parts = auth.split()
-            email = None
-            user_id = None
-            provider = None
-            if len(parts) == 2 and parts[0].lower() == "bearer":
-                data_jwt = decode_token(parts[1])
-                if data_jwt:
-                    email = data_jwt.get("email")
-                    user_id = data_jwt.get("sub")
-                    provider = data_jwt.get("provider")
-            if not user_id:
-                tok = request.cookies.get("jwt_token") or ""
-                if tok:
-                    data_jwt = decode_token(tok)
-                    if data_jwt:
-                        email = data_jwt.get("email")
-                        user_id = data_jwt.get("sub")
-                        provider = data_jwt.get("provider")
-            insert_page_visit(path=f"/api/dictionary/{language}/{norm_entry}", method="GET", email=email, user_id=user_id, provider=provider, ip=request.client.host if request.client else None, user_agent=request.headers.get("User-Agent"), action_type=f"translate({language})", action_content=norm_entry)
-        except Exception:
-            pass
-        return JSONResponse(status_code=200, content=data)
+        await _log_dictionary_visit(request, language, norm_entry)
+        return _entry_response(request, response_key, data)
     except ValueError:
         return JSONResponse(status_code=400, content={"error": "Unsupported language"})
+    except UpstreamError:
+        return JSONResponse(status_code=502, content={"error": "upstream unavailable"})
     except Exception:
         return JSONResponse(status_code=500, content={"error": "Internal server error"})
+
+
+def _batch_pairs(body: Any) -> List[Tuple[str, str]]:
+    items = body.get("items") if isinstance(body, dict) else body
+    if not isinstance(items, list) or not items:
+        raise ValueError("items must be a non-empty list")
+    if len(items) > batch_max_items:
+        raise ValueError(f"at most {batch_max_items} items per batch")
+    pairs: List[Tuple[str, str]] = []
+    for item in items:
+        if isinstance(item, dict):
+            language, entry = item.get("language"), item.get("entry")
+        elif isinstance(item, (list, tuple)) and len(item) == 2:
+            language, entry = item
+        else:
+            raise ValueError("each item must be {language, entry} or [language, entry]")
+        if not isinstance(language, str) or not isinstance(entry, str) or not entry.strip():
+            raise ValueError("language and entry must be non-empty strings")
+        pair = (language, entry.strip().lower())
+        if pair not in pairs:
+            pairs.append(pair)
+    return pairs
+
+
+def _supported_language(language: str) -> bool:
+    try:
+        client._language_mapping(language)
+    except ValueError:
+        return False
+    return True
+
+
+def _usable_stored(language: str, data: Any, age: Optional[float]) -> Tuple[Optional[Dict[str, Any]], bool]:
+    """Apply the route's checks to a stored entry: (entry to serve or None, needs a background refresh)."""
+    if not isinstance(data, dict) or not data.get("definition"):
+        return None, False
+    if language == "cn-en" and not any(isinstance(d, dict) and d.get("lemma") for d in data["definition"]):
+        return None, False
+    if age is not None and entry_hard_ttl and age >= entry_hard_ttl:
+        return None, False
+    return data, age is not None and bool(entry_soft_ttl) and age >= entry_soft_ttl
+
+
+def _batch_line(language: str, entry: str, status: int, data: Any = None, error: Optional[str] = None) -> bytes:
+    out: Dict[str, Any] = {"language": language, "entry": entry, "status": status}
+    if data is not None:
+        out["data"] = data
+    if error:
+        out["error"] = error
+    return (json.dumps(out, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def _batch_line_encoded(language: str, entry: str, body: bytes) -> bytes:
+    # a response-cache body is already the encoded entry; splice it in rather than re-encode it
+    head = _batch_line(language, entry, 200)[:-2]
+    return head + b',"data":' + body + b"}\n"
+
+
+async def _log_batch_visit(request: Request, pairs: List[Tuple[str, str]]) -> None:
+    try:
+        email, user_id, provider = _visitor(request)
+        await insert_page_visit_async(path="/api/dictionary/batch", method="POST", email=email, user_id=user_id, provider=provider, ip=request.client.host if request.client else None, user_agent=request.headers.get("User-Agent"), action_type="translate(batch)", action_content=",".join(f"{l}:{e}" for l, e in pairs)[:1000])
+    except Exception:
+        pass
+
+
+@app.post("/api/dictionary/batch")
+async def dictionary_batch(request: Request):
+    """Resolve many (language, entry) pairs; one NDJSON line per pair, in the order they resolve.
+
+    The response cache, memory and the replica answer first, then one Supabase
+    query covers every remaining pair, then misses are fetched upstream at most
+    BATCH_CONCURRENCY at a time.
+    """
+    verbs = request.query_params.get("verbs") or "lazy"
+    if verbs not in VERBS_MODES:
+        return JSONResponse(status_code=400, content={"error": "verbs must be one of eager, lazy, none"})
+    try:
+        body = await request.json()
+    except Exception:
+        return JSONResponse(status_code=400, content={"error": "invalid JSON body"})
+    try:
+        pairs = _batch_pairs(body)
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+    client._spawn(_log_batch_visit(request, pairs))
+
+    def shaped(data: Dict[str, Any]) -> Dict[str, Any]:
+        return {**data, "verbs": []} if verbs == "none" else data
+
+    async def resolve(language: str, norm_entry: str, stored: Optional[Dict[str, Any]], sem: asyncio.Semaphore) -> bytes:
+        async with sem:
+            try:
+                if stored is not None:
+                    # past the hard TTL: refresh, falling back to the stored row
+                    data = await entry_flights.do(
+                        (language, norm_entry, False), lambda: _refresh_entry(language, norm_entry)
+                    )
+                    data = data or stored
+                else:
+                    data = await entry_flights.do(
+                        (language, norm_entry, verbs == "none"),
+                        lambda: _fetch_and_store(language, norm_entry, verbs),
+                    )
+            except UpstreamError:
+                return _batch_line(language, norm_entry, 502, error="upstream unavailable")
+            except ValueError:
+                return _batch_line(language, norm_entry, 400, error="Unsupported language")
+            except Exception:
+                return _batch_line(language, norm_entry, 500, error="Internal server error")
+        if data is None:
+            return _batch_line(language, norm_entry, 404, error="word not found")
+        return _batch_line(language, norm_entry, 200, shaped(data))
+
+    async def stream():
+        remaining: List[Tuple[str, str]] = []
+        for language, norm_entry in pairs:
+            if not _supported_language(language):
+                yield _batch_line(language, norm_entry, 400, error="Unsupported language")
+                continue
+            encoded = responses.get(_response_key(language, verbs, norm_entry))
+            if encoded is not None:
+                client.note_entry_lookup(language, norm_entry)
+                yield _batch_line_encoded(language, norm_entry, encoded[1])
+                continue
+            if negative.contains(language, norm_entry):
+                yield _batch_line(language, norm_entry, 404, error="word not found")
+                continue
+            hit = await client.peek_entry_async(language, norm_entry, verbs)
+            if hit is None and replica is not None:
+                found = await asyncio.to_thread(replica.get, language, norm_entry)
+                if found is not None:
+                    hit, stale = _usable_stored(language, *found)
+                    if stale:
+                        _schedule_refresh(language, norm_entry)
+            if hit is not None:
+                yield _batch_line(language, norm_entry, 200, shaped(hit))
+            else:
+                remaining.append((language, norm_entry))
+        if not remaining:
+            return
+        stored_rows = await get_entries_batch_async(remaining)
+        misses: List[Tuple[str, str, Optional[Dict[str, Any]]]] = []
+        for language, norm_entry in remaining:
+            found = stored_rows.get((language, norm_entry))
+            data, stale = _usable_stored(language, *found) if found is not None else (None, False)
+            if data is None:
+                hard_expired = found is not None and found[1] is not None and entry_hard_ttl and found[1] >= entry_hard_ttl
+                misses.append((language, norm_entry, found[0] if hard_expired else None))
+                continue
+            if stale:
+                _schedule_refresh(language, norm_entry)
+            client.prime_entry(language, norm_entry, data)
+            yield _batch_line(language, norm_entry, 200, shaped(data))
+        if not misses:
+            return
+        sem = asyncio.Semaphore(max(1, batch_concurrency))
+        tasks = [asyncio.ensure_future(resolve(language, norm_entry, stored, sem)) for language, norm_entry, stored in misses]
+        try:
+            for fut in asyncio.as_completed(tasks):
+                yield await fut
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@app.get("/api/metrics")
+def metrics():
+    return JSONResponse(
+        status_code=200,
+        content={
+            "singleflight": entry_flights.stats(),
+            "negative_cache": negative.stats(),
+            "verb_store": client.verb_store.stats(),
+            "cache": client.cache_stats(),
+            "refresh": dict(refresh_stats),
+            "responses": {**responses.stats(), **response_stats},
+            "supabase_pool": pool_stats(),
+            "write_behind": writer.stats(),
+            "replica": replica.stats() if replica is not None else None,
+        },
+    )
+
+
+@app.get("/api/verbs/{form}")
+def verb_lemma(form: str):
+    found = client.verb_store.lemma_for(form)
+    if found is None:
+        return JSONResponse(status_code=404, content={"error": "form not found"})
+    return JSONResponse(status_code=200, content=found)
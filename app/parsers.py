@@ -0,0 +1,226 @@
+import json
+import os
+import re
+import sys
+from typing import Any, Callable, Dict, List, Optional
+
+from bs4 import BeautifulSoup
+
+
+# Parser engines understood by CambridgeClient. "html.parser" is the pure-Python
+# builder we have always used; "lxml" is the C-backed libxml2 builder and is only
+# used when the lxml package is importable. html.parser stays the default: the two
+# builders repair malformed markup differently (tests/test_parsers.py keeps a page
+# where they disagree), so lxml is opt-in. tests/fixtures/parity holds small
+# hand-written pages; real pages saved with `python -m app.parsers capture` go in
+# tests/fixtures/parity_captured and are checked too.
+DEFAULT_ENGINE = "html.parser"
+ENGINES = ("html.parser", "lxml")
+
+
+def _engine_available(name: str) -> bool:
+    if name == "html.parser":
+        return True
+    if name == "lxml":
+        try:
+            import lxml  # noqa: F401
+        except Exception:
+            return False
+        return True
+    return False
+
+
+def resolve_engine(name: Optional[str]) -> str:
+    engine = (name or "").strip().lower() or DEFAULT_ENGINE
+    if engine not in ENGINES:
+        try:
+            print("PARSER_ENGINE_UNKNOWN", engine)
+        except Exception:
+            pass
+        return DEFAULT_ENGINE
+    if not _engine_available(engine):
+        try:
+            print("PARSER_ENGINE_UNAVAILABLE", engine)
+        except Exception:
+            pass
+        return DEFAULT_ENGINE
+    return engine
+
+
+def make_soup(html: str, engine: str = DEFAULT_ENGINE) -> BeautifulSoup:
+    return BeautifulSoup(html, engine)
+
+
+# Tokens the region scanner cares about. Comments, scripts and styles are matched
+# whole so markup inside them is never mistaken for an entry container.
+_TOKEN_RE = re.compile(
+    r"<!--.*?-->|<(script|style)\b.*?</\1\s*>|<(/?)([a-zA-Z][a-zA-Z0-9-]*)\b([^>]*)>",
+    re.S | re.I,
+)
+_CLASS_ATTR_RE = re.compile(r"\bclass\s*=\s*(?:\"([^\"]*)\"|'([^']*)'|([^\s>]+))", re.I)
+_TITLE_RE = re.compile(r"<title\b[^>]*>.*?</title\s*>", re.S | re.I)
+ENTRY_REGION_CLASSES = ("dictionary", "entry-body")
+
+
+def extract_entry_regions(html: str) -> Optional[str]:
+    """Cut the `.dictionary`/`.entry-body` subtrees and `<title>` out of a page.
+
+    Returns a small standalone document holding only those regions, or None when
+    no region is found or a region is never closed, in which case the caller
+    should parse the full page.
+    """
+    regions: List[str] = []
+    start = -1
+    tag = ""
+    depth = 0
+    for m in _TOKEN_RE.finditer(html):
+        name = m.group(3)
+        if not name:
+            continue
+        name = name.lower()
+        closing = m.group(2) == "/"
+        if depth == 0:
+            if closing:
+                continue
+            attrs = m.group(4) or ""
+            cm = _CLASS_ATTR_RE.search(attrs)
+            if not cm:
+                continue
+            tokens = (cm.group(1) or cm.group(2) or cm.group(3) or "").split()
+            if not any(c in tokens for c in ENTRY_REGION_CLASSES):
+                continue
+            if attrs.rstrip().endswith("/"):
+                continue
+            start = m.start()
+            tag = name
+            depth = 1
+            continue
+        if name != tag:
+            continue
+        if closing:
+            depth -= 1
+            if depth == 0:
+                regions.append(html[start:m.end()])
+        elif not (m.group(4) or "").rstrip().endswith("/"):
+            depth += 1
+    if depth != 0 or not regions:
+        return None
+    tm = _TITLE_RE.search(html)
+    title = tm.group(0) if tm else ""
+    return "<html><head>" + title + "</head><body>" + "".join(regions) + "</body></html>"
+
+
+def check_parity(
+    parse: Callable[[str, str], Dict[str, Any]],
+    paths: List[str],
+    engines: tuple[str, ...] = ENGINES,
+) -> List[Dict[str, Any]]:
+    """Parse every saved page with each engine and report pages whose output differs.
+
+    ``parse(html, engine)`` must return the entry dict; outputs are compared on
+    their canonical JSON encoding so any byte-level difference is reported.
+    """
+    engines = tuple(e for e in engines if _engine_available(e))
+    mismatches: List[Dict[str, Any]] = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            html = f.read()
+        encoded = {
+            e: json.dumps(parse(html, e), ensure_ascii=False, sort_keys=True)
+            for e in engines
+        }
+        baseline = encoded[engines[0]]
+        for e in engines[1:]:
+            if encoded[e] != baseline:
+                mismatches.append({"path": path, "engine": e, "baseline": engines[0]})
+    return mismatches
+
+
+def _corpus_paths(root: str) -> List[str]:
+    if os.path.isfile(root):
+        return [root]
+    out: List[str] = []
+    for dirpath, _, files in os.walk(root):
+        for name in sorted(files):
+            if name.endswith((".html", ".htm")):
+                out.append(os.path.join(dirpath, name))
+    return sorted(out)
+
+
+def capture(out_dir: str, language: str, words: List[str]) -> List[str]:
+    """Save live Cambridge pages into ``out_dir`` for the parity corpus.
+
+    Files are named ``<language>_<word>.html``; for ``cn-en`` the english-chinese
+    pages the aggregate is built from are saved (``cn-en_<word>_<n>.html``),
+    since those are what the parser sees.
+    """
+    from .cambridge import CambridgeClient
+
+    # offline only keeps the client from starting sweepers and shared tiers; pages
+    # are fetched with its session directly
+    client = CambridgeClient(offline=True)
+    os.makedirs(out_dir, exist_ok=True)
+    saved: List[str] = []
+
+    def fetch(url: str) -> str:
+        r = client.session.get(url, timeout=client.timeout)
+        return r.text if r.status_code == 200 else ""
+
+    def save(name: str, url: str) -> None:
+        html = fetch(url)
+        if not html:
+            print("CAPTURE_MISSING", url)
+            return
+        path = os.path.join(out_dir, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(html)
+        saved.append(path)
+
+    for word in words:
+        if language == "cn-en":
+            search_lang, nation = client._language_mapping("cn-en")
+            html = fetch(client._build_url(search_lang, nation, word))
+            for n, url in enumerate(client._cn_en_links(html)[:3]):
+                save(f"cn-en_{word}_{n}.html", url)
+        else:
+            page_lang, nation = client._language_mapping(language)
+            save(f"{language}_{word}.html", client._build_url(page_lang, nation, word))
+    return saved
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    # Usage: python -m app.parsers <corpus dir> [source_hint]
+    #        python -m app.parsers capture <out dir> <language> <word>...
+    args = list(sys.argv[1:] if argv is None else argv)
+    if not args:
+        print("usage: python -m app.parsers <corpus dir> [source_hint]")
+        print("       python -m app.parsers capture <out dir> <language> <word>...")
+        return 2
+    if args[0] == "capture":
+        if len(args) < 4:
+            print("usage: python -m app.parsers capture <out dir> <language> <word>...")
+            return 2
+        saved = capture(args[1], args[2], args[3:])
+        print("CAPTURED", len(saved))
+        return 0 if saved else 1
+    from .cambridge import CambridgeClient
+
+    paths = _corpus_paths(args[0])
+    hint = args[1] if len(args) > 1 else None
+    clients: Dict[str, CambridgeClient] = {}
+
+    def parse(html: str, engine: str) -> Dict[str, Any]:
+        if engine not in clients:
+            # offline: no sweeper threads, shared cache or persisted verb store
+            clients[engine] = CambridgeClient(parser_engine=engine, offline=True)
+        return clients[engine]._parse_entry(html, source_hint=hint)
+
+    mismatches = check_parity(parse, paths)
+    for m in mismatches:
+        print("PARITY_MISMATCH", m["path"], m["engine"], "vs", m["baseline"])
+    print("PARITY_CHECKED", len(paths), "MISMATCHES", len(mismatches))
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+import asyncio
+from typing import Any, Dict, Optional
+
+from .replica import EntryReplica
+from .repo import upsert_entries_batch_async, upsert_entry_with_senses_async
+from .utils_cfg import get_cfg_float, get_cfg_int
+from .writebehind import WriteBehind
+
+
+def writer_from_config() -> WriteBehind:
+    """Write-behind queue over upsert_entries_batch_async, sized by WRITE_BEHIND_*."""
+    return WriteBehind(
+        upsert_entries_batch_async,
+        max_pending=get_cfg_int("WRITE_BEHIND_MAX_PENDING", 1000),
+        max_batch=get_cfg_int("WRITE_BEHIND_BATCH", 50),
+        flush_interval=get_cfg_float("WRITE_BEHIND_INTERVAL", 0.2),
+    )
+
+
+async def persist_entry(
+    language: str,
+    entry: str,
+    data: Dict[str, Any],
+    replica: Optional[EntryReplica] = None,
+    writer: Optional[WriteBehind] = None,
+) -> None:
+    """Store a parsed entry: the local replica first, then Supabase.
+
+    Supabase writes go through ``writer`` when it accepts them, and are made
+    inline when there is no writer or its queue is full or stopped. Used by the
+    API and by ``python -m app.archive reparse`` so both keep every tier in step.
+    """
+    if replica is not None:
+        await asyncio.to_thread(replica.put, language, entry, data)
+    if writer is not None and writer.submit(language, entry, data):
+        return
+    try:
+        await upsert_entry_with_senses_async(language, entry, data)
+    except Exception as e:
+        try:
+            print("PERSIST_ENTRY_FAIL", language, entry, str(e))
+        except Exception:
+            pass
+
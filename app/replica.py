@@ -0,0 +1,251 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from .db import get_rest_config, get_rest_session
+from .utils_cfg import get_cfg, get_cfg_float
+
+
+def _age(updated_at: Optional[str]) -> Optional[float]:
+    if not updated_at:
+        return None
+    try:
+        ts = datetime.fromisoformat(updated_at.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return max(0.0, (datetime.now(timezone.utc) - ts).total_seconds())
+
+
+def _parse(updated_at: str) -> datetime:
+    ts = datetime.fromisoformat(updated_at.replace("Z", "+00:00"))
+    return ts if ts.tzinfo is not None else ts.replace(tzinfo=timezone.utc)
+
+
+def _shift(updated_at: str, seconds: float) -> str:
+    return (_parse(updated_at) - timedelta(seconds=seconds)).isoformat()
+
+
+class EntryReplica:
+    """Local SQLite copy of ``dictionary_entries.data``, keyed by (language_slug, entry).
+
+    ``sync`` pulls rows changed since the stored updated_at watermark in
+    keyset-paginated pages on (updated_at, id). A row's updated_at is stamped when
+    its transaction starts, so a row can become visible after later-stamped rows
+    were already synced; every sync therefore re-reads the last ``overlap``
+    seconds and skips rows it already holds. ``put`` records entries this process
+    writes so they are readable before the next sync. Rows without ``data``
+    (written before that column existed) are not replicated and keep being read
+    from Supabase.
+
+    All methods block on SQLite; async callers run them in a thread.
+    """
+
+    def __init__(self, path: str, page_size: int = 500, overlap: float = 60.0):
+        self.path = path
+        self.page_size = page_size
+        self.overlap = overlap
+        self._local = threading.local()
+        self._sync_lock = threading.Lock()
+        self._syncer: Optional[threading.Thread] = None
+        self.hits = 0
+        self.misses = 0
+        self.synced = 0
+        self.sync_errors = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "language_slug TEXT NOT NULL, entry TEXT NOT NULL, data TEXT NOT NULL, updated_at TEXT,"
+            " PRIMARY KEY (language_slug, entry))"
+        )
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, language_slug: str, entry: str) -> Optional[Tuple[Dict[str, Any], Optional[float]]]:
+        """Return (entry, age in seconds) like get_entry_with_age_async, or None."""
+        try:
+            row = self._conn().execute(
+                "SELECT data, updated_at FROM entries WHERE language_slug = ? AND entry = ?",
+                (language_slug, entry),
+            ).fetchone()
+            data = json.loads(row[0]) if row else None
+        except (sqlite3.Error, ValueError):
+            data = None
+        if not isinstance(data, dict):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data, _age(row[1])
+
+    def put(self, language_slug: str, entry: str, data: Dict[str, Any], updated_at: Optional[str] = None) -> None:
+        try:
+            self._conn().execute(
+                "INSERT OR REPLACE INTO entries (language_slug, entry, data, updated_at) VALUES (?, ?, ?, ?)",
+                (
+                    language_slug,
+                    entry,
+                    json.dumps(data, ensure_ascii=False, separators=(",", ":")),
+                    updated_at or datetime.now(timezone.utc).isoformat(),
+                ),
+            )
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            try:
+                print("REPLICA_PUT_FAIL", language_slug, entry, str(e))
+            except Exception:
+                pass
+
+    def _watermark(self) -> str:
+        row = self._conn().execute("SELECT value FROM meta WHERE key = 'updated_at'").fetchone()
+        return row[0] if row else ""
+
+    def _set_watermark(self, updated_at: str) -> None:
+        self._conn().execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('updated_at', ?)", (updated_at,))
+
+    def sync(self) -> int:
+        """Pull rows changed since the watermark, minus the overlap; returns how many were applied."""
+        conf = get_rest_config()
+        if conf is None:
+            return 0
+        rest, key = conf
+        headers = {"apikey": key, "Authorization": f"Bearer {key}"}
+        applied = 0
+        with self._sync_lock:
+            watermark = self._watermark()
+            since, last_id = (_shift(watermark, self.overlap), 0) if watermark else ("", 0)
+            while True:
+                params = {
+                    "select": "id,language_slug,entry,updated_at,data",
+                    "updated_at": "not.is.null",
+                    "order": "updated_at.asc,id.asc",
+                    "limit": str(self.page_size),
+                }
+                if since:
+                    # keyset pagination: rows sharing a timestamp are not skipped across pages
+                    params["or"] = f'(updated_at.gt."{since}",and(updated_at.eq."{since}",id.gt.{last_id}))'
+                try:
+                    r = get_rest_session().get(f"{rest}/dictionary_entries", headers=headers, params=params, timeout=30)
+                except Exception as e:
+                    self.sync_errors += 1
+                    try:
+                        print("REPLICA_SYNC_EXCEPTION", str(e))
+                    except Exception:
+                        pass
+                    break
+                if r.status_code != 200:
+                    self.sync_errors += 1
+                    try:
+                        print("REPLICA_SYNC_STATUS", r.status_code, r.text[:120])
+                    except Exception:
+                        pass
+                    break
+                rows = r.json() or []
+                conn = self._conn()
+                conn.execute("BEGIN")
+                try:
+                    for row in rows:
+                        held = conn.execute(
+                            "SELECT updated_at FROM entries WHERE language_slug = ? AND entry = ?",
+                            (row["language_slug"], row["entry"]),
+                        ).fetchone()
+                        if held is not None and held[0] == row["updated_at"]:
+                            # already applied by an earlier, overlapping sync
+                            continue
+                        if isinstance(row.get("data"), dict):
+                            conn.execute(
+                                "INSERT OR REPLACE INTO entries (language_slug, entry, data, updated_at)"
+                                " VALUES (?, ?, ?, ?)",
+                                (
+                                    row["language_slug"],
+                                    row["entry"],
+                                    json.dumps(row["data"], ensure_ascii=False, separators=(",", ":")),
+                                    row["updated_at"],
+                                ),
+                            )
+                            applied += 1
+                    if rows and (not watermark or _parse(rows[-1]["updated_at"]) > _parse(watermark)):
+                        watermark = rows[-1]["updated_at"]
+                        self._set_watermark(watermark)
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    self.sync_errors += 1
+                    raise
+                if len(rows) < self.page_size:
+                    break
+                since, last_id = rows[-1]["updated_at"], int(rows[-1]["id"])
+        self.synced += applied
+        if applied:
+            try:
+                print("REPLICA_SYNCED", applied)
+            except Exception:
+                pass
+        return applied
+
+    def start_sync(self, interval: float) -> None:
+        """Sync now and then every ``interval`` seconds from a daemon thread."""
+        if interval <= 0 or self._syncer is not None:
+            return
+        ref = weakref.ref(self)
+
+        def run():
+            while True:
+                replica = ref()
+                if replica is None:
+                    return
+                try:
+                    replica.sync()
+                except Exception:
+                    pass
+                del replica
+                time.sleep(interval)
+
+        self._syncer = threading.Thread(target=run, name="replica-sync", daemon=True)
+        self._syncer.start()
+
+    def stats(self) -> Dict[str, Any]:
+        try:
+            rows = self._conn().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            since = self._watermark()
+        except sqlite3.Error:
+            rows, since = None, None
+        return {
+            "path": self.path,
+            "rows": rows,
+            "watermark": since,
+            "hits": self.hits,
+            "misses": self.misses,
+            "synced": self.synced,
+            "sync_errors": self.sync_errors,
+        }
+
+
+def replica_from_config(start_sync: bool = True) -> Optional[EntryReplica]:
+    path = get_cfg("DICTIONARY_REPLICA")
+    if not path:
+        return None
+    try:
+        replica = EntryReplica(path, overlap=get_cfg_float("DICTIONARY_REPLICA_SYNC_OVERLAP", 60.0))
+    except (OSError, sqlite3.Error) as e:
+        try:
+            print("REPLICA_INIT_FAIL", path, str(e))
+        except Exception:
+            pass
+        return None
+    if start_sync:
+        replica.start_sync(get_cfg_float("DICTIONARY_REPLICA_SYNC_INTERVAL", 60.0))
+    return replica
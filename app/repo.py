@@ -1,13 +1,35 @@
-from typing import Optional, Dict, Any, List
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, List, Tuple
 import logging
-import requests
+import time
 
-import os
-from .db import get_supabase_client
-from .config import load_ignore_config
+from .db import get_async_rest_client, get_rest_config, get_rest_session, get_supabase_client
 
 logger = logging.getLogger("repo")
 
+ENTRY_HEAD_SELECT = "id,word,pos,pronunciation,verbs"
+SENSES_SELECT = "pos,source,original_content,translated_result,level,examples"
+# dictionary_entries.updated_at (timestamptz) drives stale-while-revalidate and the
+# replica sync. The database stamps it (column default plus an update trigger, see
+# README), so writes never send it and tables without the column keep working;
+# rows read from such a table are treated as of unknown age
+ENTRY_UPDATED_AT = "updated_at"
+SENSES_EMBED = f"dictionary_senses({SENSES_SELECT})"
+
+# Entry reads, most to least capable. Each answers in one round trip: either the
+# stored `data` JSON or the senses embedded through the entry_id foreign key. The
+# first select the table accepts is remembered for the process; only legacy rows
+# (no data, no embedding) still need a second query on dictionary_senses.
+ENTRY_READ_SELECTS = (
+    f"{ENTRY_HEAD_SELECT},{ENTRY_UPDATED_AT},data",
+    f"{ENTRY_HEAD_SELECT},data",
+    f"{ENTRY_HEAD_SELECT},{ENTRY_UPDATED_AT},{SENSES_EMBED}",
+    f"{ENTRY_HEAD_SELECT},{SENSES_EMBED}",
+    f"{ENTRY_HEAD_SELECT},{ENTRY_UPDATED_AT}",
+    ENTRY_HEAD_SELECT,
+)
+_read_select = 0
+
 
 def _map_languages(language_slug: str) -> tuple[str, Optional[str]]:
     src = "en"
@@ -18,176 +40,147 @@ def _map_languages(language_slug: str) -> tuple[str, Optional[str]]:
     return src, None
 
 
-def get_entry_from_db(language_slug: str, entry: str) -> Optional[Dict[str, Any]]:
-    client = get_supabase_client()
-    if client is None:
-        cfg = load_ignore_config()
-        base = os.environ.get("SUPABASE_URL") or cfg.get("SUPABASE_URL")
-        key = os.environ.get("SUPABASE_KEY") or cfg.get("SUPABASE_KEY") or cfg.get("SUPABASE_KEY")
-        if not base or not key:
-            return None
-        try:
-            headers = {
-                "apikey": key,
-                "Authorization": f"Bearer {key}",
-            }
-            rest = f"{base.rstrip('/')}/rest/v1"
-            q1 = {
-                "language_slug": f"eq.{language_slug}",
-                "entry": f"eq.{entry}",
-                "select": "id,word,pos,pronunciation,verbs",
-                "limit": "1",
-            }
-            r1 = requests.get(f"{rest}/dictionary_entries", headers=headers, params=q1, timeout=10)
-            if r1.status_code != 200:
-                try:
-                    print("HTTP_DB_HEAD_STATUS", r1.status_code, r1.text[:120])
-                except Exception:
-                    pass
-                return None
-            rows = r1.json()
-            try:
-                print("HTTP_DB_HEAD_ROWS", len(rows))
-            except Exception:
-                pass
-            if not rows:
-                return None
-            entry_row = rows[0]
-            entry_id = entry_row["id"]
-            q2 = {
-                "entry_id": f"eq.{entry_id}",
-                "select": "pos,source,original_content,translated_result,level,examples",
-            }
-            r2 = requests.get(f"{rest}/dictionary_senses", headers=headers, params=q2, timeout=10)
-            if r2.status_code != 200:
-                try:
-                    print("HTTP_DB_SENSES_STATUS", r2.status_code, r2.text[:120])
-                except Exception:
-                    pass
-                senses = []
-            else:
-                senses = r2.json()
-            try:
-                print("HTTP_DB_SENSES_ROWS", len(senses))
-            except Exception:
-                pass
-            definitions: List[Dict[str, Any]] = []
-            for i, s in enumerate(senses):
-                definitions.append(
-                    {
-                        "id": i,
-                        "pos": s.get("pos") or "",
-                        "source": s.get("source") or "",
-                        "text": s.get("original_content") or "",
-                        "translation": s.get("translated_result") or "",
-                        "level": s.get("level") or "",
-                        "example": s.get("examples") or [],
-                    }
-                )
-            return {
-                "word": entry_row.get("word") or "",
-                "pos": entry_row.get("pos") or [],
-                "pronunciation": entry_row.get("pronunciation") or [],
-                "definition": definitions,
-                "verbs": entry_row.get("verbs") or [],
+def _definitions_from_senses(senses: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    definitions: List[Dict[str, Any]] = []
+    for i, s in enumerate(senses):
+        definitions.append(
+            {
+                "id": i,
+                "pos": s.get("pos") or "",
+                "source": s.get("source") or "",
+                "text": s.get("original_content") or "",
+                "translation": s.get("translated_result") or "",
+                "level": s.get("level") or "",
+                "example": s.get("examples") or [],
             }
-        except Exception as e:
-            try:
-                print("HTTP_DB_EXCEPTION", str(e))
-            except Exception:
-                pass
-            return None
-    try:
-        head = (
-            client.table("dictionary_entries")
-            .select("id, word, pos, pronunciation, verbs")
-            .eq("language_slug", language_slug)
-            .eq("entry", entry)
-            .limit(1)
-            .execute()
-        )
-        rows = getattr(head, "data", [])
-        try:
-            logger.info("DB_HEAD_ROWS=%s", len(rows))
-        except Exception:
-            pass
-        try:
-            print("DB_HEAD_ROWS", len(rows))
-        except Exception:
-            pass
-        if not rows:
-            return None
-        entry_row = rows[0]
-        entry_id = entry_row["id"]
-        senses_res = (
-            client.table("dictionary_senses")
-            .select("pos, source, original_content, translated_result, level, examples")
-            .eq("entry_id", entry_id)
-            .order("id")
-            .execute()
         )
-        senses = getattr(senses_res, "data", [])
-        try:
-            logger.info("DB_SENSES_ROWS=%s", len(senses))
-        except Exception:
-            pass
-        try:
-            print("DB_SENSES_ROWS", len(senses))
-        except Exception:
-            pass
-        definitions: List[Dict[str, Any]] = []
-        for i, s in enumerate(senses):
-            definitions.append(
-                {
-                    "id": i,
-                    "pos": s.get("pos") or "",
-                    "source": s.get("source") or "",
-                    "text": s.get("original_content") or "",
-                    "translation": s.get("translated_result") or "",
-                    "level": s.get("level") or "",
-                    "example": s.get("examples") or [],
-                }
-            )
-        return {
-            "word": entry_row.get("word") or "",
-            "pos": entry_row.get("pos") or [],
-            "pronunciation": entry_row.get("pronunciation") or [],
-            "definition": definitions,
-            "verbs": entry_row.get("verbs") or [],
-        }
+    return definitions
+
+
+def _entry_from_rows(entry_row: Dict[str, Any], senses: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "word": entry_row.get("word") or "",
+        "pos": entry_row.get("pos") or [],
+        "pronunciation": entry_row.get("pronunciation") or [],
+        "definition": _definitions_from_senses(senses),
+        "verbs": entry_row.get("verbs") or [],
+    }
+
+
+def _entry_from_head(entry_row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Build the entry from a single head row, or None if the senses must be queried."""
+    data = entry_row.get("data")
+    if isinstance(data, dict) and data.get("definition"):
+        out = dict(data)
+        out.setdefault("verbs", entry_row.get("verbs") or [])
+        return out
+    if "dictionary_senses" in entry_row:
+        return _entry_from_rows(entry_row, entry_row.get("dictionary_senses") or [])
+    return None
+
+
+def _entry_read_params(language_slug: str, entry: str) -> Dict[str, str]:
+    select = ENTRY_READ_SELECTS[_read_select]
+    params = {
+        "language_slug": f"eq.{language_slug}",
+        "entry": f"eq.{entry}",
+        "select": select,
+        "limit": "1",
+    }
+    if SENSES_EMBED in select:
+        params["dictionary_senses.order"] = "id"
+    return params
+
+
+# PostgREST error codes for a select naming a column or embedding the table lacks
+SCHEMA_ERROR_CODES = ("42703", "PGRST200")
+
+
+def _is_schema_error(r: Any) -> bool:
+    if r.status_code != 400:
+        return False
+    try:
+        body = r.json()
     except Exception:
-        return None
+        return False
+    return isinstance(body, dict) and body.get("code") in SCHEMA_ERROR_CODES
+
+
+def _downgrade_read_select(r: Any) -> bool:
+    """Step to the next read select when ``r`` says the current one names a missing column.
+
+    Other 400s (a malformed filter value, say) leave the select alone.
+    """
+    global _read_select
+    if not _is_schema_error(r) or _read_select >= len(ENTRY_READ_SELECTS) - 1:
+        return False
+    _read_select += 1
+    try:
+        print("DB_READ_SELECT_FALLBACK", ENTRY_READ_SELECTS[_read_select])
+    except Exception:
+        pass
+    return True
+
+
+def _in_list(values: List[str]) -> str:
+    quoted = ['"' + v.replace("\\", "\\\\").replace('"', '\\"') + '"' for v in values]
+    return "in.(" + ",".join(quoted) + ")"
+
+
+def _head_payload(language_slug: str, entry: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    src_lang, tgt_lang = _map_languages(language_slug)
+    return {
+        "language_slug": language_slug,
+        "source_language": src_lang,
+        "target_language": tgt_lang,
+        "entry": entry,
+        "word": data.get("word") or entry,
+        "pos": data.get("pos") or [],
+        "pronunciation": data.get("pronunciation") or [],
+        "verbs": data.get("verbs") or [],
+        "data": data,
+    }
+
+
+def _senses_payload(entry_id: Any, data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    senses_payload: List[Dict[str, Any]] = []
+    seen = set()
+    for d in data.get("definition", []) or []:
+        # one upsert cannot touch the same (entry_id, pos, original_content) twice
+        conflict = (d.get("pos") or "", d.get("text") or "")
+        if conflict in seen:
+            continue
+        seen.add(conflict)
+        senses_payload.append(
+            {
+                "entry_id": entry_id,
+                "pos": d.get("pos") or "",
+                "source": d.get("source") or "",
+                "original_content": d.get("text") or "",
+                "translated_result": d.get("translation") or "",
+                "level": d.get("level") or "",
+                "examples": d.get("example") or [],
+            }
+        )
+    return senses_payload
 
 
 def upsert_entry_with_senses(language_slug: str, entry: str, data: Dict[str, Any]) -> None:
     client = get_supabase_client()
     if client is None:
-        cfg = load_ignore_config()
-        base = os.environ.get("SUPABASE_URL") or cfg.get("SUPABASE_URL")
-        key = os.environ.get("SUPABASE_KEY") or cfg.get("SUPABASE_KEY") or cfg.get("SUPABASE_KEY")
-        if not base or not key:
+        conf = get_rest_config()
+        if conf is None:
             return
+        rest, key = conf
         try:
-            src_lang, tgt_lang = _map_languages(language_slug)
-            head_payload = {
-                "language_slug": language_slug,
-                "source_language": src_lang,
-                "target_language": tgt_lang,
-                "entry": entry,
-                "word": data.get("word") or entry,
-                "pos": data.get("pos") or [],
-                "pronunciation": data.get("pronunciation") or [],
-                "verbs": data.get("verbs") or [],
-                "data": data,
-            }
+            head_payload = _head_payload(language_slug, entry, data)
             headers = {
                 "apikey": key,
                 "Authorization": f"Bearer {key}",
                 "Content-Type": "application/json",
                 "Prefer": "resolution=merge-duplicates,return=representation",
             }
-            rest = f"{base.rstrip('/')}/rest/v1"
-            r = requests.post(
+            r = get_rest_session().post(
                 f"{rest}/dictionary_entries",
                 headers=headers,
                 params={"on_conflict": "language_slug,entry", "select": "id"},
@@ -206,7 +199,7 @@ def upsert_entry_with_senses(language_slug: str, entry: str, data: Dict[str, Any
                     # Use return=minimal to avoid representation errors when schema cache complains
                     headers_min = dict(headers)
                     headers_min["Prefer"] = "resolution=merge-duplicates,return=minimal"
-                    r_fallback = requests.post(
+                    r_fallback = get_rest_session().post(
                         f"{rest}/dictionary_entries",
                         headers=headers_min,
                         params={"on_conflict": "language_slug,entry"},
@@ -230,7 +223,7 @@ def upsert_entry_with_senses(language_slug: str, entry: str, data: Dict[str, Any
                         "select": "id",
                         "limit": "1",
                     }
-                    r_get = requests.get(f"{rest}/dictionary_entries", headers=headers, params=q_get, timeout=10)
+                    r_get = get_rest_session().get(f"{rest}/dictionary_entries", headers=headers, params=q_get, timeout=10)
                     if r_get.status_code != 200:
                         try:
                             print("HTTP_UPSERT_HEAD_GET_STATUS", r_get.status_code, r_get.text[:160])
@@ -245,21 +238,9 @@ def upsert_entry_with_senses(language_slug: str, entry: str, data: Dict[str, Any
                     if not head_rows:
                         return
                     entry_id = head_rows[0]["id"]
-                    senses_payload: List[Dict[str, Any]] = []
-                    for d in data.get("definition", []) or []:
-                        senses_payload.append(
-                            {
-                                "entry_id": entry_id,
-                                "pos": d.get("pos") or "",
-                                "source": d.get("source") or "",
-                                "original_content": d.get("text") or "",
-                                "translated_result": d.get("translation") or "",
-                                "level": d.get("level") or "",
-                                "examples": d.get("example") or [],
-                            }
-                        )
+                    senses_payload = _senses_payload(entry_id, data)
                     if senses_payload:
-                        r2 = requests.post(
+                        r2 = get_rest_session().post(
                             f"{rest}/dictionary_senses",
                             headers=headers,
                             params={"on_conflict": "entry_id,pos,original_content"},
@@ -282,21 +263,9 @@ def upsert_entry_with_senses(language_slug: str, entry: str, data: Dict[str, Any
             if not head_rows:
                 return
             entry_id = head_rows[0]["id"]
-            senses_payload: List[Dict[str, Any]] = []
-            for d in data.get("definition", []) or []:
-                senses_payload.append(
-                    {
-                        "entry_id": entry_id,
-                        "pos": d.get("pos") or "",
-                        "source": d.get("source") or "",
-                        "original_content": d.get("text") or "",
-                        "translated_result": d.get("translation") or "",
-                        "level": d.get("level") or "",
-                        "examples": d.get("example") or [],
-                    }
-                )
+            senses_payload = _senses_payload(entry_id, data)
             if senses_payload:
-                r2 = requests.post(
+                r2 = get_rest_session().post(
                     f"{rest}/dictionary_senses",
                     headers=headers,
                     params={"on_conflict": "entry_id,pos,original_content"},
@@ -315,23 +284,26 @@ def upsert_entry_with_senses(language_slug: str, entry: str, data: Dict[str, Any
                 pass
             return
     try:
-        src_lang, tgt_lang = _map_languages(language_slug)
-        head_payload = {
-            "language_slug": language_slug,
-            "source_language": src_lang,
-            "target_language": tgt_lang,
-            "entry": entry,
-            "word": data.get("word") or entry,
-            "pos": data.get("pos") or [],
-            "pronunciation": data.get("pronunciation") or [],
-            "verbs": data.get("verbs") or [],
-            "data": data,
-        }
-        head_res = (
-            client.table("dictionary_entries")
-            .upsert(head_payload, on_conflict="language_slug,entry")
-            .execute()
-        )
+        head_payload = _head_payload(language_slug, entry, data)
+        try:
+            head_res = (
+                client.table("dictionary_entries")
+                .upsert(head_payload, on_conflict="language_slug,entry")
+                .execute()
+            )
+        except Exception as e:
+            # same fallback as the REST path: table without the data column
+            try:
+                print("SUPABASE_UPSERT_HEAD_FALLBACK", str(e)[:160])
+            except Exception:
+                pass
+            hp = dict(head_payload)
+            hp.pop("data", None)
+            head_res = (
+                client.table("dictionary_entries")
+                .upsert(hp, on_conflict="language_slug,entry")
+                .execute()
+            )
         head_rows = getattr(head_res, "data", [])
         try:
             logger.info("UPSERT_HEAD_ROWS=%s", len(head_rows))
@@ -371,19 +343,7 @@ def upsert_entry_with_senses(language_slug: str, entry: str, data: Dict[str, Any
                     return
                 entry_id = get_rows[0]["id"]
 
-        senses_payload: List[Dict[str, Any]] = []
-        for d in data.get("definition", []) or []:
-            senses_payload.append(
-                {
-                    "entry_id": entry_id,
-                    "pos": d.get("pos") or "",
-                    "source": d.get("source") or "",
-                    "original_content": d.get("text") or "",
-                    "translated_result": d.get("translation") or "",
-                    "level": d.get("level") or "",
-                    "examples": d.get("example") or [],
-                }
-            )
+        senses_payload = _senses_payload(entry_id, data)
         if senses_payload:
             res = (
                 client.table("dictionary_senses")
@@ -408,3 +368,496 @@ def upsert_entry_with_senses(language_slug: str, entry: str, data: Dict[str, Any
         except Exception:
             pass
         return
+
+
+def _row_age(entry_row: Dict[str, Any]) -> Optional[float]:
+    raw = entry_row.get(ENTRY_UPDATED_AT)
+    if not raw:
+        return None
+    try:
+        ts = datetime.fromisoformat(str(raw).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return max(0.0, (datetime.now(timezone.utc) - ts).total_seconds())
+
+
+async def get_entry_with_age_async(
+    language_slug: str, entry: str
+) -> Optional[Tuple[Dict[str, Any], Optional[float]]]:
+    """Return (entry, seconds since the row was last written), or None if absent.
+
+    The age is None when the table has no updated_at column or the row predates it.
+    """
+    conf = get_rest_config()
+    if conf is None:
+        return None
+    rest, key = conf
+    http = get_async_rest_client()
+    headers = {
+        "apikey": key,
+        "Authorization": f"Bearer {key}",
+    }
+    try:
+        while True:
+            q1 = _entry_read_params(language_slug, entry)
+            r1 = await http.get(f"{rest}/dictionary_entries", headers=headers, params=q1)
+            if r1.status_code == 200 or not _downgrade_read_select(r1):
+                break
+        if r1.status_code != 200:
+            try:
+                print("HTTP_DB_HEAD_STATUS", r1.status_code, r1.text[:120])
+            except Exception:
+                pass
+            return None
+        rows = r1.json()
+        if not rows:
+            return None
+        entry_row = rows[0]
+        single = _entry_from_head(entry_row)
+        if single is not None:
+            return single, _row_age(entry_row)
+        # legacy row: neither data nor embedded senses
+        q2 = {
+            "entry_id": f"eq.{entry_row['id']}",
+            "select": SENSES_SELECT,
+            "order": "id",
+        }
+        r2 = await http.get(f"{rest}/dictionary_senses", headers=headers, params=q2)
+        if r2.status_code != 200:
+            try:
+                print("HTTP_DB_SENSES_STATUS", r2.status_code, r2.text[:120])
+            except Exception:
+                pass
+            senses = []
+        else:
+            senses = r2.json()
+        return _entry_from_rows(entry_row, senses), _row_age(entry_row)
+    except Exception as e:
+        try:
+            print("HTTP_DB_EXCEPTION", str(e))
+        except Exception:
+            pass
+        return None
+
+
+async def get_entries_batch_async(
+    pairs: List[Tuple[str, str]],
+) -> Dict[Tuple[str, str], Tuple[Dict[str, Any], Optional[float]]]:
+    """Look up many (language_slug, entry) pairs with one dictionary_entries query.
+
+    Returns {(language_slug, entry): (entry, age)} for the pairs found. Legacy
+    rows that need their senses fetched share one extra dictionary_senses query.
+    """
+    conf = get_rest_config()
+    if conf is None or not pairs:
+        return {}
+    rest, key = conf
+    http = get_async_rest_client()
+    headers = {
+        "apikey": key,
+        "Authorization": f"Bearer {key}",
+    }
+    wanted = set(pairs)
+    out: Dict[Tuple[str, str], Tuple[Dict[str, Any], Optional[float]]] = {}
+    level = _read_select
+    try:
+        while True:
+            select = ENTRY_READ_SELECTS[level]
+            params = {
+                # slugs x entries is a superset of the pairs; extra rows are dropped below
+                "language_slug": _in_list(sorted({slug for slug, _ in pairs})),
+                "entry": _in_list(sorted({entry for _, entry in pairs})),
+                "select": f"language_slug,entry,{select}",
+            }
+            if SENSES_EMBED in select:
+                params["dictionary_senses.order"] = "id"
+            r = await http.get(f"{rest}/dictionary_entries", headers=headers, params=params)
+            # a schema error moves this batch to the next select, but only single
+            # reads change the process-wide choice: one odd batch must not downgrade it
+            if r.status_code == 200 or not _is_schema_error(r) or level >= len(ENTRY_READ_SELECTS) - 1:
+                break
+            level += 1
+        if r.status_code != 200:
+            try:
+                print("HTTP_DB_BATCH_STATUS", r.status_code, r.text[:120])
+            except Exception:
+                pass
+            return {}
+        legacy: Dict[Any, Dict[str, Any]] = {}
+        for row in r.json() or []:
+            pair = (row.get("language_slug"), row.get("entry"))
+            if pair not in wanted:
+                continue
+            single = _entry_from_head(row)
+            if single is not None:
+                out[pair] = (single, _row_age(row))
+            else:
+                legacy[row["id"]] = row
+        if legacy:
+            q2 = {
+                "entry_id": f"in.({','.join(str(i) for i in legacy)})",
+                "select": f"entry_id,{SENSES_SELECT}",
+                "order": "id",
+            }
+            r2 = await http.get(f"{rest}/dictionary_senses", headers=headers, params=q2)
+            senses: Dict[Any, List[Dict[str, Any]]] = {i: [] for i in legacy}
+            if r2.status_code == 200:
+                for sense in r2.json() or []:
+                    senses.setdefault(sense.get("entry_id"), []).append(sense)
+            for entry_id, row in legacy.items():
+                out[(row["language_slug"], row["entry"])] = (_entry_from_rows(row, senses[entry_id]), _row_age(row))
+        return out
+    except Exception as e:
+        try:
+            print("HTTP_DB_BATCH_EXCEPTION", str(e))
+        except Exception:
+            pass
+        return out
+
+
+async def upsert_entry_with_senses_async(language_slug: str, entry: str, data: Dict[str, Any]) -> None:
+    """Async counterpart of upsert_entry_with_senses over the pooled PostgREST client."""
+    conf = get_rest_config()
+    if conf is None:
+        return
+    rest, key = conf
+    http = get_async_rest_client()
+    headers = {
+        "apikey": key,
+        "Authorization": f"Bearer {key}",
+        "Content-Type": "application/json",
+        "Prefer": "resolution=merge-duplicates,return=representation",
+    }
+    try:
+        head_payload = _head_payload(language_slug, entry, data)
+        r = await http.post(
+            f"{rest}/dictionary_entries",
+            headers=headers,
+            params={"on_conflict": "language_slug,entry", "select": "id"},
+            json=head_payload,
+        )
+        if r.status_code in (200, 201):
+            head_rows = r.json()
+        else:
+            try:
+                print("HTTP_UPSERT_HEAD_STATUS", r.status_code, r.text[:160])
+            except Exception:
+                pass
+            # same fallback as the sync path: drop raw data, upsert, then look up the id
+            hp = dict(head_payload)
+            hp.pop("data", None)
+            headers_min = dict(headers)
+            headers_min["Prefer"] = "resolution=merge-duplicates,return=minimal"
+            r_fallback = await http.post(
+                f"{rest}/dictionary_entries",
+                headers=headers_min,
+                params={"on_conflict": "language_slug,entry"},
+                json=hp,
+            )
+            if r_fallback.status_code not in (200, 201, 204):
+                try:
+                    print("HTTP_UPSERT_HEAD_FALLBACK_STATUS", r_fallback.status_code, r_fallback.text[:160])
+                except Exception:
+                    pass
+                return
+            q_get = {
+                "language_slug": f"eq.{language_slug}",
+                "entry": f"eq.{entry}",
+                "select": "id",
+                "limit": "1",
+            }
+            r_get = await http.get(f"{rest}/dictionary_entries", headers=headers, params=q_get)
+            if r_get.status_code != 200:
+                try:
+                    print("HTTP_UPSERT_HEAD_GET_STATUS", r_get.status_code, r_get.text[:160])
+                except Exception:
+                    pass
+                return
+            head_rows = r_get.json()
+        if not head_rows:
+            return
+        senses_payload = _senses_payload(head_rows[0]["id"], data)
+        if senses_payload:
+            r2 = await http.post(
+                f"{rest}/dictionary_senses",
+                headers=headers,
+                params={"on_conflict": "entry_id,pos,original_content"},
+                json=senses_payload,
+            )
+            try:
+                print("HTTP_UPSERT_SENSES_STATUS", r2.status_code)
+            except Exception:
+                pass
+    except Exception as e:
+        try:
+            print("HTTP_UPSERT_EXCEPTION", str(e))
+        except Exception:
+            pass
+
+
+# set on an item whose head row is already written (value: its entry id), so a
+# retry from upsert_entries_batch_async only upserts the senses
+SENSES_ONLY = "_senses_entry_id"
+
+BatchItem = Tuple[str, str, Dict[str, Any]]
+
+
+async def _upsert_heads_async(
+    http: Any, rest: str, headers: Dict[str, str], items: List[BatchItem]
+) -> Optional[Dict[Tuple[str, str], Any]]:
+    """Upsert the head rows of ``items`` in one request; {(slug, entry): id}, or None if rejected."""
+    heads = [_head_payload(slug, entry, data) for slug, entry, data in items]
+    r = await http.post(
+        f"{rest}/dictionary_entries",
+        headers=headers,
+        params={"on_conflict": "language_slug,entry", "select": "id,language_slug,entry"},
+        json=heads,
+    )
+    if r.status_code in (200, 201):
+        head_rows = r.json()
+    else:
+        try:
+            print("HTTP_BATCH_UPSERT_HEAD_STATUS", r.status_code, r.text[:160])
+        except Exception:
+            pass
+        for hp in heads:
+            hp.pop("data", None)
+        headers_min = dict(headers)
+        headers_min["Prefer"] = "resolution=merge-duplicates,return=minimal"
+        r_fallback = await http.post(
+            f"{rest}/dictionary_entries",
+            headers=headers_min,
+            params={"on_conflict": "language_slug,entry"},
+            json=heads,
+        )
+        if r_fallback.status_code not in (200, 201, 204):
+            try:
+                print("HTTP_BATCH_UPSERT_HEAD_FALLBACK_STATUS", r_fallback.status_code, r_fallback.text[:160])
+            except Exception:
+                pass
+            return None
+        q_get = {
+            "language_slug": _in_list(sorted({slug for slug, _, _ in items})),
+            "entry": _in_list(sorted({entry for _, entry, _ in items})),
+            "select": "id,language_slug,entry",
+        }
+        r_get = await http.get(f"{rest}/dictionary_entries", headers=headers, params=q_get)
+        if r_get.status_code != 200:
+            try:
+                print("HTTP_BATCH_UPSERT_HEAD_GET_STATUS", r_get.status_code, r_get.text[:160])
+            except Exception:
+                pass
+            return None
+        head_rows = r_get.json()
+    return {(row.get("language_slug"), row.get("entry")): row.get("id") for row in head_rows or []}
+
+
+async def _upsert_senses_async(http: Any, rest: str, headers: Dict[str, str], senses_payload: List[Dict[str, Any]]) -> bool:
+    if not senses_payload:
+        return True
+    r = await http.post(
+        f"{rest}/dictionary_senses",
+        headers=headers,
+        params={"on_conflict": "entry_id,pos,original_content"},
+        json=senses_payload,
+    )
+    if r.status_code not in (200, 201, 204):
+        try:
+            print("HTTP_BATCH_UPSERT_SENSES_STATUS", r.status_code, r.text[:160])
+        except Exception:
+            pass
+        return False
+    return True
+
+
+async def upsert_entries_batch_async(items: List[BatchItem]) -> List[BatchItem]:
+    """Upsert many (language_slug, entry, data) in one head request and one senses request.
+
+    Returns the items that still need a write, so the caller retries only those;
+    an empty list means everything was stored. When a multi-row request is
+    rejected, its entries are retried one by one so a bad row only holds back
+    itself. An entry whose head was written but whose senses were not comes back
+    with SENSES_ONLY set, and its retry skips the head upsert. Both upserts are
+    idempotent. Uses the same data fallback as upsert_entry_with_senses_async.
+    """
+    conf = get_rest_config()
+    if conf is None or not items:
+        return []
+    rest, key = conf
+    http = get_async_rest_client()
+    headers = {
+        "apikey": key,
+        "Authorization": f"Bearer {key}",
+        "Content-Type": "application/json",
+        "Prefer": "resolution=merge-duplicates,return=representation",
+    }
+    failed: List[BatchItem] = []
+    ids = {(slug, entry): data[SENSES_ONLY] for slug, entry, data in items if SENSES_ONLY in data}
+    heads = [item for item in items if SENSES_ONLY not in item[2]]
+    if heads:
+        written = await _upsert_heads_async(http, rest, headers, heads)
+        if written is None and len(heads) > 1:
+            written = {}
+            for item in heads:
+                written.update(await _upsert_heads_async(http, rest, headers, [item]) or {})
+        ids.update(written or {})
+        failed.extend(item for item in heads if (item[0], item[1]) not in ids)
+    stored = [(slug, entry, data) for slug, entry, data in items if (slug, entry) in ids]
+    senses_payload: List[Dict[str, Any]] = []
+    for slug, entry, data in stored:
+        senses_payload.extend(_senses_payload(ids[(slug, entry)], data))
+    if not await _upsert_senses_async(http, rest, headers, senses_payload):
+        for slug, entry, data in stored:
+            entry_id = ids[(slug, entry)]
+            if len(stored) > 1 and await _upsert_senses_async(http, rest, headers, _senses_payload(entry_id, data)):
+                continue
+            failed.append((slug, entry, {**data, SENSES_ONLY: entry_id}))
+    try:
+        print("HTTP_BATCH_UPSERT_ROWS", len(items), len(senses_payload), len(failed))
+    except Exception:
+        pass
+    return failed
+
+
+async def has_recent_miss_async(language_slug: str, entry: str, ttl_seconds: int) -> bool:
+    """True if dictionary_misses holds a miss for this word newer than ttl_seconds."""
+    conf = get_rest_config()
+    if conf is None:
+        return False
+    rest, key = conf
+    since = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(time.time() - ttl_seconds))
+    params = {
+        "language_slug": f"eq.{language_slug}",
+        "entry": f"eq.{entry}",
+        "missed_at": f"gte.{since}",
+        "select": "entry",
+        "limit": "1",
+    }
+    try:
+        r = await get_async_rest_client().get(
+            f"{rest}/dictionary_misses",
+            headers={"apikey": key, "Authorization": f"Bearer {key}"},
+            params=params,
+        )
+        if r.status_code != 200:
+            return False
+        return len(r.json() or []) > 0
+    except Exception:
+        return False
+
+
+async def record_miss_async(language_slug: str, entry: str) -> None:
+    conf = get_rest_config()
+    if conf is None:
+        return
+    rest, key = conf
+    headers = {
+        "apikey": key,
+        "Authorization": f"Bearer {key}",
+        "Content-Type": "application/json",
+        "Prefer": "resolution=merge-duplicates,return=minimal",
+    }
+    payload = {
+        "language_slug": language_slug,
+        "entry": entry,
+        "missed_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+    try:
+        r = await get_async_rest_client().post(
+            f"{rest}/dictionary_misses",
+            headers=headers,
+            params={"on_conflict": "language_slug,entry"},
+            json=payload,
+        )
+        if r.status_code not in (200, 201, 204):
+            try:
+                print("HTTP_MISS_STATUS", r.status_code, r.text[:120])
+            except Exception:
+                pass
+    except Exception as e:
+        try:
+            print("HTTP_MISS_EXCEPTION", str(e))
+        except Exception:
+            pass
+
+
+def _rest_headers(key: str) -> Dict[str, str]:
+    return {
+        "apikey": key,
+        "Authorization": f"Bearer {key}",
+        "Content-Type": "application/json",
+    }
+
+
+def get_verb_inflections(lemma: str) -> Optional[List[Dict[str, Any]]]:
+    conf = get_rest_config()
+    if conf is None:
+        return None
+    rest, key = conf
+    try:
+        r = get_rest_session().get(
+            f"{rest}/verb_inflections",
+            headers=_rest_headers(key),
+            params={"lemma": f"eq.{lemma}", "select": "verbs", "limit": "1"},
+            timeout=10,
+        )
+        if r.status_code != 200:
+            try:
+                print("HTTP_VERBS_STATUS", r.status_code, r.text[:120])
+            except Exception:
+                pass
+            return None
+        rows = r.json() or []
+        return (rows[0].get("verbs") or []) if rows else None
+    except Exception:
+        return None
+
+
+def get_lemma_for_form(form: str) -> Optional[Dict[str, Any]]:
+    conf = get_rest_config()
+    if conf is None:
+        return None
+    rest, key = conf
+    quoted = form.replace("\\", "\\\\").replace('"', '\\"')
+    try:
+        r = get_rest_session().get(
+            f"{rest}/verb_inflections",
+            headers=_rest_headers(key),
+            params={"forms": f'cs.{{"{quoted}"}}', "select": "lemma,verbs", "limit": "1"},
+            timeout=10,
+        )
+        if r.status_code != 200:
+            return None
+        rows = r.json() or []
+        return rows[0] if rows else None
+    except Exception:
+        return None
+
+
+def upsert_verb_inflections(lemma: str, verbs: List[Dict[str, Any]], forms: List[str]) -> None:
+    conf = get_rest_config()
+    if conf is None:
+        return
+    rest, key = conf
+    headers = _rest_headers(key)
+    headers["Prefer"] = "resolution=merge-duplicates,return=minimal"
+    try:
+        r = get_rest_session().post(
+            f"{rest}/verb_inflections",
+            headers=headers,
+            params={"on_conflict": "lemma"},
+            json={"lemma": lemma, "verbs": verbs, "forms": forms},
+            timeout=10,
+        )
+        if r.status_code not in (200, 201, 204):
+            try:
+                print("HTTP_VERBS_UPSERT_STATUS", r.status_code, r.text[:120])
+            except Exception:
+                pass
+    except Exception as e:
+        try:
+            print("HTTP_VERBS_UPSERT_EXCEPTION", str(e))
+        except Exception:
+            pass
@@ -1,5 +1,7 @@
-import requests
-from typing import Optional, Dict, Any
+import base64
+import json
+from typing import Optional, Dict, Any, Tuple
+from .db import get_async_rest_client, get_rest_session
 from .utils_cfg import get_cfg
 
 def _rest_base() -> Optional[str]:
@@ -29,14 +31,14 @@ def upsert_user(email: str, password_hash: Optional[str], name: Optional[str], p
         "avatar_url": avatar_url or "",
         "email_verified": email_verified,
     }
-    r = requests.post(base + "/users", headers=_headers(), params={"on_conflict": "email"}, json=payload, timeout=10)
+    r = get_rest_session().post(base + "/users", headers=_headers(), params={"on_conflict": "email"}, json=payload, timeout=10)
     return r.status_code in (200, 201, 204)
 
 def get_user_by_email(email: str) -> Optional[Dict[str, Any]]:
     base = _rest_base()
     if not base:
         return None
-    r = requests.get(base + "/users", headers=_headers(), params={"email": f"eq.{email}", "select": "id,email,password_hash,provider,name,avatar_url,email_verified"}, timeout=10)
+    r = get_rest_session().get(base + "/users", headers=_headers(), params={"email": f"eq.{email}", "select": "id,email,password_hash,provider,name,avatar_url,email_verified"}, timeout=10)
     if r.status_code != 200:
         return None
     rows = r.json()
@@ -49,7 +51,7 @@ def insert_code(email: str, code: str, expires_at: str) -> bool:
     if not base:
         return False
     payload = {"email": email, "code": code, "expires_at": expires_at, "used": False}
-    r = requests.post(base + "/email_verification_codes", headers=_headers(), json=payload, timeout=10)
+    r = get_rest_session().post(base + "/email_verification_codes", headers=_headers(), json=payload, timeout=10)
     return r.status_code in (200, 201)
 
 def verify_code(email: str, code: str) -> bool:
@@ -57,7 +59,7 @@ def verify_code(email: str, code: str) -> bool:
     if not base:
         return False
     params = {"email": f"eq.{email}", "code": f"eq.{code}", "used": "eq.false"}
-    r = requests.get(base + "/email_verification_codes", headers=_headers(), params=params, timeout=10)
+    r = get_rest_session().get(base + "/email_verification_codes", headers=_headers(), params=params, timeout=10)
     if r.status_code != 200:
         return False
     rows = r.json()
@@ -67,7 +69,7 @@ def verify_code(email: str, code: str) -> bool:
     rid = item.get("id")
     if not rid:
         return False
-    ru = requests.patch(base + "/email_verification_codes", headers=_headers(), params={"id": f"eq.{rid}"}, json={"used": True}, timeout=10)
+    ru = get_rest_session().patch(base + "/email_verification_codes", headers=_headers(), params={"id": f"eq.{rid}"}, json={"used": True}, timeout=10)
     return ru.status_code in (200, 204)
 
 def insert_auth_event(email: str, event_type: str, success: bool, provider: str | None = None, detail: str | None = None, ip: str | None = None, user_agent: str | None = None) -> bool:
@@ -85,7 +87,7 @@ def insert_auth_event(email: str, event_type: str, success: bool, provider: str
     }
     try:
         print("AUTH_EVENT_REQ", {"payload": payload})
-        r = requests.post(base + "/auth_events", headers=_headers(), json=payload, timeout=10)
+        r = get_rest_session().post(base + "/auth_events", headers=_headers(), json=payload, timeout=10)
         ok = r.status_code in (200, 201)
         if not ok:
             try:
@@ -100,11 +102,8 @@ def insert_auth_event(email: str, event_type: str, success: bool, provider: str
             pass
         return False
 
-def insert_page_visit(path: str, method: str, email: str | None = None, user_id: str | None = None, provider: str | None = None, ip: str | None = None, user_agent: str | None = None, action_type: str | None = None, action_content: str | None = None) -> bool:
-    base = _rest_base()
-    if not base:
-        return False
-    payload = {
+def _page_visit_payload(path: str, method: str, email: str | None = None, user_id: str | None = None, provider: str | None = None, ip: str | None = None, user_agent: str | None = None, action_type: str | None = None, action_content: str | None = None) -> Dict[str, Any]:
+    payload: Dict[str, Any] = {
         "path": path,
         "method": method,
         "email": email or "",
@@ -118,9 +117,38 @@ def insert_page_visit(path: str, method: str, email: str | None = None, user_id:
         payload["action_type"] = action_type
     if action_content is not None:
         payload["action_content"] = action_content
+    return payload
+
+def insert_page_visit(path: str, method: str, email: str | None = None, user_id: str | None = None, provider: str | None = None, ip: str | None = None, user_agent: str | None = None, action_type: str | None = None, action_content: str | None = None) -> bool:
+    base = _rest_base()
+    if not base:
+        return False
+    payload = _page_visit_payload(path, method, email, user_id, provider, ip, user_agent, action_type, action_content)
+    try:
+        print("PAGE_VISIT_REQ", {"payload": payload})
+        r = get_rest_session().post(base + "/page_visits", headers=_headers(), json=payload, timeout=10)
+        ok = r.status_code in (200, 201)
+        if not ok:
+            try:
+                print("PAGE_VISIT_RESP", {"status": r.status_code, "text": r.text})
+            except Exception:
+                pass
+        return ok
+    except Exception as e:
+        try:
+            print("PAGE_VISIT_ERR", {"error": str(e)})
+        except Exception:
+            pass
+        return False
+
+async def insert_page_visit_async(path: str, method: str, email: str | None = None, user_id: str | None = None, provider: str | None = None, ip: str | None = None, user_agent: str | None = None, action_type: str | None = None, action_content: str | None = None) -> bool:
+    base = _rest_base()
+    if not base:
+        return False
+    payload = _page_visit_payload(path, method, email, user_id, provider, ip, user_agent, action_type, action_content)
     try:
         print("PAGE_VISIT_REQ", {"payload": payload})
-        r = requests.post(base + "/page_visits", headers=_headers(), json=payload, timeout=10)
+        r = await get_async_rest_client().post(base + "/page_visits", headers=_headers(), json=payload)
         ok = r.status_code in (200, 201)
         if not ok:
             try:
@@ -147,7 +175,7 @@ def add_favorite(user_id: str, email: str, provider: str, language: str, word: s
         return False
     payload = {"user_id": user_id, "email": email, "provider": provider, "language": language, "word": word}
     try:
-        r = requests.post(base + "/favorites", headers=_headers(), params={"on_conflict": "user_id,language,word"}, json=payload, timeout=10)
+        r = get_rest_session().post(base + "/favorites", headers=_headers(), params={"on_conflict": "user_id,language,word"}, json=payload, timeout=10)
         return r.status_code in (200, 201, 204)
     except Exception:
         return False
@@ -157,7 +185,7 @@ def remove_favorite(user_id: str, language: str, word: str) -> bool:
     if not base:
         return False
     try:
-        r = requests.delete(base + "/favorites", headers=_headers(), params={"user_id": f"eq.{user_id}", "language": f"eq.{language}", "word": f"eq.{word}"}, timeout=10)
+        r = get_rest_session().delete(base + "/favorites", headers=_headers(), params={"user_id": f"eq.{user_id}", "language": f"eq.{language}", "word": f"eq.{word}"}, timeout=10)
         return r.status_code in (200, 204)
     except Exception:
         return False
@@ -167,7 +195,7 @@ def check_favorite(user_id: str, language: str, word: str) -> bool:
     if not base:
         return False
     try:
-        r = requests.get(base + "/favorites", headers=_headers(), params={"user_id": f"eq.{user_id}", "language": f"eq.{language}", "word": f"eq.{word}", "select": "id"}, timeout=10)
+        r = get_rest_session().get(base + "/favorites", headers=_headers(), params={"user_id": f"eq.{user_id}", "language": f"eq.{language}", "word": f"eq.{word}", "select": "id"}, timeout=10)
         if r.status_code != 200:
             return False
         rows = r.json() or []
@@ -175,12 +203,69 @@ def check_favorite(user_id: str, language: str, word: str) -> bool:
     except Exception:
         return False
 
+def encode_favorites_cursor(row: Dict[str, Any]) -> str:
+    raw = json.dumps([row.get("created_at"), row.get("id")], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_favorites_cursor(cursor: str) -> Tuple[str, int]:
+    """Inverse of encode_favorites_cursor; raises ValueError on a malformed cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw.decode("utf-8"))
+    except Exception:
+        raise ValueError("invalid cursor")
+    if not isinstance(created_at, str) or not isinstance(row_id, int) or '"' in created_at:
+        raise ValueError("invalid cursor")
+    return created_at, row_id
+
+
+async def list_favorites_page_async(user_id: str, limit: int, cursor: str | None = None) -> Tuple[list[Dict[str, Any]], Optional[str]]:
+    """One page of a user's favorites in (created_at, id) order, plus the cursor of the next page.
+
+    Keyset pagination: the cursor holds the last row's (created_at, id), so a page
+    costs the same however deep it is and rows sharing a timestamp are not skipped.
+    """
+    base = _rest_base()
+    if not base:
+        return [], None
+    params = {
+        "user_id": f"eq.{user_id}",
+        "select": "id,language,word,created_at",
+        "order": "created_at.asc,id.asc",
+        # one extra row tells whether there is a next page
+        "limit": str(limit + 1),
+    }
+    if cursor:
+        since, last_id = decode_favorites_cursor(cursor)
+        params["or"] = f'(created_at.gt."{since}",and(created_at.eq."{since}",id.gt.{last_id}))'
+    try:
+        r = await get_async_rest_client().get(base + "/favorites", headers=_headers(), params=params)
+        if r.status_code != 200:
+            try:
+                print("FAVORITES_PAGE_STATUS", r.status_code, r.text[:120])
+            except Exception:
+                pass
+            return [], None
+        rows = r.json() or []
+    except Exception as e:
+        try:
+            print("FAVORITES_PAGE_EXCEPTION", str(e))
+        except Exception:
+            pass
+        return [], None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, encode_favorites_cursor(rows[-1])
+    return rows, None
+
+
 def list_favorites(user_id: str) -> list[Dict[str, Any]]:
     base = _rest_base()
     if not base:
         return []
     try:
-        r = requests.get(base + "/favorites", headers=_headers(), params={"user_id": f"eq.{user_id}", "order": "created_at.asc"}, timeout=10)
+        r = get_rest_session().get(base + "/favorites", headers=_headers(), params={"user_id": f"eq.{user_id}", "order": "created_at.asc"}, timeout=10)
         if r.status_code != 200:
             return []
         return r.json() or []
@@ -205,7 +290,7 @@ def list_favorites(user_id: str) -> list[Dict[str, Any]]:
         payload["meta"] = meta
     try:
         print("USER_ACTION_REQ", {"payload": payload})
-        r = requests.post(base + "/user_actions", headers=_headers(), json=payload, timeout=10)
+        r = get_rest_session().post(base + "/user_actions", headers=_headers(), json=payload, timeout=10)
         ok = r.status_code in (200, 201)
         if not ok:
             try:
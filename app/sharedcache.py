@@ -0,0 +1,128 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, Optional
+
+from .utils_cfg import get_cfg, get_cfg_int
+
+
+class SharedCache:
+    """Host-wide TTL cache in a WAL-mode SQLite file, shared by every worker.
+
+    Sits behind the in-process TTLCache: workers on the same host see each
+    other's parsed entries and a restarted worker starts warm. Values are stored
+    as zlib-compressed compact JSON. Expiry uses wall-clock time since the file
+    outlives processes; expired rows are ignored on read and deleted every
+    ``purge_every`` writes.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float = 1800, purge_every: int = 500):
+        self.path = path
+        self.ttl = ttl_seconds
+        self.purge_every = purge_every
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        parent = os.path.dirname(os.path.abspath(path))
+        os.makedirs(parent, exist_ok=True)
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, expires_at REAL NOT NULL, value BLOB NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS cache_expires_at ON cache (expires_at)")
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared between threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _encode(value: Any) -> bytes:
+        return zlib.compress(json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), 6)
+
+    @staticmethod
+    def _decode(blob: bytes) -> Any:
+        return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+    def get(self, key: str) -> Any:
+        try:
+            row = self._conn().execute(
+                "SELECT value FROM cache WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+            value = self._decode(row[0]) if row else None
+        except (sqlite3.Error, zlib.error, ValueError) as e:
+            self.errors += 1
+            try:
+                print("SHARED_CACHE_GET_FAIL", key, str(e))
+            except Exception:
+                pass
+            return None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        try:
+            self._conn().execute(
+                "INSERT OR REPLACE INTO cache (key, expires_at, value) VALUES (?, ?, ?)",
+                (key, time.time() + self.ttl, sqlite3.Binary(self._encode(value))),
+            )
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            self.errors += 1
+            try:
+                print("SHARED_CACHE_SET_FAIL", key, str(e))
+            except Exception:
+                pass
+            return
+        with self._lock:
+            self._writes += 1
+            purge = self._writes % self.purge_every == 0
+        if purge:
+            self.purge()
+
+    def purge(self) -> int:
+        try:
+            return self._conn().execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),)).rowcount
+        except sqlite3.Error:
+            return 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "path": self.path,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "writes": self._writes,
+                "errors": self.errors,
+            }
+
+
+def shared_cache_from_config(ttl_seconds: float = 1800) -> Optional[SharedCache]:
+    path = get_cfg("CAMBRIDGE_SHARED_CACHE")
+    if not path:
+        return None
+    try:
+        return SharedCache(path, ttl_seconds=get_cfg_int("CAMBRIDGE_SHARED_CACHE_TTL", int(ttl_seconds)))
+    except (OSError, sqlite3.Error) as e:
+        try:
+            print("SHARED_CACHE_INIT_FAIL", path, str(e))
+        except Exception:
+            pass
+        return None
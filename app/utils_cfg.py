@@ -13,3 +13,14 @@ def get_cfg(*keys: str) -> str:
             return v
     return ""
 
+def get_cfg_int(key: str, default: int) -> int:
+    try:
+        return int(get_cfg(key) or default)
+    except ValueError:
+        return default
+
+def get_cfg_float(key: str, default: float) -> float:
+    try:
+        return float(get_cfg(key) or default)
+    except ValueError:
+        return default
@@ -0,0 +1,96 @@
+import re
+from typing import Any, Dict, List, Optional
+
+from .cache import TTLCache
+from .repo import get_lemma_for_form, get_verb_inflections, upsert_verb_inflections
+from .utils_cfg import get_cfg_int
+
+
+_FORM_SPLIT_RE = re.compile(r"\s*(?:,|/|;|\bor\b)\s*")
+
+
+def inflected_forms(lemma: str, verbs: List[Dict[str, Any]]) -> List[str]:
+    forms: List[str] = []
+    for v in [{"text": lemma}] + list(verbs):
+        for part in _FORM_SPLIT_RE.split(v.get("text") or ""):
+            part = part.strip().lower()
+            if part and part not in forms:
+                forms.append(part)
+    return forms
+
+
+class VerbStore:
+    """Language-independent lemma -> inflections store.
+
+    Inflections come from Simple Wiktionary and do not depend on the Cambridge
+    language slug, so one copy per lemma serves en, uk, en-cn, ... Lookups go
+    to the in-memory index first and then the ``verb_inflections`` table
+    (``lemma`` primary key, ``verbs`` jsonb, ``forms`` text[]). Writes go to
+    both. The index also maps every inflected form back to its lemma.
+
+    The index is a bounded LRU (VERB_STORE_MAX_LEMMAS lemmas, default 10000,
+    and eight forms per lemma); evicted lemmas are read back from the table.
+    """
+
+    FORMS_PER_LEMMA = 8
+
+    def __init__(self, persist: bool = True, max_lemmas: Optional[int] = None, ttl_seconds: float = 24 * 3600):
+        self.persist = persist
+        max_lemmas = max_lemmas or get_cfg_int("VERB_STORE_MAX_LEMMAS", 10000)
+        self._by_lemma = TTLCache(maxsize=max_lemmas, ttl_seconds=ttl_seconds)
+        self._by_form = TTLCache(maxsize=max_lemmas * self.FORMS_PER_LEMMA, ttl_seconds=ttl_seconds)
+
+    def _index(self, lemma: str, verbs: List[Dict[str, Any]]) -> None:
+        self._by_lemma.set(lemma, verbs)
+        for form in inflected_forms(lemma, verbs):
+            # a form shared by two lemmas keeps the first one indexed
+            if self._by_form.get(form, record=False) is None:
+                self._by_form.set(form, lemma)
+
+    def get(self, lemma: str) -> Optional[List[Dict[str, Any]]]:
+        lemma = lemma.strip().lower()
+        verbs = self._by_lemma.get(lemma)
+        if verbs is not None:
+            return verbs
+        if not self.persist:
+            return None
+        verbs = get_verb_inflections(lemma)
+        if verbs:
+            self._index(lemma, verbs)
+            return verbs
+        return None
+
+    def put(self, lemma: str, verbs: List[Dict[str, Any]]) -> None:
+        # an empty table is as likely a failed fetch as a lemma without forms
+        if not verbs:
+            return
+        lemma = lemma.strip().lower()
+        self._index(lemma, verbs)
+        if self.persist:
+            upsert_verb_inflections(lemma, verbs, inflected_forms(lemma, verbs))
+
+    def lemma_for(self, form: str) -> Optional[Dict[str, Any]]:
+        """Resolve an inflected form ("ran") to {"lemma": "run", "verbs": [...]}."""
+        form = form.strip().lower()
+        verbs = self._by_lemma.get(form)
+        if verbs is not None:
+            return {"lemma": form, "verbs": verbs}
+        lemma = self._by_form.get(form)
+        verbs = self._by_lemma.get(lemma, record=False) if lemma else None
+        if lemma and verbs is not None:
+            return {"lemma": lemma, "verbs": verbs}
+        if not self.persist:
+            return None
+        row = get_lemma_for_form(form)
+        if not row or not row.get("lemma"):
+            return None
+        self._index(row["lemma"], row.get("verbs") or [])
+        return {"lemma": row["lemma"], "verbs": row.get("verbs") or []}
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "lemmas": len(self._by_lemma),
+            "forms": len(self._by_form),
+            "max_lemmas": self._by_lemma.maxsize or 0,
+            "evictions": self._by_lemma.evictions + self._by_form.evictions,
+        }
@@ -0,0 +1,172 @@
+import asyncio
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+Key = Tuple[str, str]
+Item = Tuple[str, str, Dict[str, Any]]
+
+
+class WriteBehind:
+    """Bounded write-behind queue for parsed entries, drained by one asyncio task.
+
+    ``submit`` only records the entry; a later submit for the same
+    (language, entry) replaces the pending one. The worker wakes every
+    ``flush_interval`` seconds, or as soon as a full batch is pending, and hands
+    up to ``max_batch`` entries to ``write_batch`` in one call. ``write_batch``
+    returns True/False for the whole batch, or the list of items that still need
+    a write (empty when all were stored). Failed items are put back at the front
+    of the queue and retried with exponential backoff; an item that fails
+    ``max_attempts`` times is dropped. ``close`` flushes what is left.
+
+    ``submit`` returns False when the queue is full or the worker is not
+    running, and the caller should write inline instead.
+    """
+
+    def __init__(
+        self,
+        write_batch: Callable[[List[Item]], Awaitable[Union[bool, List[Item]]]],
+        max_pending: int = 1000,
+        max_batch: int = 50,
+        flush_interval: float = 0.2,
+        max_attempts: int = 5,
+        backoff: float = 0.5,
+    ):
+        self._write_batch = write_batch
+        self.max_pending = max_pending
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self._pending: "OrderedDict[Key, Dict[str, Any]]" = OrderedDict()
+        self._attempts: Dict[Key, int] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: "Optional[asyncio.Task[None]]" = None
+        self._closing = False
+        self.queued = 0
+        self.merged = 0
+        self.rejected = 0
+        self.written = 0
+        self.batches = 0
+        self.retries = 0
+        self.dropped = 0
+
+    def start(self) -> None:
+        if self._task is None:
+            self._closing = False
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.ensure_future(self._run())
+
+    def submit(self, language: str, entry: str, data: Dict[str, Any]) -> bool:
+        if self._task is None or self._task.done() or self._closing:
+            return False
+        key = (language, entry)
+        if key in self._pending:
+            self._pending[key] = data
+            self._attempts.pop(key, None)
+            self.merged += 1
+            return True
+        if len(self._pending) >= self.max_pending:
+            self.rejected += 1
+            return False
+        self._pending[key] = data
+        self.queued += 1
+        if len(self._pending) >= self.max_batch and self._wakeup is not None:
+            self._wakeup.set()
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            delay = await self._drain()
+            if self._closing and not self._pending:
+                return
+            if delay:
+                await asyncio.sleep(delay)
+
+    async def _drain(self) -> Optional[float]:
+        """Write pending batches; returns a backoff delay after a failure, else None."""
+        while self._pending:
+            batch: List[Item] = []
+            while self._pending and len(batch) < self.max_batch:
+                (language, entry), data = self._pending.popitem(last=False)
+                batch.append((language, entry, data))
+            try:
+                result = await self._write_batch(batch)
+            except Exception as e:
+                try:
+                    print("WRITE_BEHIND_BATCH_ERROR", str(e))
+                except Exception:
+                    pass
+                result = False
+            if isinstance(result, list):
+                failed = result
+            else:
+                failed = [] if result else batch
+            failed_keys = {(language, entry) for language, entry, _ in failed}
+            for language, entry, _ in batch:
+                if (language, entry) not in failed_keys:
+                    self._attempts.pop((language, entry), None)
+                    self.written += 1
+            if not failed:
+                self.batches += 1
+                continue
+            return self._requeue(failed)
+        return None
+
+    def _requeue(self, batch: List[Item]) -> float:
+        attempt = 0
+        for language, entry, data in reversed(batch):
+            key = (language, entry)
+            if key in self._pending:
+                # re-submitted while the batch was in flight; the newer data wins
+                continue
+            tries = self._attempts.get(key, 0) + 1
+            if tries >= self.max_attempts:
+                self._attempts.pop(key, None)
+                self.dropped += 1
+                try:
+                    print("WRITE_BEHIND_DROP", language, entry)
+                except Exception:
+                    pass
+                continue
+            self._attempts[key] = tries
+            self._pending[key] = data
+            self._pending.move_to_end(key, last=False)
+            attempt = max(attempt, tries)
+        self.retries += 1
+        if self._closing:
+            return min(self.backoff, 1.0)
+        return min(self.backoff * (2 ** max(0, attempt - 1)), 30.0)
+
+    async def close(self, timeout: float = 10.0) -> None:
+        """Stop accepting entries and flush the queue, giving up after ``timeout`` seconds."""
+        if self._task is None:
+            return
+        self._closing = True
+        self._wakeup.set()
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), timeout)
+        except asyncio.TimeoutError:
+            self._task.cancel()
+            self.dropped += len(self._pending)
+            try:
+                print("WRITE_BEHIND_FLUSH_TIMEOUT", len(self._pending))
+            except Exception:
+                pass
+        self._task = None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "pending": len(self._pending),
+            "queued": self.queued,
+            "merged": self.merged,
+            "rejected": self.rejected,
+            "written": self.written,
+            "batches": self.batches,
+            "retries": self.retries,
+            "dropped": self.dropped,
+        }
@@ -0,0 +1,179 @@
+import json
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set
+
+import httpx
+import pytest
+
+from app import repo, repo_auth, replica
+
+ENTRY_COLUMNS = {
+    "id", "language_slug", "source_language", "target_language", "entry", "word",
+    "pos", "pronunciation", "verbs",
+}
+SENSE_COLUMNS = {"id", "entry_id", "pos", "source", "original_content", "translated_result", "level", "examples"}
+FAVORITE_COLUMNS = {"id", "user_id", "language", "word", "created_at"}
+
+
+def _error(code: str, message: str) -> httpx.Response:
+    return httpx.Response(400, json={"code": code, "message": message, "details": None, "hint": None})
+
+
+class FakePostgrest:
+    """Just enough of PostgREST over dictionary_entries/dictionary_senses/favorites for the repo code.
+
+    ``columns`` is the dictionary_entries schema; ``updated_at`` is stamped by the
+    "database" from ``clock`` like the column default plus trigger in the README.
+    ``reject(table, row)`` returning True makes any write containing that row fail
+    like a check constraint would.
+    """
+
+    def __init__(self, columns: Optional[Set[str]] = None, embed: bool = True):
+        self.columns = set(ENTRY_COLUMNS if columns is None else columns)
+        self.embed = embed
+        self.entries: List[Dict[str, Any]] = []
+        self.senses: List[Dict[str, Any]] = []
+        self.favorites: List[Dict[str, Any]] = []
+        self.requests: List[httpx.Request] = []
+        self.clock = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        self.fail_next: List[httpx.Response] = []
+        self.reject = lambda table, row: False
+
+    def tick(self, seconds: float = 1.0) -> None:
+        self.clock += timedelta(seconds=seconds)
+
+    # --- request handling -------------------------------------------------------
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if self.fail_next:
+            return self.fail_next.pop(0)
+        table = request.url.path.rsplit("/", 1)[-1]
+        params = dict(request.url.params)
+        if request.method == "POST":
+            rows = json.loads(request.content)
+            rows = rows if isinstance(rows, list) else [rows]
+            return self._upsert(table, rows, params, request.headers.get("prefer", ""))
+        return self._select(table, params)
+
+    def _upsert(self, table: str, rows: List[Dict[str, Any]], params: Dict[str, str], prefer: str) -> httpx.Response:
+        store, columns = self._table(table)
+        for row in rows:
+            for col in row:
+                if col not in columns:
+                    return _error("PGRST204", f"Could not find the '{col}' column of '{table}' in the schema cache")
+        keys = params.get("on_conflict", "").split(",")
+        if len({tuple(str(row.get(k)) for k in keys) for row in rows}) < len(rows):
+            return _error("21000", "ON CONFLICT DO UPDATE command cannot affect row a second time")
+        if any(self.reject(table, row) for row in rows):
+            return _error("23514", f"new row for relation \"{table}\" violates check constraint")
+        out = []
+        for row in rows:
+            current = next((r for r in store if all(r.get(k) == row.get(k) for k in keys)), None)
+            if current is None:
+                current = {"id": len(store) + 1}
+                store.append(current)
+            current.update(row)
+            if table == "dictionary_entries" and "updated_at" in self.columns:
+                current["updated_at"] = self.clock.isoformat()
+            out.append(current)
+        if "return=representation" in prefer:
+            return httpx.Response(201, json=[self._project(r, params.get("select", "*"), table) for r in out])
+        return httpx.Response(201)
+
+    def _select(self, table: str, params: Dict[str, str]) -> httpx.Response:
+        store, columns = self._table(table)
+        select = params.get("select", "*")
+        for col in self._plain_columns(select):
+            if col not in columns:
+                return _error("42703", f"column {table}.{col} does not exist")
+        if "dictionary_senses(" in select and not self.embed:
+            return _error("PGRST200", "Could not find a relationship between 'dictionary_entries' and 'dictionary_senses'")
+        rows = [r for r in store if self._matches(r, params)]
+        order = params.get("order")
+        if order:
+            fields = [part.split(".")[0] for part in order.split(",")]
+            rows.sort(key=lambda r: tuple(str(r.get(f) or "") if f != "id" else r.get(f) for f in fields))
+        if "limit" in params:
+            rows = rows[: int(params["limit"])]
+        return httpx.Response(200, json=[self._project(r, select, table) for r in rows])
+
+    def _table(self, table: str):
+        if table == "dictionary_entries":
+            return self.entries, self.columns
+        if table == "favorites":
+            return self.favorites, FAVORITE_COLUMNS
+        return self.senses, SENSE_COLUMNS
+
+    @staticmethod
+    def _plain_columns(select: str) -> List[str]:
+        select = re.sub(r"\w+\([^)]*\)", "", select)
+        return [c for c in (part.strip() for part in select.split(",")) if c and c != "*"]
+
+    def _project(self, row: Dict[str, Any], select: str, table: str) -> Dict[str, Any]:
+        if select == "*":
+            return dict(row)
+        out = {c: row.get(c) for c in self._plain_columns(select)}
+        if table == "dictionary_entries" and "dictionary_senses(" in select:
+            out["dictionary_senses"] = [s for s in self.senses if s.get("entry_id") == row["id"]]
+        return out
+
+    def _matches(self, row: Dict[str, Any], params: Dict[str, str]) -> bool:
+        for key, cond in params.items():
+            if key in ("select", "order", "limit", "on_conflict") or "." in key:
+                continue
+            if key == "or":
+                if not self._keyset(row, cond):
+                    return False
+                continue
+            value = row.get(key)
+            if cond.startswith("eq."):
+                if str(value) != cond[3:]:
+                    return False
+            elif cond.startswith("in.("):
+                wanted = [v.strip('"') for v in re.findall(r'"(?:[^"\\]|\\.)*"|[^,()]+', cond[4:-1])]
+                if str(value) not in wanted:
+                    return False
+            elif cond == "not.is.null":
+                if value is None:
+                    return False
+        return True
+
+    @staticmethod
+    def _keyset(row: Dict[str, Any], cond: str) -> bool:
+        m = re.match(r'\((\w+)\.gt\."([^"]*)",and\(\1\.eq\."\2",id\.gt\.(\d+)\)\)', cond)
+        assert m, cond
+        col, since, last_id = m.group(1), m.group(2), int(m.group(3))
+        value = str(row.get(col) or "")
+        return value > since or (value == since and row["id"] > last_id)
+
+
+@pytest.fixture
+def postgrest(monkeypatch):
+    fake = FakePostgrest()
+    async_client = httpx.AsyncClient(transport=httpx.MockTransport(fake.handler))
+    sync_client = httpx.Client(transport=httpx.MockTransport(fake.handler))
+    conf = ("http://supabase.test/rest/v1", "key")
+    monkeypatch.setattr(repo, "get_rest_config", lambda: conf)
+    monkeypatch.setattr(repo, "get_async_rest_client", lambda: async_client)
+    monkeypatch.setattr(repo, "get_rest_session", lambda: sync_client)
+    monkeypatch.setattr(repo, "get_supabase_client", lambda: None)
+    monkeypatch.setattr(replica, "get_rest_config", lambda: conf)
+    monkeypatch.setattr(replica, "get_rest_session", lambda: sync_client)
+    monkeypatch.setattr(repo, "_read_select", 0)
+    monkeypatch.setattr(repo_auth, "_rest_base", lambda: conf[0])
+    monkeypatch.setattr(repo_auth, "get_async_rest_client", lambda: async_client)
+    return fake
+
+
+def sample_entry(word: str = "run", senses: int = 2) -> Dict[str, Any]:
+    return {
+        "word": word,
+        "pos": ["verb"],
+        "pronunciation": [],
+        "definition": [
+            {"id": i, "pos": "verb", "source": "", "text": f"{word} sense {i}", "translation": "", "level": "A1", "example": []}
+            for i in range(senses)
+        ],
+        "verbs": [],
+    }
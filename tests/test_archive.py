@@ -0,0 +1,54 @@
+import os
+
+from app import persist
+from app.archive import HtmlArchive, reparse
+from app.cambridge import PARSER_VERSION
+from app.replica import EntryReplica
+
+PAGE = os.path.join(os.path.dirname(__file__), "fixtures", "parity", "en_run.html")
+URL = "https://dictionary.cambridge.org/us/dictionary/english/run"
+
+
+def _lines(archive, name):
+    with open(os.path.join(archive.root, name), encoding="utf-8") as f:
+        return len(f.readlines())
+
+
+def test_logs_only_grow_on_change(tmp_path):
+    archive = HtmlArchive(str(tmp_path))
+    for _ in range(3):
+        archive.put(URL, "<html>a</html>")
+        archive.record_entry("en", "run", 1)
+    archive.put(URL, "<html>b</html>")
+    archive.record_entry("en", "run", 2)
+    assert _lines(archive, "urls.jsonl") == 2
+    assert _lines(archive, "entries.jsonl") == 2
+    # a second process reading the same logs
+    again = HtmlArchive(str(tmp_path))
+    again.record_entry("en", "run", 2)
+    assert _lines(again, "entries.jsonl") == 2
+    assert again.get(URL) == "<html>b</html>"
+
+
+def test_reparse_writes_through_replica_and_write_behind(tmp_path, monkeypatch):
+    batches = []
+
+    async def write_batch(items):
+        batches.append([(slug, entry) for slug, entry, _ in items])
+        return True
+
+    monkeypatch.setattr(persist, "upsert_entries_batch_async", write_batch)
+    monkeypatch.setenv("DICTIONARY_REPLICA", str(tmp_path / "replica.db"))
+    archive = HtmlArchive(str(tmp_path / "archive"))
+    with open(PAGE, encoding="utf-8") as f:
+        archive.put(URL, f.read())
+    archive.record_entry("en", "run", PARSER_VERSION - 1)
+
+    stats = reparse(archive.root, workers=1)
+
+    assert stats["parsed"] == 1 and stats["failed"] == 0 and stats["dropped"] == 0
+    assert batches == [[("en", "run")]]
+    data, _ = EntryReplica(str(tmp_path / "replica.db")).get("en", "run")
+    assert data["word"] == "run"
+    assert HtmlArchive(archive.root).entries()[("en", "run")]["parser_version"] == PARSER_VERSION
+    assert reparse(archive.root, workers=1)["pending"] == 0
@@ -0,0 +1,88 @@
+import asyncio
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+
+RUN_PAGE = (Path(__file__).parent / "fixtures" / "parity" / "en_run.html").read_text(encoding="utf-8")
+
+
+def _lines(response):
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    def install(handler):
+        monkeypatch.setattr(main.client, "_http", httpx.AsyncClient(transport=httpx.MockTransport(handler), follow_redirects=True))
+
+    return install
+
+
+def test_bad_requests_are_400(monkeypatch):
+    http = TestClient(main.app)
+    assert http.post("/api/dictionary/batch?verbs=some", json={"items": [["en", "run"]]}).status_code == 400
+    assert http.post("/api/dictionary/batch", content=b"{not json").status_code == 400
+    assert http.post("/api/dictionary/batch", json={"items": []}).status_code == 400
+    assert http.post("/api/dictionary/batch", json={"items": [["en"]]}).status_code == 400
+    assert http.post("/api/dictionary/batch", json={"items": [{"language": "en", "entry": " "}]}).status_code == 400
+    monkeypatch.setattr(main, "batch_max_items", 1)
+    assert http.post("/api/dictionary/batch", json=[["en", "a"], ["en", "b"]]).status_code == 400
+
+
+def test_one_line_per_pair_with_its_status(upstream):
+    cached = {"word": "batchcached", "pos": ["noun"], "definition": [{"text": "x"}], "verbs": []}
+    body = json.dumps(cached, separators=(",", ":")).encode("utf-8")
+    main.responses.set(main._response_key("en", "lazy", "batchcached"), ('"etag"', body))
+    main.negative.add("en", "batchgone")
+
+    def handler(request):
+        path = request.url.path
+        if path.endswith("/batchrun"):
+            return httpx.Response(200, text=RUN_PAGE)
+        if path.endswith("/batchbroken"):
+            return httpx.Response(503)
+        return httpx.Response(404)
+
+    upstream(handler)
+    items = [["en", "BatchCached"], ["en", "batchgone"], ["xx", "word"], ["en", "batchrun"],
+             ["en", "batchbroken"], ["en", "batchmissing"], ["en", "batchcached"]]
+    r = TestClient(main.app).post("/api/dictionary/batch", json={"items": items})
+    assert r.status_code == 200
+    lines = {(line["language"], line["entry"]): line for line in _lines(r)}
+    assert len(lines) == 6  # duplicates after normalisation are answered once
+    assert lines[("en", "batchcached")]["data"] == cached
+    assert lines[("en", "batchgone")]["status"] == 404
+    assert lines[("xx", "word")]["status"] == 400
+    assert lines[("en", "batchrun")]["status"] == 200
+    assert lines[("en", "batchrun")]["data"]["word"] == "run"
+    assert lines[("en", "batchbroken")]["status"] == 502
+    assert lines[("en", "batchmissing")]["status"] == 404
+    # a confirmed miss is negative-cached, an upstream failure is not
+    assert main.negative.contains("en", "batchmissing")
+    assert not main.negative.contains("en", "batchbroken")
+
+
+def test_upstream_fetches_are_bounded(monkeypatch):
+    active = {"now": 0, "max": 0}
+
+    async def fetch_and_store(language, norm_entry, verbs):
+        active["now"] += 1
+        active["max"] = max(active["max"], active["now"])
+        await asyncio.sleep(0.02)
+        active["now"] -= 1
+        return {"word": norm_entry, "definition": [{"text": norm_entry}], "verbs": []}
+
+    monkeypatch.setattr(main, "_fetch_and_store", fetch_and_store)
+    monkeypatch.setattr(main, "batch_concurrency", 2)
+    items = [["en", f"bounded{i}"] for i in range(6)]
+    r = TestClient(main.app).post("/api/dictionary/batch?verbs=none", json={"items": items})
+    lines = _lines(r)
+    assert sorted(line["entry"] for line in lines) == sorted(entry for _, entry in items)
+    assert all(line["status"] == 200 and line["data"]["verbs"] == [] for line in lines)
+    assert active["max"] == 2
@@ -0,0 +1,148 @@
+import gc
+import os
+
+import httpx
+from fastapi.testclient import TestClient
+
+from app import cache as cache_module
+from app import main
+from app.cache import FrequencySketch, TTLCache
+
+PAGE = os.path.join(os.path.dirname(__file__), "fixtures", "parity", "en_run.html")
+
+
+def test_byte_budget_evicts_least_recently_used():
+    cache = TTLCache(maxsize=None, ttl_seconds=60, max_bytes=30, sizeof=len)
+    cache.set("a", "x" * 10)
+    cache.set("b", "x" * 10)
+    cache.set("c", "x" * 10)
+    assert cache.get("a") is not None
+    cache.set("d", "x" * 10)
+    assert cache.get("b") is None
+    assert cache.bytes == 30
+    assert cache.stats()["evictions"] == 1
+
+
+def test_value_larger_than_budget_is_not_stored():
+    cache = TTLCache(maxsize=None, ttl_seconds=60, max_bytes=30, sizeof=len)
+    cache.set("a", "x" * 10)
+    cache.set("big", "x" * 31)
+    assert cache.get("big") is None
+    assert cache.get("a") is not None
+    assert cache.bytes == 10
+
+
+def test_admission_rejects_one_off_keys():
+    cache = TTLCache(maxsize=2, ttl_seconds=60, admission=FrequencySketch(2))
+    for key in ("hot1", "hot2"):
+        cache.set(key, key)
+        for _ in range(3):
+            cache.get(key)
+    for i in range(20):
+        key = f"scan{i}"
+        if cache.get(key) is None:
+            cache.set(key, key)
+    assert cache.get("hot1") == "hot1"
+    assert cache.get("hot2") == "hot2"
+    assert cache.stats()["admission_rejected"] == 20
+
+
+def test_repeat_lookups_without_record_are_not_counted():
+    sketch = FrequencySketch(10)
+    cache = TTLCache(maxsize=10, ttl_seconds=60, admission=sketch)
+    cache.get("k")
+    cache.get("k", record=False)
+    assert sketch.estimate("k") == 1
+    assert cache.misses == 1
+    cache.note("k")
+    assert sketch.estimate("k") == 2
+
+
+def test_one_request_counts_one_lookup(monkeypatch):
+    with open(PAGE, encoding="utf-8") as f:
+        html = f.read()
+    monkeypatch.setattr(main, "write_behind", False)
+    monkeypatch.setattr(main, "_persist_entry", lambda *a: _done())
+    monkeypatch.setattr(main.client, "_http", httpx.AsyncClient(transport=httpx.MockTransport(lambda r: httpx.Response(200, text=html))))
+    sketch = main.client.entry_cache.admission
+    key = main.client._entry_key("en", "countonce")
+    c = TestClient(main.app)
+    assert c.get("/api/dictionary/en/countonce?verbs=none").status_code == 200
+    assert sketch.estimate(key) == 1
+    # answered from the response cache, still one lookup
+    assert c.get("/api/dictionary/en/countonce?verbs=none").status_code == 200
+    assert sketch.estimate(key) == 2
+
+
+async def _done():
+    return None
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _clocked(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(cache_module.time, "monotonic", clock)
+    return clock
+
+
+def test_sweep_skips_superseded_records(monkeypatch):
+    clock = _clocked(monkeypatch)
+    cache = TTLCache(maxsize=None, ttl_seconds=10)
+    cache.set("a", 1)
+    clock.now += 5
+    cache.set("a", 2)
+    clock.now += 6
+    # the first record of "a" is due, but "a" was set again since
+    assert cache.sweep() == 0
+    assert cache.get("a") == 2
+    clock.now += 5
+    assert cache.sweep() == 1
+    assert len(cache) == 0 and len(cache._expiry) == 0
+
+
+def test_sweep_drains_more_than_one_batch(monkeypatch):
+    clock = _clocked(monkeypatch)
+    cache = TTLCache(maxsize=None, ttl_seconds=10)
+    cache.SWEEP_BATCH = 4
+    for i in range(10):
+        cache.set(str(i), i)
+    clock.now += 5
+    cache.set("live", 1)
+    clock.now += 6
+    assert cache.sweep() == 10
+    assert list(cache._store) == ["live"]
+
+
+def test_expiry_deque_is_compacted(monkeypatch):
+    clock = _clocked(monkeypatch)
+    cache = TTLCache(maxsize=None, ttl_seconds=10)
+    cache.SWEEP_BATCH = 4
+    cache.set("other", 0)
+    for i in range(100):
+        clock.now += 0.01
+        cache.set("k", i)
+        # overwrites leave stale records; the deque never grows past 2x live + one batch
+        assert len(cache._expiry) <= 2 * len(cache) + cache.SWEEP_BATCH + 1
+    assert [key for _, key in cache._expiry][-1] == "k"
+    # "other" is due; every stale record of "k" is skipped and the live one kept
+    clock.now = 1010.5
+    assert cache.sweep() == 1
+    assert cache.get("k") == 99 and cache.get("other") is None
+
+
+def test_sweeper_exits_once_the_cache_is_collected():
+    cache = TTLCache(ttl_seconds=10)
+    cache.start_sweeper(0.01)
+    thread = cache._sweeper
+    assert thread.is_alive()
+    del cache
+    gc.collect()
+    thread.join(2)
+    assert not thread.is_alive()
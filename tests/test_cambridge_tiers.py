@@ -0,0 +1,52 @@
+import asyncio
+import os
+import threading
+
+import httpx
+
+from app.archive import HtmlArchive
+from app.cambridge import AsyncCambridgeClient
+from app.sharedcache import SharedCache
+
+PAGE = os.path.join(os.path.dirname(__file__), "fixtures", "parity", "en_run.html")
+
+
+class _ThreadRecorder:
+    def __init__(self):
+        self.threads = []
+
+    def wrap(self, fn):
+        def inner(*args, **kwargs):
+            self.threads.append(threading.current_thread())
+            return fn(*args, **kwargs)
+        return inner
+
+
+def test_shared_cache_and_archive_io_stays_off_the_loop(tmp_path):
+    recorder = _ThreadRecorder()
+    shared = SharedCache(str(tmp_path / "shared.db"))
+    shared.get = recorder.wrap(shared.get)
+    shared.set = recorder.wrap(shared.set)
+    archive = HtmlArchive(str(tmp_path / "archive"))
+    archive.record_entry = recorder.wrap(archive.record_entry)
+    with open(PAGE, encoding="utf-8") as f:
+        html = f.read()
+
+    async def run():
+        client = AsyncCambridgeClient(shared_cache=shared, archive=archive)
+        client._http = httpx.AsyncClient(transport=httpx.MockTransport(lambda r: httpx.Response(200, text=html)))
+        loop_thread = threading.current_thread()
+        entry = await client.get_entry_async("en", "run", verbs="none")
+        await client.aclose()
+        # a second worker sees the entry through the shared tier
+        other = AsyncCambridgeClient(shared_cache=shared)
+        peeked = await other.peek_entry_async("en", "run", verbs="none")
+        await other.aclose()
+        return loop_thread, entry, peeked
+
+    loop_thread, entry, peeked = asyncio.run(run())
+    assert entry["word"] == "run"
+    assert peeked["word"] == "run"
+    assert recorder.threads
+    assert all(t is not loop_thread for t in recorder.threads)
+    assert len(archive.entries()) == 1
@@ -0,0 +1,61 @@
+import os
+from types import MappingProxyType
+
+import pytest
+
+from app import config
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def secret(tmp_path, monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(config.time, "monotonic", clock)
+    monkeypatch.setenv("CONFIG_RELOAD_INTERVAL", "5")
+    path = tmp_path / ".secret"
+
+    def write(text, mtime):
+        path.write_bytes(text if isinstance(text, bytes) else text.encode("utf-8"))
+        os.utime(path, (mtime, mtime))
+
+    write("A=1\n", 1000)
+    snap = config._Snapshot(str(path))
+    return snap, write, clock
+
+
+def test_snapshot_is_read_only(secret):
+    snap, _, _ = secret
+    data = snap.get()
+    assert isinstance(data, MappingProxyType)
+    assert data["A"] == "1"
+    with pytest.raises(TypeError):
+        data["A"] = "2"
+
+
+def test_edit_is_picked_up_after_the_interval(secret):
+    snap, write, clock = secret
+    first = snap.get()
+    write("A=2\n", 2000)
+    clock.now += 4
+    assert snap.get() is first
+    clock.now += 2
+    assert snap.get()["A"] == "2"
+
+
+def test_malformed_file_keeps_the_last_good_snapshot(secret):
+    snap, write, clock = secret
+    snap.get()
+    write(b"A=\xff\xfe\n", 2000)
+    clock.now += 6
+    assert snap.get()["A"] == "1"
+    # retried, and picked up once the file is fixed
+    write("A=3\n", 3000)
+    clock.now += 6
+    assert snap.get()["A"] == "3"
@@ -0,0 +1,27 @@
+import asyncio
+
+import httpx
+
+from app import db
+
+
+def test_pool_stats_reports_limits_without_private_pool(monkeypatch):
+    monkeypatch.setenv("SUPABASE_ASYNC_POOL_SIZE", "7")
+    client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200)))
+    monkeypatch.setattr(db, "_async_rest_client", client)
+    try:
+        stats = db.pool_stats()["async"]
+    finally:
+        asyncio.run(client.aclose())
+    # MockTransport has no _pool: the live counts are omitted, the limit is still reported
+    assert stats == {"max_connections": 7}
+
+
+def test_pool_stats_reads_live_connections(monkeypatch):
+    client = httpx.AsyncClient()
+    monkeypatch.setattr(db, "_async_rest_client", client)
+    try:
+        stats = db.pool_stats()["async"]
+    finally:
+        asyncio.run(client.aclose())
+    assert stats["connections"] == 0 and stats["idle"] == 0
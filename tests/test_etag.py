@@ -0,0 +1,89 @@
+import asyncio
+import os
+import time
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main, persist
+
+PAGE = os.path.join(os.path.dirname(__file__), "fixtures", "parity", "en_run.html")
+VERBS = [{"id": 0, "type": "Simple past", "text": "ran"}]
+
+
+@pytest.fixture
+def page(monkeypatch):
+    with open(PAGE, encoding="utf-8") as f:
+        html = {"text": f.read()}
+
+    def handler(request):
+        if "wiktionary" in request.url.host:
+            return httpx.Response(404)
+        return httpx.Response(200, text=html["text"])
+
+    async def upsert(language, entry, data):
+        pass
+
+    monkeypatch.setattr(main, "write_behind", False)
+    monkeypatch.setattr(persist, "upsert_entry_with_senses_async", upsert)
+    monkeypatch.setattr(main.client, "_http", httpx.AsyncClient(transport=httpx.MockTransport(handler), follow_redirects=True))
+    return html
+
+
+def test_strong_etag_and_304(page):
+    c = TestClient(main.app)
+    first = c.get("/api/dictionary/en/etagrun")
+    etag = first.headers["ETag"]
+    assert first.status_code == 200
+    assert etag.startswith('"') and etag.endswith('"')
+    for header in (etag, "W/" + etag, '"other", ' + etag, 'W/"other" , W/' + etag, "*"):
+        r = c.get("/api/dictionary/en/etagrun", headers={"If-None-Match": header})
+        assert r.status_code == 304, header
+        assert r.headers["ETag"] == etag and r.content == b""
+    for header in ('"other"', "W/" + etag[1:], "X/" + etag):
+        assert c.get("/api/dictionary/en/etagrun", headers={"If-None-Match": header}).status_code == 200, header
+
+
+def test_each_verbs_mode_is_cached_separately(page):
+    c = TestClient(main.app)
+    lazy = c.get("/api/dictionary/en/etagmodes")
+    none = c.get("/api/dictionary/en/etagmodes?verbs=none")
+    assert lazy.status_code == none.status_code == 200
+    for mode in ("lazy", "none"):
+        assert main.responses.get(main._response_key("en", mode, "etagmodes")) is not None
+    assert main.responses.get(main._response_key("en", "eager", "etagmodes")) is None
+    main._invalidate_responses("en", "etagmodes")
+    for mode in main.VERBS_MODES:
+        assert main.responses.get(main._response_key("en", mode, "etagmodes")) is None
+
+
+def test_refresh_changes_the_etag(page):
+    c = TestClient(main.app)
+    old = c.get("/api/dictionary/en/etagrefresh").headers["ETag"]
+    assert c.get("/api/dictionary/en/etagrefresh", headers={"If-None-Match": old}).status_code == 304
+    page["text"] = page["text"].replace("to be in control of something", "to be in charge of something")
+    assert asyncio.run(main._refresh_entry("en", "etagrefresh")) is not None
+    r = c.get("/api/dictionary/en/etagrefresh", headers={"If-None-Match": old})
+    assert r.status_code == 200
+    assert r.headers["ETag"] != old
+
+
+def test_late_verbs_change_the_etag(page, monkeypatch):
+    async def slow_verbs(entry):
+        await asyncio.sleep(0.2)
+        return VERBS
+
+    monkeypatch.setattr(main.client, "verbs_budget", 0.01)
+    monkeypatch.setattr(main.client, "fetch_verbs_async", slow_verbs)
+    with TestClient(main.app) as c:
+        first = c.get("/api/dictionary/en/etaglate")
+        old = first.headers["ETag"]
+        assert first.json()["verbs"] == []
+        deadline = time.time() + 5
+        while main.responses.get(main._response_key("en", "lazy", "etaglate"), record=False) is not None and time.time() < deadline:
+            time.sleep(0.05)
+        second = c.get("/api/dictionary/en/etaglate", headers={"If-None-Match": old})
+    assert second.status_code == 200
+    assert second.headers["ETag"] != old
+    assert second.json()["verbs"] == VERBS
@@ -0,0 +1,45 @@
+import asyncio
+import base64
+import json
+
+import pytest
+
+from app.repo_auth import decode_favorites_cursor, encode_favorites_cursor, list_favorites_page_async
+
+
+def test_cursor_round_trip():
+    row = {"id": 42, "created_at": "2026-03-01T10:00:00.123456+00:00", "word": "run"}
+    cursor = encode_favorites_cursor(row)
+    assert "=" not in cursor
+    assert decode_favorites_cursor(cursor) == (row["created_at"], 42)
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not base64!",
+        base64.urlsafe_b64encode(b"{}").decode(),
+        base64.urlsafe_b64encode(json.dumps(["2026-01-01", "7"]).encode()).decode(),
+        base64.urlsafe_b64encode(json.dumps(['2026-01-01",id.gt.0)', 7]).encode()).decode(),
+        base64.urlsafe_b64encode(json.dumps([None, 7]).encode()).decode(),
+    ],
+)
+def test_tampered_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_favorites_cursor(cursor)
+
+
+def test_pages_walk_ties_on_created_at(postgrest):
+    stamps = ["2026-01-01T00:00:00+00:00"] * 3 + ["2026-01-02T00:00:00+00:00"] * 2
+    for i, stamp in enumerate(stamps, start=1):
+        postgrest.favorites.append({"id": i, "user_id": "u1", "language": "en", "word": f"w{i}", "created_at": stamp})
+    postgrest.favorites.append({"id": 99, "user_id": "u2", "language": "en", "word": "other", "created_at": stamps[0]})
+
+    first, cursor = asyncio.run(list_favorites_page_async("u1", 2))
+    assert [row["id"] for row in first] == [1, 2]
+    second, cursor = asyncio.run(list_favorites_page_async("u1", 2, cursor))
+    # id 3 shares created_at with the end of the first page and is not skipped
+    assert [row["id"] for row in second] == [3, 4]
+    third, cursor = asyncio.run(list_favorites_page_async("u1", 2, cursor))
+    assert [row["id"] for row in third] == [5]
+    assert cursor is None
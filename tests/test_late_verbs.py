@@ -0,0 +1,42 @@
+import asyncio
+import os
+import time
+
+import httpx
+from fastapi.testclient import TestClient
+
+from app import main, persist
+
+PAGE = os.path.join(os.path.dirname(__file__), "fixtures", "parity", "en_run.html")
+VERBS = [{"id": 0, "type": "Simple past", "text": "ran"}]
+
+
+def test_verbs_that_miss_the_budget_are_persisted(monkeypatch):
+    with open(PAGE, encoding="utf-8") as f:
+        html = f.read()
+    stored = []
+
+    async def upsert(language, entry, data):
+        stored.append((language, entry, data["verbs"]))
+
+    async def slow_verbs(entry):
+        await asyncio.sleep(0.2)
+        return VERBS
+
+    monkeypatch.setattr(main, "write_behind", False)
+    monkeypatch.setattr(persist, "upsert_entry_with_senses_async", upsert)
+    monkeypatch.setattr(main.client, "_http", httpx.AsyncClient(transport=httpx.MockTransport(lambda r: httpx.Response(200, text=html))))
+    monkeypatch.setattr(main.client, "verbs_budget", 0.01)
+    monkeypatch.setattr(main.client, "fetch_verbs_async", slow_verbs)
+
+    with TestClient(main.app) as c:
+        first = c.get("/api/dictionary/en/latevrb")
+        assert first.status_code == 200
+        assert first.json()["verbs"] == []
+        deadline = time.time() + 5
+        while len(stored) < 2 and time.time() < deadline:
+            time.sleep(0.05)
+        second = c.get("/api/dictionary/en/latevrb")
+
+    assert stored == [("en", "latevrb", []), ("en", "latevrb", VERBS)]
+    assert second.json()["verbs"] == VERBS
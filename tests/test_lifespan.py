@@ -0,0 +1,30 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+from app.cambridge import AsyncCambridgeClient
+
+
+def test_lifespan_starts_and_stops_the_writer(monkeypatch):
+    monkeypatch.setattr(main, "write_behind", True)
+    with TestClient(main.app):
+        assert main.writer._task is not None and not main.writer._task.done()
+        main.client._http_client()
+    assert main.writer._task is None
+    assert main.client._http is None
+
+
+def test_aclose_shuts_down_every_pool():
+    client = AsyncCambridgeClient(offline=True)
+
+    async def go():
+        client._http_client()
+        client._in_background(lambda: None)
+        await client.aclose()
+
+    asyncio.run(go())
+    assert client._http is None and client._tier_writer is None
+    with pytest.raises(RuntimeError):
+        client.executor.submit(lambda: None)
@@ -0,0 +1,81 @@
+import os
+
+import pytest
+
+from app import parsers
+from app.cambridge import CambridgeClient
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def _parse(scoped):
+    clients = {}
+
+    def parse(html, engine):
+        if engine not in clients:
+            clients[engine] = CambridgeClient(parser_engine=engine, offline=True)
+            clients[engine].scoped_parse = scoped
+        return clients[engine]._parse_entry(html)
+
+    return parse
+
+
+def test_default_engine_is_html_parser():
+    assert parsers.resolve_engine(None) == "html.parser"
+
+
+@pytest.mark.parametrize("scoped", [True, False])
+def test_lxml_matches_html_parser_on_corpus(scoped):
+    pytest.importorskip("lxml")
+    paths = parsers._corpus_paths(os.path.join(FIXTURES, "parity"))
+    assert len(paths) >= 3
+    assert parsers.check_parity(_parse(scoped), paths) == []
+
+
+def test_lxml_matches_html_parser_on_captured_pages():
+    pytest.importorskip("lxml")
+    root = os.path.join(FIXTURES, "parity_captured")
+    paths = parsers._corpus_paths(root) if os.path.isdir(root) else []
+    sources = {os.path.basename(p).split("_", 1)[0] for p in paths}
+    if not {"en", "cn-en"} <= sources:
+        pytest.skip("no captured en and cn-en pages; run python -m app.parsers capture tests/fixtures/parity_captured <language> <word>")
+    assert parsers.check_parity(_parse(True), paths) == []
+
+
+def test_corpus_pages_parse_to_entries():
+    client = CambridgeClient(offline=True)
+    with open(os.path.join(FIXTURES, "parity", "en_run.html"), encoding="utf-8") as f:
+        entry = client._parse_entry(f.read())
+    assert entry["word"] == "run"
+    assert entry["pos"] == ["verb", "noun"]
+    assert [d["level"] for d in entry["definition"]] == ["A1", "B1", ""]
+    assert len(entry["definition"][0]["example"]) == 2
+
+
+def test_cli_builds_offline_clients():
+    assert parsers.main([os.path.join(FIXTURES, "parity")]) == 0
+
+
+def test_capture_saves_pages(tmp_path, monkeypatch):
+    import requests
+
+    served = []
+
+    def get(self, url, timeout=None):
+        served.append(url)
+        r = requests.Response()
+        r.status_code = 200
+        r._content = b"<html>" + url.encode() + b"</html>"
+        return r
+
+    monkeypatch.setattr(requests.Session, "get", get)
+    saved = parsers.capture(str(tmp_path), "en", ["run"])
+    assert [os.path.basename(p) for p in saved] == ["en_run.html"]
+    assert served == ["https://dictionary.cambridge.org/us/dictionary/english/run"]
+
+
+@pytest.mark.xfail(strict=True, reason="html.parser keeps a div inside <p>; lxml closes the <p> first")
+def test_parity_on_malformed_markup():
+    pytest.importorskip("lxml")
+    paths = parsers._corpus_paths(os.path.join(FIXTURES, "parity_malformed"))
+    assert parsers.check_parity(_parse(True), paths) == []
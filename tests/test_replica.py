@@ -0,0 +1,55 @@
+from datetime import timedelta
+
+from app.replica import EntryReplica
+from conftest import ENTRY_COLUMNS, sample_entry
+
+
+def _write(postgrest, word):
+    postgrest._upsert(
+        "dictionary_entries",
+        [{"language_slug": "en", "entry": word, "word": word, "data": sample_entry(word)}],
+        {"on_conflict": "language_slug,entry"},
+        "",
+    )
+
+
+def test_late_commit_below_watermark_is_replicated(postgrest, tmp_path):
+    postgrest.columns = ENTRY_COLUMNS | {"data", "updated_at"}
+    replica = EntryReplica(str(tmp_path / "replica.db"), page_size=2, overlap=30)
+    for word in ("a", "b", "c"):
+        _write(postgrest, word)
+        postgrest.tick()
+    assert replica.sync() == 3
+    assert replica.sync() == 0
+
+    # a writer stamped this row 5 seconds ago, but it only became visible now
+    postgrest.tick(-5)
+    _write(postgrest, "late")
+    postgrest.tick(10)
+    _write(postgrest, "d")
+
+    assert replica.sync() == 2
+    assert replica.get("en", "late")[0]["word"] == "late"
+    assert replica.get("en", "d")[0]["word"] == "d"
+
+
+def test_rows_beyond_the_overlap_are_not_reread(postgrest, tmp_path):
+    postgrest.columns = ENTRY_COLUMNS | {"data", "updated_at"}
+    replica = EntryReplica(str(tmp_path / "replica.db"), overlap=1)
+    _write(postgrest, "a")
+    postgrest.tick(60)
+    _write(postgrest, "b")
+    assert replica.sync() == 2
+    postgrest.requests.clear()
+    assert replica.sync() == 0
+    since = (postgrest.clock - timedelta(seconds=1)).isoformat()
+    assert postgrest.requests[0].url.params["or"].startswith(f'(updated_at.gt."{since}"')
+    assert replica.stats()["watermark"] == postgrest.clock.isoformat()
+
+
+def test_rows_without_data_are_skipped(postgrest, tmp_path):
+    postgrest.columns = ENTRY_COLUMNS | {"data", "updated_at"}
+    postgrest._upsert("dictionary_entries", [{"language_slug": "en", "entry": "old", "word": "old"}], {"on_conflict": "language_slug,entry"}, "")
+    replica = EntryReplica(str(tmp_path / "replica.db"))
+    assert replica.sync() == 0
+    assert replica.get("en", "old") is None
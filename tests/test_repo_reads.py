@@ -0,0 +1,56 @@
+import asyncio
+
+import httpx
+
+from app import repo
+from conftest import ENTRY_COLUMNS, sample_entry
+
+
+def _store(postgrest, *words):
+    for word in words:
+        asyncio.run(repo.upsert_entry_with_senses_async("en", word, sample_entry(word)))
+    postgrest.requests.clear()
+
+
+def _bad_value():
+    return httpx.Response(400, json={"code": "22P02", "message": 'invalid input syntax for type bigint: "x"'})
+
+
+def test_single_read_steps_down_on_missing_column(postgrest):
+    postgrest.columns = ENTRY_COLUMNS | {"data"}
+    _store(postgrest, "run")
+    entry, age = asyncio.run(repo.get_entry_with_age_async("en", "run"))
+    assert entry["word"] == "run"
+    assert age is None
+    assert repo.ENTRY_READ_SELECTS[repo._read_select] == f"{repo.ENTRY_HEAD_SELECT},data"
+    assert len(postgrest.requests) == 2
+
+
+def test_other_400_does_not_downgrade(postgrest):
+    postgrest.columns = ENTRY_COLUMNS | {"data", "updated_at"}
+    _store(postgrest, "run")
+    postgrest.fail_next.append(_bad_value())
+    assert asyncio.run(repo.get_entry_with_age_async("en", "run")) is None
+    assert repo._read_select == 0
+    entry, age = asyncio.run(repo.get_entry_with_age_async("en", "run"))
+    assert entry["definition"] and age is not None
+
+
+def test_batch_never_downgrades_the_process_select(postgrest):
+    postgrest.columns = ENTRY_COLUMNS | {"data"}
+    _store(postgrest, "run", "walk")
+    found = asyncio.run(repo.get_entries_batch_async([("en", "run"), ("en", "walk"), ("en", "fly")]))
+    assert sorted(found) == [("en", "run"), ("en", "walk")]
+    assert repo._read_select == 0
+
+    postgrest.fail_next.append(_bad_value())
+    assert asyncio.run(repo.get_entries_batch_async([("en", "run")])) == {}
+    assert repo._read_select == 0
+
+
+def test_missing_embedding_falls_back_to_senses_query(postgrest):
+    postgrest.embed = False
+    _store(postgrest, "run")
+    entry, _ = asyncio.run(repo.get_entry_with_age_async("en", "run"))
+    assert [d["text"] for d in entry["definition"]] == ["run sense 0", "run sense 1"]
+    assert repo.ENTRY_READ_SELECTS[repo._read_select] == repo.ENTRY_HEAD_SELECT
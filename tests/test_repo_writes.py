@@ -0,0 +1,110 @@
+import asyncio
+
+from app import repo
+from conftest import ENTRY_COLUMNS, sample_entry
+
+
+def test_baseline_schema_keeps_data(postgrest):
+    # README baseline: data column, no updated_at
+    postgrest.columns = ENTRY_COLUMNS | {"data"}
+    asyncio.run(repo.upsert_entry_with_senses_async("en", "run", sample_entry()))
+    assert postgrest.entries[0]["data"]["word"] == "run"
+    assert "updated_at" not in postgrest.entries[0]
+    assert len(postgrest.senses) == 2
+    # head upsert and senses upsert, no fallback round trips
+    assert len(postgrest.requests) == 2
+
+
+def test_updated_at_is_stamped_by_the_database(postgrest):
+    postgrest.columns = ENTRY_COLUMNS | {"data", "updated_at"}
+    asyncio.run(repo.upsert_entries_batch_async([("en", "run", sample_entry()), ("en", "walk", sample_entry("walk"))]))
+    for request in postgrest.requests:
+        assert b"updated_at" not in request.content
+    assert all(row["updated_at"] == postgrest.clock.isoformat() for row in postgrest.entries)
+    assert all(row["data"] for row in postgrest.entries)
+
+
+def test_table_without_data_column_still_stores_senses(postgrest):
+    asyncio.run(repo.upsert_entry_with_senses_async("en", "run", sample_entry()))
+    assert "data" not in postgrest.entries[0]
+    assert len(postgrest.senses) == 2
+    found = asyncio.run(repo.get_entry_with_age_async("en", "run"))
+    assert found is not None
+    entry, age = found
+    assert [d["text"] for d in entry["definition"]] == ["run sense 0", "run sense 1"]
+    assert age is None
+
+
+def test_sync_upsert_keeps_data(postgrest):
+    postgrest.columns = ENTRY_COLUMNS | {"data"}
+    repo.upsert_entry_with_senses("en", "run", sample_entry())
+    assert postgrest.entries[0]["data"]["word"] == "run"
+    assert len(postgrest.senses) == 2
+
+
+class _Result:
+    def __init__(self, data):
+        self.data = data
+
+
+class _Query:
+    def __init__(self, fake, table):
+        self.fake, self.table, self.payload = fake, table, None
+
+    def upsert(self, payload, on_conflict):
+        self.payload, self.on_conflict = payload, on_conflict
+        return self
+
+    def execute(self):
+        rows = self.payload if isinstance(self.payload, list) else [self.payload]
+        response = self.fake._upsert(self.table, rows, {"on_conflict": self.on_conflict}, "return=representation")
+        if response.status_code != 201:
+            raise RuntimeError(response.text)
+        return _Result(response.json())
+
+
+class _Sdk:
+    def __init__(self, fake):
+        self.fake = fake
+
+    def table(self, name):
+        return _Query(self.fake, name)
+
+
+def test_sdk_upsert_falls_back_without_data_column(postgrest, monkeypatch):
+    monkeypatch.setattr(repo, "get_supabase_client", lambda: _Sdk(postgrest))
+    repo.upsert_entry_with_senses("en", "run", sample_entry())
+    assert postgrest.entries[0]["word"] == "run"
+    assert len(postgrest.senses) == 2
+
+
+def test_one_bad_entry_does_not_fail_the_batch(postgrest):
+    postgrest.reject = lambda table, row: table == "dictionary_entries" and row.get("entry") == "bad"
+    items = [("en", "run", sample_entry()), ("en", "bad", sample_entry("bad")), ("en", "walk", sample_entry("walk"))]
+    failed = asyncio.run(repo.upsert_entries_batch_async(items))
+    assert [(slug, entry) for slug, entry, _ in failed] == [("en", "bad")]
+    assert sorted(row["entry"] for row in postgrest.entries) == ["run", "walk"]
+    assert len(postgrest.senses) == 4
+
+
+def test_failed_senses_retry_skips_the_head(postgrest):
+    postgrest.reject = lambda table, row: table == "dictionary_senses" and row["original_content"].startswith("walk")
+    items = [("en", "run", sample_entry()), ("en", "walk", sample_entry("walk"))]
+    failed = asyncio.run(repo.upsert_entries_batch_async(items))
+    assert [(slug, entry) for slug, entry, _ in failed] == [("en", "walk")]
+    assert repo.SENSES_ONLY in failed[0][2]
+    assert len(postgrest.senses) == 2
+
+    postgrest.reject = lambda table, row: False
+    postgrest.requests.clear()
+    assert asyncio.run(repo.upsert_entries_batch_async(failed)) == []
+    assert [r.url.path.rsplit("/", 1)[-1] for r in postgrest.requests] == ["dictionary_senses"]
+    assert len(postgrest.senses) == 4
+    assert len(postgrest.entries) == 2
+
+
+def test_duplicate_senses_in_one_entry_are_merged(postgrest):
+    data = sample_entry()
+    data["definition"].append(dict(data["definition"][0]))
+    assert asyncio.run(repo.upsert_entries_batch_async([("en", "run", data)])) == []
+    assert len(postgrest.senses) == 2
@@ -0,0 +1,81 @@
+import asyncio
+import os
+
+import httpx
+import pytest
+
+from app import main
+from app.singleflight import SingleFlight
+
+PAGE = os.path.join(os.path.dirname(__file__), "fixtures", "parity", "en_run.html")
+
+
+def test_concurrent_lookups_share_one_fetch_and_one_persist(monkeypatch):
+    with open(PAGE, encoding="utf-8") as f:
+        html = f.read()
+    fetched, persisted = [], []
+
+    async def handler(request):
+        fetched.append(str(request.url))
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, text=html)
+
+    async def persist(language, entry, data, replica=None, writer=None):
+        persisted.append((language, entry))
+
+    monkeypatch.setattr(main.client, "_http", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(main, "persist_entry", persist)
+
+    async def scenario():
+        key = ("en", "sfrun", True)
+        calls = [main.entry_flights.do(key, lambda: main._fetch_and_store("en", "sfrun", "eager")) for _ in range(5)]
+        return await asyncio.gather(*calls)
+
+    before = main.entry_flights.stats()
+    results = asyncio.run(scenario())
+    after = main.entry_flights.stats()
+    assert all(r is results[0] for r in results)
+    assert len([u for u in fetched if "cambridge" in u]) == 1
+    assert persisted == [("en", "sfrun")]
+    assert after["executed"] - before["executed"] == 1
+    assert after["coalesced"] - before["coalesced"] == 4
+
+
+def test_exception_reaches_every_waiter():
+    flights = SingleFlight()
+    runs = []
+
+    async def boom():
+        runs.append(1)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    async def scenario():
+        return await asyncio.gather(*(flights.do("k", boom) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert runs == [1]
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert flights.stats()["inflight"] == 0
+
+
+def test_cancelled_waiter_does_not_cancel_the_shared_task():
+    flights = SingleFlight()
+    runs = []
+
+    async def work():
+        runs.append(1)
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def scenario():
+        first = asyncio.ensure_future(flights.do("k", work))
+        second = asyncio.ensure_future(flights.do("k", work))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(scenario()) == "done"
+    assert runs == [1]
@@ -0,0 +1,108 @@
+from pathlib import Path
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+
+FIXTURES = Path(__file__).parent / "fixtures" / "parity"
+
+CN_EN_PAGE = """<html><body>
+<a href="/dictionary/english-chinese-simplified/{0}-a">a</a>
+<a href="/dictionary/english-chinese-simplified/{0}-b">b</a>
+</body></html>"""
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    misses = []
+
+    async def record_miss(language, entry):
+        misses.append((language, entry))
+
+    async def no_recent_miss(language, entry, ttl):
+        return False
+
+    monkeypatch.setattr(main, "negative_persist", True)
+    monkeypatch.setattr(main, "record_miss_async", record_miss)
+    monkeypatch.setattr(main, "has_recent_miss_async", no_recent_miss)
+
+    def install(handler):
+        monkeypatch.setattr(main.client, "_http", httpx.AsyncClient(transport=httpx.MockTransport(handler), follow_redirects=True))
+
+    install.misses = misses
+    return install
+
+
+@pytest.mark.parametrize("failure", ["timeout", 503, 403])
+def test_cn_en_subpage_failure_is_not_negative_cached(upstream, failure):
+    word = f"fanout{failure}"
+
+    def handler(request):
+        if "/english-chinese-simplified/" in request.url.path:
+            if failure == "timeout":
+                raise httpx.ConnectTimeout("timed out", request=request)
+            return httpx.Response(failure)
+        return httpx.Response(200, text=CN_EN_PAGE.format(word))
+
+    upstream(handler)
+    r = TestClient(main.app).get(f"/api/dictionary/cn-en/{word}")
+    assert r.status_code == 502
+    assert not main.negative.contains("cn-en", word)
+    assert upstream.misses == []
+
+
+def test_missing_page_is_negative_cached(upstream):
+    word = "nosuchwordatall"
+    upstream(lambda request: httpx.Response(404))
+    r = TestClient(main.app).get(f"/api/dictionary/en/{word}")
+    assert r.status_code == 404
+    assert main.negative.contains("en", word)
+    assert upstream.misses == [("en", word)]
+
+
+def test_cn_en_partial_aggregate_is_served_but_not_kept(upstream, monkeypatch):
+    word = "fanoutpartial"
+    page = (FIXTURES / "en_cn_hello.html").read_text(encoding="utf-8")
+    persisted = []
+
+    async def persist(*args, **kwargs):
+        persisted.append(args)
+
+    monkeypatch.setattr(main, "persist_entry", persist)
+
+    def handler(request):
+        if request.url.path.endswith(f"/{word}-a"):
+            return httpx.Response(200, text=page)
+        if request.url.path.endswith(f"/{word}-b"):
+            return httpx.Response(503)
+        return httpx.Response(200, text=CN_EN_PAGE.format(word))
+
+    upstream(handler)
+    r = TestClient(main.app).get(f"/api/dictionary/cn-en/{word}")
+    assert r.status_code == 200
+    body = r.json()
+    assert body["partial"] is True
+    assert body["definition"] and all(d["lemma"] == "hello" for d in body["definition"])
+    assert persisted == []
+    assert not main.negative.contains("cn-en", word)
+    assert main.responses.get(main._response_key("cn-en", "lazy", word)) is None
+    assert main.client.peek_entry("cn-en", word) is None
+
+
+def test_sync_fanout_returns_the_pages_that_succeeded(monkeypatch):
+    from app.cambridge import CambridgeClient, UpstreamError
+
+    c = CambridgeClient(offline=True)
+
+    def fetch_parsed(url, source_hint=None):
+        if url.endswith("bad"):
+            raise UpstreamError("503 " + url)
+        return None if url.endswith("gone") else {"word": url}
+
+    monkeypatch.setattr(c, "_fetch_parsed", fetch_parsed)
+    pages, failed = c._fetch_parsed_pages(["u/ok", "u/bad", "u/gone"])
+    assert pages == [{"word": "u/ok"}, None, None] and failed == 1
+    with pytest.raises(UpstreamError):
+        c._fetch_parsed_pages(["u/bad", "u/gone"])
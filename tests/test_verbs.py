@@ -0,0 +1,35 @@
+from app import verbs
+from app.verbs import VerbStore
+
+
+def _verbs(lemma):
+    return [{"type": "Present participle", "text": lemma + "ing"}, {"type": "Simple past", "text": lemma + "ed"}]
+
+
+def test_indexes_are_bounded():
+    store = VerbStore(persist=False, max_lemmas=2)
+    for lemma in ("walk", "talk", "jump", "kick"):
+        store.put(lemma, _verbs(lemma))
+    stats = store.stats()
+    assert stats["lemmas"] == 2
+    assert stats["forms"] <= 2 * VerbStore.FORMS_PER_LEMMA
+    assert stats["evictions"] > 0
+    assert store.get("walk") is None
+    assert store.lemma_for("kicked") == {"lemma": "kick", "verbs": _verbs("kick")}
+
+
+def test_evicted_lemma_falls_back_to_table(monkeypatch):
+    table = {}
+    monkeypatch.setattr(verbs, "upsert_verb_inflections", lambda lemma, vs, forms: table.__setitem__(lemma, vs))
+    monkeypatch.setattr(verbs, "get_verb_inflections", lambda lemma: table.get(lemma))
+    monkeypatch.setattr(
+        verbs,
+        "get_lemma_for_form",
+        lambda form: next(({"lemma": k, "verbs": v} for k, v in table.items() if form in verbs.inflected_forms(k, v)), None),
+    )
+    store = VerbStore(persist=True, max_lemmas=1)
+    store.put("walk", _verbs("walk"))
+    store.put("talk", _verbs("talk"))
+    assert store.stats()["lemmas"] == 1
+    assert store.lemma_for("walked") == {"lemma": "walk", "verbs": _verbs("walk")}
+    assert store.get("talk") == _verbs("talk")
@@ -0,0 +1,108 @@
+import asyncio
+import os
+
+import httpx
+import pytest
+
+from app.cambridge import AsyncCambridgeClient, CambridgeClient
+from app.verbs import VerbStore
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "parity")
+VERBS = [{"id": 0, "type": "Simple past", "text": "ran"}]
+
+
+def _page(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+PAGES = {"run": _page("en_run.html"), "hello": _page("en_cn_hello.html")}
+
+
+def _client(wiki_delay=0.0, budget=1.0):
+    calls = {"cambridge": 0, "wiki": 0}
+
+    async def handler(request):
+        if "wiktionary" in request.url.host:
+            calls["wiki"] += 1
+            await asyncio.sleep(wiki_delay)
+            return httpx.Response(200, text="<html></html>")
+        calls["cambridge"] += 1
+        return httpx.Response(200, text=PAGES[request.url.path.rsplit("/", 1)[-1]])
+
+    client = AsyncCambridgeClient(verbs_budget=budget, verb_store=VerbStore(persist=False))
+    client._http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client._parse_verbs = lambda html: VERBS
+    return client, calls
+
+
+def _lookup(client, word, verbs, language="en"):
+    async def go():
+        try:
+            return await client.get_entry_async(language, word, verbs=verbs)
+        finally:
+            # an eager lookup keeps running after the answer
+            await asyncio.gather(*client._background)
+            await client.aclose()
+
+    return asyncio.run(go())
+
+
+@pytest.mark.parametrize("mode,word,language,wiki,verbs", [
+    ("eager", "run", "en", 1, VERBS),
+    ("eager", "hello", "en-cn", 1, []),
+    ("lazy", "run", "en", 1, VERBS),
+    ("lazy", "hello", "en-cn", 0, []),
+    ("none", "run", "en", 0, []),
+])
+def test_modes(mode, word, language, wiki, verbs):
+    client, calls = _client()
+    data = _lookup(client, word, mode, language)
+    assert data["verbs"] == verbs
+    assert calls == {"cambridge": 1, "wiki": wiki}
+
+
+def test_none_leaves_verbs_to_a_later_request():
+    client, calls = _client()
+
+    async def go():
+        first = await client.get_entry_async("en", "run", verbs="none")
+        second = await client.get_entry_async("en", "run", verbs="lazy")
+        await client.aclose()
+        return first, second
+
+    first, second = asyncio.run(go())
+    assert first["verbs"] == [] and second["verbs"] == VERBS
+    # the second request resolved verbs from the cached parse
+    assert calls == {"cambridge": 1, "wiki": 1}
+
+
+def test_lazy_late_verbs_reach_on_entry_patched():
+    client, calls = _client(wiki_delay=0.1, budget=0.01)
+    patched = []
+    client.on_entry_patched = lambda slug, entry, data: patched.append((slug, entry, data["verbs"]))
+
+    async def go():
+        data = await client.get_entry_async("en", "run", verbs="lazy")
+        await asyncio.gather(*client._background)
+        await client.aclose()
+        return data
+
+    assert asyncio.run(go())["verbs"] == []
+    assert patched == [("en", "run", VERBS)]
+    assert client.entry_cache.get("entry:en:run")["verbs"] == VERBS
+
+
+def test_sync_modes(monkeypatch):
+    client = CambridgeClient(offline=True, verb_store=VerbStore(persist=False))
+    wiki = []
+    monkeypatch.setattr(client, "_fetch", lambda url, strict=False: PAGES[url.rsplit("/", 1)[-1]])
+    monkeypatch.setattr(client, "fetch_verbs", lambda entry: wiki.append(entry) or VERBS)
+    assert client.get_entry("en-cn", "hello", verbs="lazy")["verbs"] == []
+    assert wiki == []
+    assert client.get_entry("en", "run", verbs="none")["verbs"] == []
+    assert wiki == []
+    assert client.get_entry("en", "run", verbs="lazy")["verbs"] == VERBS
+    assert client.get_entry("en-cn", "hello", verbs="eager", refresh=True)["verbs"] == []
+    client.executor.shutdown(wait=True)
+    assert wiki == ["run", "hello"]
@@ -0,0 +1,85 @@
+import asyncio
+
+from app.writebehind import WriteBehind
+
+
+def test_merges_resubmits_and_flushes_on_close():
+    batches = []
+
+    async def write(batch):
+        batches.append(batch)
+        return True
+
+    async def scenario():
+        wb = WriteBehind(write, flush_interval=60)
+        wb.start()
+        assert wb.submit("en", "run", {"v": 1})
+        assert wb.submit("en", "run", {"v": 2})
+        assert wb.submit("en", "walk", {"v": 1})
+        await wb.close()
+        return wb
+
+    wb = asyncio.run(scenario())
+    assert batches == [[("en", "run", {"v": 2}), ("en", "walk", {"v": 1})]]
+    assert wb.stats()["merged"] == 1 and wb.stats()["written"] == 2
+    assert not wb.submit("en", "late", {})
+
+
+def test_failed_batches_retry_then_drop():
+    calls = []
+
+    async def write(batch):
+        calls.append(batch)
+        return len(calls) > 1 and batch[0][1] == "run"
+
+    async def scenario():
+        wb = WriteBehind(write, flush_interval=0.01, max_attempts=3, backoff=0.01)
+        wb.start()
+        wb.submit("en", "run", {})
+        await asyncio.sleep(0.2)
+        wb.submit("en", "bad", {})
+        await asyncio.sleep(0.3)
+        await wb.close()
+        return wb
+
+    wb = asyncio.run(scenario())
+    stats = wb.stats()
+    assert stats["written"] == 1
+    assert stats["dropped"] == 1
+    assert stats["pending"] == 0
+
+
+def test_full_queue_rejects():
+    async def write(batch):
+        return True
+
+    async def scenario():
+        wb = WriteBehind(write, max_pending=1, flush_interval=60)
+        wb.start()
+        assert wb.submit("en", "a", {})
+        assert not wb.submit("en", "b", {})
+        await wb.close()
+        return wb
+
+    assert asyncio.run(scenario()).stats()["rejected"] == 1
+
+
+def test_only_failed_items_are_retried():
+    calls = []
+
+    async def write(batch):
+        calls.append([entry for _, entry, _ in batch])
+        return [item for item in batch if item[1] == "bad"]
+
+    async def scenario():
+        wb = WriteBehind(write, flush_interval=0.01, max_attempts=2, backoff=0.01)
+        wb.start()
+        for entry in ("run", "bad", "walk"):
+            wb.submit("en", entry, {})
+        await asyncio.sleep(0.2)
+        await wb.close()
+        return wb
+
+    wb = asyncio.run(scenario())
+    assert calls == [["run", "bad", "walk"], ["bad"]]
+    assert wb.stats()["written"] == 2 and wb.stats()["dropped"] == 1